@@ -0,0 +1,47 @@
+"""Mide el tiempo de LevelWorksSpace.update_backgrounds con cutOuterBackground en ventanas de 800x600 y 1920x1080, comparando el recorte con region de dibujo (set_clip) con el recorte anterior, que copiaba la parte visible del fondo, volvia a rellenar todo el fondo y dibujaba la copia.
+
+Se ejecuta desde la carpeta principal del proyecto con: python -m benchmarks.bench_background_cut
+"""
+import os, timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from game_modules.entities import Background, LevelWorksSpace
+from game_modules.utilities import Animation, Physics, FitThePositionBehaviour, Location, create_empty_texture
+
+def create_level(displaySize:tuple[int, int]) -> LevelWorksSpace:
+    """Crea un nivel sin entidades mas pequeño que la ventana, con un fondo del tamaño del nivel, para que parte del fondo quede fuera del nivel."""
+    levelSize = (displaySize[0] * 3 // 4, displaySize[1] * 3 // 4)
+    backgroundTextures = create_empty_texture(levelSize[0], levelSize[1])
+    backgroundTextures['default'].sprite[0].fill((120, 80, 40, 255))
+    background = Background(Physics([0,0]), Animation(backgroundTextures), levelSize, scalar=1)
+    level = LevelWorksSpace(levelSize, background, None, displaySize, [], 'background', location=Location.LEFT_TOP, fitThePositionBehaviour=FitThePositionBehaviour.TO_LOCATION)
+    level.physics.position = [displaySize[0] // 8, displaySize[1] // 8]
+    return level
+
+def update_with_clip(level:LevelWorksSpace) -> None:
+    level.backgroundState = None # Para que el fondo se vuelva a dibujar en cada llamada
+    level.update_backgrounds(60)
+
+def update_with_copy(level:LevelWorksSpace) -> None:
+    """Dibuja el fondo como antes de usar set_clip."""
+    level.background.fill(level.backgroundColor)
+    for background in level.backgroundList:
+        background.draw(level.background, level.fitThePosition(background.get_texture_position()))
+    rect = level.get_level_display_rect()
+    cuttedBackground = level.background.subsurface(rect).copy()
+    level.background.fill(level.backgroundColor)
+    level.background.blit(cuttedBackground, rect.topleft)
+
+def main(repeat:int=5, number:int=50) -> None:
+    pygame.init()
+    for displaySize in [(800, 600), (1920, 1080)]:
+        pygame.display.set_mode(displaySize)
+        level = create_level(displaySize)
+        for name, update in [('copia', update_with_copy), ('set_clip', update_with_clip)]:
+            updateTime = min(timeit.repeat(lambda: update(level), number=number, repeat=repeat)) / number
+            print(f'{displaySize[0]}x{displaySize[1]}, {name}: {updateTime * 1000:.2f} ms por fotograma')
+
+if __name__ == '__main__':
+    main()
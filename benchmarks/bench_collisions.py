@@ -0,0 +1,53 @@
+"""Mide el tiempo de sweep_and_limit (con el que se resuelven las colisiones de los niveles) con una entidad que se mueve en medio de niveles cada vez mas largos (ver bench_culling), comparando el revisar todas las entidades del nivel con revisar solo las cercanas que retorna el indice de hitboxes del nivel.
+Tambien mide el tiempo de buscar los pares que chocan entre muchas entidades que se mueven, comparando el barrido y poda de CollisionWorld con revisar todos los pares.
+
+Se ejecuta desde la carpeta principal del proyecto con: python -m benchmarks.bench_collisions
+"""
+import os, timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame, random
+from game_modules.entities import Entity
+from game_modules.collision_world import CollisionWorld
+from game_modules.swept_collision import sweep_and_limit
+from game_modules.utilities import Animation, Physics, create_textures
+from benchmarks.bench_culling import create_train_level
+
+def get_all_pairs(bodies:list[Entity]) -> list[tuple[Entity, Entity]]:
+    return [(body, otherBody) for bodyIndex, body in enumerate(bodies) for otherBody in bodies[bodyIndex + 1:] if body.physics.hitbox.colliderect(otherBody.physics.hitbox)]
+
+def create_moving_bodies(count:int, textures:dict) -> list[Entity]:
+    """Crea count entidades colisionables que se mueven, repartidas en un nivel de 100 pixeles de ancho por entidad."""
+    random.seed(0)
+    bodies = []
+    for i in range(count):
+        body = Entity(Physics([random.uniform(0, count * 100), random.uniform(0, 600)], velocity=[random.uniform(-60, 60), random.uniform(-60, 60)], isCollidable=True), Animation(textures=textures, actualTexture='chair1'))
+        body.update(60)
+        bodies.append(body)
+    return bodies
+
+def main(repeat:int=5, number:int=200) -> None:
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    chairTextures = create_textures(['chair1.png'], [1], scalar=2)
+    for wagons in [1, 10, 50]:
+        level = create_train_level(wagons)
+        entity = Entity(Physics([400, 300], velocity=[120, 60], isCollidable=True), Animation(textures=chairTextures, actualTexture='chair1'))
+        entity.update(60, firstInit=True)
+        entity.update(60)
+        allTime = min(timeit.repeat(lambda: sweep_and_limit(entity, level.entitiesList), number=number, repeat=repeat)) / number
+        nearbyTime = min(timeit.repeat(lambda: sweep_and_limit(entity, level.get_collision_candidates(entity)), number=number, repeat=repeat)) / number
+        print(f'{wagons} vagones, {len(level.entitiesList)} entidades: todas {allTime * 1000:.3f} ms, cercanas {nearbyTime * 1000:.3f} ms ({len(level.get_collision_candidates(entity))} revisadas)')
+
+    for count in [50, 200, 1000]:
+        bodies = create_moving_bodies(count, chairTextures)
+        collisionWorld = CollisionWorld()
+        for body in bodies:
+            collisionWorld.add(body)
+        allTime = min(timeit.repeat(lambda: get_all_pairs(bodies), number=number // 20, repeat=repeat)) / (number // 20)
+        sweepTime = min(timeit.repeat(collisionWorld.get_pairs, number=number // 20, repeat=repeat)) / (number // 20)
+        print(f'{count} entidades moviendose: todos los pares {allTime * 1000:.3f} ms, barrido y poda {sweepTime * 1000:.3f} ms ({len(collisionWorld.get_pairs())} pares)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,33 @@
+"""Mide el tiempo de LevelWorksSpace.show en niveles cada vez mas largos con sillas repartidas en todo el nivel, como un tren con muchos vagones. Con el indice espacial solo se dibujan las entidades visibles, por lo que el tiempo debe depender de lo que se ve y no del tamaño del nivel.
+
+Se ejecuta desde la carpeta principal del proyecto con: python -m benchmarks.bench_culling
+"""
+import os, timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from game_modules.entities import Background, LevelWorksSpace, Entity
+from game_modules.utilities import Animation, Physics, FitThePositionBehaviour, Location, create_textures, create_empty_texture
+
+def create_train_level(wagons:int, displaySize:tuple[int, int]=(800, 600)) -> LevelWorksSpace:
+    """Crea un nivel de wagons veces el ancho de la ventana, con 40 sillas por cada ancho de la ventana."""
+    chairTextures = create_textures(['chair1.png'], [1], scalar=2)
+    levelSize = (displaySize[0] * wagons, displaySize[1])
+    background = Background(Physics([0,0]), Animation(create_empty_texture(displaySize[0], displaySize[1])), displaySize, scalar=1)
+    entitiesList = []
+    for i in range(wagons * 10):
+        for j in [100, 175, 350, 425]:
+            entitiesList.append(Entity(Physics([80 * i, j]), Animation(textures=chairTextures, actualTexture='chair1')))
+    return LevelWorksSpace(levelSize, background, None, displaySize, entitiesList, 'train', location=Location.LEFT_TOP, fitThePositionBehaviour=FitThePositionBehaviour.TO_LOCATION)
+
+def main(repeat:int=5, number:int=20) -> None:
+    pygame.init()
+    display = pygame.display.set_mode((800, 600))
+    for wagons in [1, 10, 50]:
+        level = create_train_level(wagons)
+        showTime = min(timeit.repeat(lambda: level.show(display), number=number, repeat=repeat)) / number
+        print(f'{wagons} vagones, {len(level.entitiesList)} entidades: {showTime * 1000:.2f} ms por fotograma ({level.drawnEntitiesCount} dibujadas, {level.culledEntitiesCount} descartadas)')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,35 @@
+"""Mide el tiempo de dibujar cientos de imagenes pequeñas llamando a blit por cada una y con una lista de dibujo (DrawList), que las dibuja con una sola llamada a Surface.blits (o Surface.fblits con pygame-ce).
+
+Se ejecuta desde la carpeta principal del proyecto con: python -m benchmarks.bench_draw_list
+"""
+import os, timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from game_modules.draw_list import DrawList
+
+def create_draw_list(count:int, displaySize:tuple[int, int]=(800, 600)) -> DrawList:
+    """Crea una lista de dibujo con count imagenes de 16x16 repartidas en la ventana, como particulas o pequeñas entidades."""
+    image = pygame.Surface((16, 16), pygame.SRCALPHA)
+    image.fill((255, 255, 255, 128))
+    drawList = DrawList()
+    for i in range(count):
+        drawList.add(image, ((i * 37) % (displaySize[0] - 16), (i * 53) % (displaySize[1] - 16)))
+    return drawList
+
+def blit_each(display:pygame.Surface, drawList:DrawList) -> None:
+    for surface, position, area, special_flags in drawList:
+        display.blit(surface, position, area, special_flags)
+
+def main(repeat:int=5, number:int=50) -> None:
+    pygame.init()
+    display = pygame.display.set_mode((800, 600))
+    for count in [100, 500, 2000]:
+        drawList = create_draw_list(count)
+        blitTime = min(timeit.repeat(lambda: blit_each(display, drawList), number=number, repeat=repeat)) / number
+        submitTime = min(timeit.repeat(lambda: drawList.submit(display), number=number, repeat=repeat)) / number
+        print(f'{count} imagenes: blit por imagen {blitTime * 1000:.2f} ms, lista de dibujo {submitTime * 1000:.2f} ms')
+
+if __name__ == '__main__':
+    main()
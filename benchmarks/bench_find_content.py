@@ -0,0 +1,40 @@
+"""Compara el tiempo de find_content_by_pixels (pixel por pixel) con find_contents (NumPy) sobre los sprites de textures/main_character reescalados como en levels/levelExample.py.
+
+Se ejecuta desde la carpeta principal del proyecto con: python -m benchmarks.bench_find_content
+"""
+import os, timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from game_modules.utilities import Texture, find_content_by_pixels, find_contents, numpy
+
+def load_frames(fileNameList:list[str], spriteLeghtList:list[int], path:str='textures/main_character/', scalar:float=4) -> list[pygame.Surface]:
+    """Carga los sprites y retorna sus fotogramas reescalados."""
+    frames = []
+    for index in range(len(fileNameList)):
+        sprite = pygame.image.load(path + fileNameList[index]).convert_alpha()
+        frames += [pygame.transform.scale_by(frame, scalar) for frame in Texture(sprite, spriteLeghtList[index]).sprite]
+    return frames
+
+def main(repeat:int=5) -> None:
+    pygame.init()
+    pygame.display.set_mode((1, 1))
+    frames = load_frames(['Idle.png', 'Walk.png'], [4, 6])
+    print(f'{len(frames)} fotogramas de {frames[0].get_width()}x{frames[0].get_height()}')
+
+    pixelsTime = min(timeit.repeat(lambda: [find_content_by_pixels(frame) for frame in frames], number=1, repeat=repeat))
+    print(f'find_content_by_pixels: {pixelsTime * 1000:.2f} ms')
+
+    if numpy is None:
+        print('NumPy no esta instalado, find_contents usa el recorrido pixel por pixel')
+        return
+
+    arrayTime = min(timeit.repeat(lambda: find_contents(frames), number=1, repeat=repeat))
+    print(f'find_contents (NumPy): {arrayTime * 1000:.2f} ms ({pixelsTime / arrayTime:.0f}x)')
+
+    if find_contents(frames) != [find_content_by_pixels(frame) for frame in frames]:
+        print('Advertencia: los resultados no coinciden')
+
+if __name__ == '__main__':
+    main()
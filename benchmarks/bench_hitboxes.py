@@ -0,0 +1,34 @@
+"""Mide el tiempo de actualizar las hitboxes de todas las entidades de niveles cada vez mas largos (ver bench_culling), donde casi todas las entidades estan quietas, calculando cada hitbox de nuevo y con Entity.update_hitbox, que solo la calcula si cambio la posicion, el fotograma o la hitbox.
+Tambien mide el tiempo de LevelWorksSpace.update_entities, que actualiza todas las entidades del nivel en cada fotograma.
+
+Se ejecuta desde la carpeta principal del proyecto con: python -m benchmarks.bench_hitboxes
+"""
+import os, timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from game_modules.entities import Entity
+from benchmarks.bench_culling import create_train_level
+
+def create_each_hitbox(entities:list[Entity]) -> None:
+    for entity in entities:
+        entity.physics.update_hitbox(pygame.Rect(entity.get_texture_position(), entity.animation.get_texture().get_size()))
+
+def update_each_hitbox(entities:list[Entity]) -> None:
+    for entity in entities:
+        entity.update_hitbox()
+
+def main(repeat:int=5, number:int=20) -> None:
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    for wagons in [1, 10, 50]:
+        level = create_train_level(wagons)
+        createTime = min(timeit.repeat(lambda: create_each_hitbox(level.entitiesList), number=number, repeat=repeat)) / number
+        update_each_hitbox(level.entitiesList)
+        updateTime = min(timeit.repeat(lambda: update_each_hitbox(level.entitiesList), number=number, repeat=repeat)) / number
+        levelTime = min(timeit.repeat(lambda: level.update_entities(60), number=number, repeat=repeat)) / number
+        print(f'{wagons} vagones, {len(level.entitiesList)} entidades: hitboxes calculadas {createTime * 1000:.2f} ms, con update_hitbox {updateTime * 1000:.2f} ms, update_entities {levelTime * 1000:.2f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,40 @@
+"""Mide el tiempo de integrar la posicion de muchas entidades que se mueven, como multitudes de NPCs o particulas, llamando a Physics.update_position por cada una y con la integracion por lotes de PhysicsBatch (necesita NumPy).
+
+Se ejecuta desde la carpeta principal del proyecto con: python -m benchmarks.bench_physics_batch
+"""
+import os, timeit
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame, random
+from game_modules.entities import Entity
+from game_modules.physics_batch import PhysicsBatch, is_available
+from game_modules.utilities import Animation, Physics, create_textures
+
+def create_crowd(count:int, textures:dict) -> list[Entity]:
+    """Crea count entidades con velocidad y aceleracion, repartidas en un nivel de 100 pixeles de ancho por entidad."""
+    random.seed(0)
+    return [Entity(Physics([random.uniform(0, count * 100), random.uniform(0, 600)], velocity=[random.uniform(-60, 60), random.uniform(-60, 60)], aceleration=[0, random.uniform(-10, 10)]), Animation(textures=textures, actualTexture='chair1')) for _ in range(count)]
+
+def update_each(crowd:list[Entity]) -> None:
+    for entity in crowd:
+        entity.physics.update_position(60)
+
+def main(repeat:int=5, number:int=50) -> None:
+    if not is_available():
+        print('PhysicsBatch necesita NumPy')
+        return
+    pygame.init()
+    pygame.display.set_mode((800, 600))
+    chairTextures = create_textures(['chair1.png'], [1], scalar=2)
+    for count in [100, 1000, 5000]:
+        crowd = create_crowd(count, chairTextures)
+        eachTime = min(timeit.repeat(lambda: update_each(crowd), number=number, repeat=repeat)) / number
+        physicsBatch = PhysicsBatch()
+        for entity in create_crowd(count, chairTextures):
+            physicsBatch.add(entity)
+        batchTime = min(timeit.repeat(lambda: physicsBatch.step(60), number=number, repeat=repeat)) / number
+        print(f'{count} entidades: update_position por entidad {eachTime * 1000:.3f} ms, PhysicsBatch {batchTime * 1000:.3f} ms')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import pygame, os, json, argparse
+from game_modules.utilities import Transformation, TextureRegistry, create_textures
+from game_modules.texture_cache import TextureCache, TexturePack
+
+# Horneado de texturas: ejecuta antes de jugar las llamadas a create_textures que necesita un nivel y guarda las texturas transformadas en un paquete (.pack)
+# El manifiesto es un archivo JSON con la ruta del paquete y la lista de llamadas, donde cada llamada tiene los mismos argumentos de create_textures:
+# {"pack": "levels/nivel.pack", "textures": [{"fileNameList": ["Idle.png"], "spriteLeghtList": [4], "path": "textures/main_character/", "transformFunctions": ["XFLIP"], "variations": [2], "scalar": 4}]}
+# transformFunctions son nombres de las funciones de Transformation, y scalarBase puede ser el nombre de una textura de una llamada anterior para usar el tamaño de su primer fotograma.
+# Los valores deben escribirse igual que en el nivel (por ejemplo 4 y no 4.0) para que las llaves coincidan.
+# Uso, desde la carpeta principal del proyecto: python -m game_modules.asset_baker levels/levelExample.manifest.json
+
+def bake(manifestPath:str) -> str:
+    """Crea todas las texturas de las llamadas del manifiesto y las guarda en el paquete indicado en el.
+
+    Args:
+        manifestPath (str): La ruta del manifiesto.
+
+    Returns:
+        str: La ruta del paquete creado.
+    """
+
+    with open(manifestPath) as file:
+        manifest = json.load(file)
+
+    # Se usa un cache deshabilitado y un registro nuevo para crear todas las texturas desde las imagenes
+    cache = TextureCache(isEnabled=False)
+    registry = TextureRegistry()
+    packTextures = {}
+    bakedTextures = {}
+    for call in manifest['textures']:
+        arguments = dict(call)
+        if 'transformFunctions' in arguments:
+            if isinstance(arguments['transformFunctions'], str):
+                arguments['transformFunctions'] = [arguments['transformFunctions']]
+            arguments['transformFunctions'] = [getattr(Transformation, name) for name in arguments['transformFunctions']]
+        if isinstance(arguments.get('scalarBase'), str):
+            arguments['scalarBase'] = bakedTextures[arguments['scalarBase']].sprite[0].get_rect().size
+        elif 'scalarBase' in arguments:
+            arguments['scalarBase'] = tuple(arguments['scalarBase'])
+
+        textureDictionary = create_textures(cache=cache, registry=registry, **arguments)
+        for name, recipe in textureDictionary.recipes.items():
+            if recipe.origin is None:
+                continue
+            texture = textureDictionary[name]
+            packTextures[cache.get_key(recipe.origin[0], recipe.origin[1])] = (name, texture.sprite)
+            bakedTextures[name] = texture
+
+    TexturePack.write(manifest['pack'], packTextures)
+    return manifest['pack']
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description='Hornea las texturas de los manifiestos en paquetes de texturas.')
+    parser.add_argument('manifests', nargs='+', help='Rutas de los manifiestos JSON')
+    arguments = parser.parse_args()
+
+    pygame.init()
+    for manifestPath in arguments.manifests:
+        packPath = bake(manifestPath)
+        print(f'{manifestPath} -> {packPath} ({os.path.getsize(packPath) / 1024 / 1024:.1f} MB)')
+
+if __name__ == '__main__':
+    main()
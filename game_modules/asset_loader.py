@@ -0,0 +1,115 @@
+import pygame, os
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from game_modules.utilities import Texture, TextureRecipe, TextureDictionary, textureCache
+from game_modules.texture_cache import TextureCache, surface_from_buffer
+
+# Carga en paralelo de las texturas de create_textures (en /game_modules/utilities.py)
+# Los hilos de trabajo decodifican las imagenes, aplican las transformaciones (o leen el cache en disco) y retornan los bytes RGBA de los fotogramas,
+# y el hilo principal solo crea las imagenes en el formato de la pantalla a partir de esos bytes.
+
+def build_texture_buffers(recipe:TextureRecipe, cache:TextureCache) -> tuple[str, list[tuple[tuple[int, int], bytes|memoryview]]]:
+    """Crea la textura de la receta (o la lee del cache en disco) y retorna los bytes RGBA de sus fotogramas. Se ejecuta en los hilos de trabajo, por lo que no usa el formato de la pantalla.
+
+    Args:
+        recipe (TextureRecipe): La receta de la textura, su padre (si tiene) ya debe estar creado.
+
+        cache (TextureCache): El cache donde buscar y guardar la textura.
+
+    Returns:
+        tuple[str, list[tuple[tuple[int, int], bytes|memoryview]]]: El nombre de la textura y el tamaño y los bytes de cada fotograma.
+    """
+
+    if recipe.origin is not None:
+        key = cache.get_key(recipe.origin[0], recipe.origin[1])
+        cachedBuffers = cache.load_buffers(key)
+        if cachedBuffers is not None:
+            return cachedBuffers
+
+    textureVariation = recipe.createTexture(recipe.parent.texture if recipe.parent is not None else None)
+    frames = textureVariation['sprite'].sprite
+    if recipe.origin is not None:
+        cache.save(key, textureVariation['name'], frames)
+    return textureVariation['name'], [(frame.get_size(), pygame.image.tobytes(frame, 'RGBA')) for frame in frames]
+
+class AssetLoader:
+    """Sus instancias crean en paralelo, con un grupo de hilos de trabajo, las texturas que aun no se han creado de los diccionarios retornados por create_textures."""
+
+    def __init__(self, workers:int=None, cache:TextureCache=None) -> None:
+        """Guarda la configuracion del cargador.
+
+        Args:
+            workers (int, optional): La cantidad de hilos de trabajo. Si no se especifica se usa la cantidad de nucleos del procesador. Defaults to None.
+
+            cache (TextureCache, optional): El cache en disco donde se buscan y guardan las texturas. Si no se especifica se usa textureCache. Defaults to None.
+        """
+
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.cache = cache if cache is not None else textureCache
+
+    def get_pending_recipes(self, requests:list[TextureDictionary|tuple[TextureDictionary, list[str]]]) -> list[TextureRecipe]:
+        """Retorna las recetas que se deben crear para obtener las texturas pedidas, incluyendo las recetas de las que dependen si la textura no esta en el cache.
+
+        Args:
+            requests (list[TextureDictionary|tuple[TextureDictionary, list[str]]]): Los diccionarios de texturas a cargar completos, o tuplas con el diccionario y los nombres de las texturas a cargar.
+
+        Returns:
+            list[TextureRecipe]: Las recetas sin crear, sin repetir.
+        """
+
+        pendingRecipes = {}
+        for request in requests:
+            if isinstance(request, tuple):
+                textureDictionary, names = request
+            else:
+                textureDictionary, names = request, None
+            if not isinstance(textureDictionary, TextureDictionary):
+                continue
+            for name in (names if names is not None else textureDictionary.recipes.keys()):
+                for recipe in textureDictionary.recipes[name].get_chain():
+                    if recipe.texture is not None:
+                        break
+                    pendingRecipes[id(recipe)] = recipe
+                    if recipe.origin is not None and self.cache.contains(self.cache.get_key(recipe.origin[0], recipe.origin[1])):
+                        # La textura se lee del cache o de un paquete, no se necesitan las texturas de las que depende
+                        break
+        return list(pendingRecipes.values())
+
+    def load(self, requests:list[TextureDictionary|tuple[TextureDictionary, list[str]]], progressCallback=None) -> None:
+        """Crea en paralelo las texturas pedidas que aun no se han creado. Cada receta se envia a los hilos de trabajo en cuanto su padre esta creado.
+
+        Args:
+            requests (list[TextureDictionary|tuple[TextureDictionary, list[str]]]): Los diccionarios de texturas a cargar completos, o tuplas con el diccionario y los nombres de las texturas a cargar.
+
+            progressCallback (types.FunctionType, optional): Funcion que recibe la cantidad de texturas creadas y la cantidad total, se llama en el hilo principal cada vez que se crea una textura. Defaults to None.
+        """
+
+        pendingRecipes = self.get_pending_recipes(requests)
+        total = len(pendingRecipes)
+        if progressCallback is not None:
+            progressCallback(0, total)
+        if total == 0:
+            return
+
+        waitingRecipes = {} # Recetas que esperan a que se cree su padre, por id del padre
+        readyRecipes = []
+        pendingIds = set(id(recipe) for recipe in pendingRecipes)
+        for recipe in pendingRecipes:
+            if recipe.parent is not None and id(recipe.parent) in pendingIds:
+                waitingRecipes.setdefault(id(recipe.parent), []).append(recipe)
+            else:
+                readyRecipes.append(recipe)
+
+        loaded = 0
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = {executor.submit(build_texture_buffers, recipe, self.cache): recipe for recipe in readyRecipes}
+            while len(futures) > 0:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in done:
+                    recipe = futures.pop(future)
+                    name, buffers = future.result()
+                    recipe.texture = Texture([surface_from_buffer(buffer, size) for size, buffer in buffers])
+                    loaded += 1
+                    if progressCallback is not None:
+                        progressCallback(loaded, total)
+                    for childRecipe in waitingRecipes.pop(id(recipe), []):
+                        futures[executor.submit(build_texture_buffers, childRecipe, self.cache)] = childRecipe
@@ -0,0 +1,113 @@
+import pygame, bisect
+from game_modules.swept_collision import get_displacement, get_swept_hitbox
+
+# Mundo de colisiones de un nivel: resuelve las colisiones entre todas las entidades colisionables, no solo las del personaje principal.
+# Usa barrido y poda (sweep and prune): las entidades se mantienen ordenadas por el borde izquierdo de su hitbox y al recorrerlas en orden
+# solo se comparan las que se superponen en x, por lo que el costo es casi O(n + k), con k la cantidad de pares que se superponen en x.
+# Como entre un fotograma y el siguiente las entidades casi no cambian de orden, la lista se reordena con una pasada de insercion.
+# Se usa el rectangulo que recorre cada hitbox en el fotograma (ver /game_modules/swept_collision.py), para encontrar tambien los choques que una entidad rapida atraviesa.
+
+class CollisionWorld:
+    """Sus instancias guardan las entidades de un nivel ordenadas por el borde izquierdo de su hitbox, y en cada fotograma resuelven las colisiones de las entidades colisionables que se movieron."""
+
+    def __init__(self) -> None:
+        self.bodies = [] # Las entidades ordenadas por el borde izquierdo de su hitbox
+        self.pairs = [] # Los pares de entidades que chocaron en el ultimo fotograma
+
+    def add(self, body) -> None:
+        """Agrega la entidad al final de la lista, se mueve a su lugar en la siguiente llamada de sort."""
+        self.bodies.append(body)
+
+    def remove(self, body) -> None:
+        if body in self.bodies:
+            self.bodies.remove(body)
+
+    def sort(self) -> list[pygame.Rect]:
+        """Ordena las entidades por el borde izquierdo del recorrido de su hitbox con una pasada de insercion, que solo mueve las que quedaron fuera de orden.
+
+        Returns:
+            list[pygame.Rect]: El recorrido de la hitbox de cada entidad (con un pixel de margen si se movio), en el nuevo orden.
+        """
+
+        # El recorrido se agranda un pixel por lado, ya que la hitbox se redondea a pixeles enteros y dos entidades que solo se tocan pueden chocar al resolverlas
+        sweptHitboxes = [get_swept_hitbox(body.physics).inflate(2, 2) if body.physics.isPositionChanged else body.physics.hitbox for body in self.bodies]
+        keys = [sweptHitbox.left for sweptHitbox in sweptHitboxes]
+        for bodyIndex in range(1, len(keys)):
+            if keys[bodyIndex - 1] > keys[bodyIndex]:
+                key = keys.pop(bodyIndex)
+                body = self.bodies.pop(bodyIndex)
+                newIndex = bisect.bisect_right(keys, key, 0, bodyIndex)
+                keys.insert(newIndex, key)
+                self.bodies.insert(newIndex, body)
+                sweptHitboxes.insert(newIndex, sweptHitboxes.pop(bodyIndex))
+        return sweptHitboxes
+
+    def get_pairs(self) -> list[tuple]:
+        """Retorna los pares de entidades colisionables cuyos recorridos de hitbox se superponen y de las cuales al menos una se movio en este fotograma (las entidades quietas que se superponen no se revisan).
+
+        Returns:
+            list[tuple[Entity, Entity]]: Los pares, en el orden del barrido.
+        """
+
+        sweptHitboxes = self.sort()
+        pairs = []
+        activeBodies = [] # Entidades (con el recorrido de su hitbox) que todavia pueden superponerse en x con las siguientes
+        for body, sweptHitbox in zip(self.bodies, sweptHitboxes):
+            if not body.physics.isCollidable:
+                continue
+            activeBodies = [(activeBody, activeHitbox) for activeBody, activeHitbox in activeBodies if activeHitbox.right > sweptHitbox.left]
+            for activeBody, activeHitbox in activeBodies:
+                if (body.physics.isPositionChanged or activeBody.physics.isPositionChanged) and sweptHitbox.colliderect(activeHitbox):
+                    pairs.append((activeBody, body))
+            activeBodies.append((body, sweptHitbox))
+        return pairs
+
+    def step(self, resolve) -> list:
+        """Resuelve las colisiones del fotograma. En cada par cada entidad que se movio se resuelve contra la otra, y cada entidad se resuelve contra todas sus entidades de los pares a la vez. Si ambas se movieron, la primera se resuelve contra la hitbox con la que la otra empezo su movimiento y la otra contra donde se detuvo la primera.
+        Si al resolverla una entidad termina fuera del recorrido de su hitbox (por ejemplo empujada por otra que se movio hacia ella) se resuelve otra vez contra las entidades quietas que toca en su nuevo recorrido, para que no atraviese las que no estaban en sus pares, como los limites del nivel.
+
+        Args:
+            resolve (types.FunctionType): La funcion que resuelve la colision, recibe la entidad que se movio y la lista de entidades con las que puede chocar, como sweep_and_limit. Debe llamar a listen_collide de ambas entidades.
+
+        Returns:
+            list[Entity]: Las entidades que se resolvieron, cuya posicion pudo cambiar.
+        """
+
+        self.pairs = self.get_pairs()
+        obstacles = {} # Entidades con las que puede chocar cada entidad que se mueve, en el orden de los pares
+        for body, otherBody in self.pairs:
+            if body.physics.isPositionChanged:
+                obstacles.setdefault(body, []).append(otherBody)
+            if otherBody.physics.isPositionChanged:
+                obstacles.setdefault(otherBody, []).append(body)
+        displacedBodies = []
+        pendingBodies = set(obstacles.keys()) # Entidades que se movieron y aun no se resuelven
+        for body, otherBodies in obstacles.items():
+            pendingBodies.discard(body)
+            # Las entidades que aun no se resuelven siguen donde empezaron su movimiento, asi no empujan a la entidad desde donde terminarian sin detenerse
+            endHitboxes = [(otherBody, otherBody.physics.hitbox) for otherBody in otherBodies if otherBody in pendingBodies]
+            for otherBody, hitbox in endHitboxes:
+                displacement = get_displacement(otherBody.physics)
+                otherBody.physics.hitbox = hitbox.move(-displacement[0], -displacement[1])
+            sweptHitbox = get_swept_hitbox(body.physics)
+            resolve(body, otherBodies)
+            for otherBody, hitbox in endHitboxes:
+                otherBody.physics.hitbox = hitbox
+            if not sweptHitbox.contains(body.physics.hitbox):
+                displacedBodies.append(body)
+        for body in displacedBodies:
+            sweptHitbox = get_swept_hitbox(body.physics)
+            staticBodies = [otherBody for otherBody in self.bodies if otherBody is not body and otherBody.physics.isCollidable and not otherBody.physics.isPositionChanged and sweptHitbox.colliderect(otherBody.physics.hitbox)]
+            if len(staticBodies) > 0:
+                resolve(body, staticBodies)
+        return list(obstacles.keys())
+
+    def clear(self) -> None:
+        self.bodies.clear()
+        self.pairs.clear()
+
+    def __contains__(self, body) -> bool:
+        return body in self.bodies
+
+    def __len__(self) -> int:
+        return len(self.bodies)
@@ -0,0 +1,86 @@
+import pygame
+
+# Capa de depuracion de los niveles, que muestra las hitboxes, posiciones y espacios clickeables (teclas H, J y K).
+# La imagen de la capa se crea una sola vez y en cada fotograma solo se borran las regiones donde se dibujo en el fotograma anterior,
+# en lugar de crear una imagen del tamaño del nivel en cada fotograma.
+
+class DebugOverlay:
+    """Sus instancias guardan la imagen donde se dibujan las hitboxes, posiciones y espacios clickeables de las entidades, y las regiones dibujadas para borrarlas en el siguiente fotograma."""
+
+    def __init__(self, displaySize:tuple[int, int]) -> None:
+        """Crea la capa sin imagen, la imagen se crea en el primer fotograma que se muestra.
+
+        Args:
+            displaySize (tuple[int, int]): El tamaño de la ventana, las posiciones fuera de la ventana no se dibujan.
+        """
+
+        self.displaySize = displaySize
+        self.surface = None
+        self.dirtyRects = [] # Regiones de la imagen dibujadas desde la ultima vez que se borro
+
+    def begin(self, size:tuple[int, int]) -> None:
+        """Prepara la imagen para un nuevo fotograma, borrando solo las regiones dibujadas en el fotograma anterior (o toda la imagen si esas regiones suman mas area). El negro es transparente.
+
+        Args:
+            size (tuple[int, int]): El tamaño de la imagen, como maximo se usa el tamaño de la ventana ya que la imagen se dibuja en (0, 0).
+        """
+
+        size = (min(size[0], self.displaySize[0]), min(size[1], self.displaySize[1]))
+        if self.surface is None or self.surface.get_size() != size:
+            self.surface = pygame.Surface(size)
+            self.surface.set_colorkey((0,0,0))
+            self.dirtyRects = []
+        if sum(rect.width * rect.height for rect in self.dirtyRects) < size[0] * size[1]:
+            for rect in self.dirtyRects:
+                self.surface.fill((0,0,0), rect)
+        else:
+            # Las regiones se superponen o cubren casi toda la imagen, es mas rapido borrarla completa
+            self.surface.fill((0,0,0))
+        self.dirtyRects = []
+
+    def draw_entity(self, entity, offset:tuple, showHitboxes:bool, showPositions:bool, showClickableSpaces:bool) -> None:
+        """Dibuja la hitbox, la posicion y el espacio clickeable de la entidad, calculando cada uno una sola vez.
+
+        Args:
+            entity (Entity): La entidad.
+
+            offset (tuple): El desplazamiento de la entidad en la pantalla, como la posicion de dibujo del nivel.
+
+            showHitboxes (bool): Si se dibuja la hitbox.
+
+            showPositions (bool): Si se dibuja la posicion.
+
+            showClickableSpaces (bool): Si se dibuja el espacio clickeable, con un color segun si la entidad esta clickeada o debajo del mouse.
+        """
+
+        if showHitboxes:
+            hitbox = entity.physics.hitbox
+            fittedHitbox = pygame.Rect((offset[0] + hitbox.left, offset[1] + hitbox.top), hitbox.size)
+            self.dirtyRects.append(pygame.draw.rect(self.surface, entity.physics.hitboxColor, fittedHitbox, 10))
+
+        if showPositions:
+            fittedPosition = (offset[0] + entity.physics.position[0], offset[1] + entity.physics.position[1])
+            if 0 <= fittedPosition[0] <= self.displaySize[0] and 0 <= fittedPosition[1] <= self.displaySize[1]:
+                self.dirtyRects.append(pygame.draw.circle(self.surface, entity.physics.positionColor, fittedPosition, 10))
+
+        if showClickableSpaces:
+            clickableSpace = entity.get_clickable_space()
+            fittedClickableSpace = pygame.Rect((offset[0] + clickableSpace.left, offset[1] + clickableSpace.top), clickableSpace.size)
+            if entity.isClicked:
+                color = (255,0,0)
+            elif entity.isRightClicked:
+                color = (255,0,255)
+            elif entity.isHover:
+                color = (255,255,0)
+            else:
+                color = (0,255,0)
+            self.dirtyRects.append(pygame.draw.rect(self.surface, color, fittedClickableSpace, 5))
+
+    def get_surface(self) -> pygame.Surface:
+        return self.surface
+
+    def get_drawn_area(self) -> pygame.Rect:
+        """Retorna el rectangulo que contiene todo lo dibujado en el fotograma, la unica parte de la imagen que se debe dibujar en la pantalla."""
+        if len(self.dirtyRects) == 0:
+            return pygame.Rect(0, 0, 0, 0)
+        return self.dirtyRects[0].unionall(self.dirtyRects[1:])
@@ -0,0 +1,102 @@
+import bisect
+
+# Orden de dibujo (profundidad) de las entidades de un nivel: las entidades se dibujan de menor a mayor posicion y maxima de su textura,
+# para que las que estan mas abajo en la pantalla se dibujen encima. Como entre un fotograma y el siguiente casi todas las entidades
+# quedan en el mismo orden, se guarda la posicion y (llave) de cada entidad y solo se actualiza la de las entidades cuya posicion y cambio
+# (ver update_key). En cada fotograma solo esas entidades se vuelven a insertar en su lugar, en lugar de volver a ordenar toda la lista.
+
+def get_depth_key(entity) -> float:
+    """Retorna la llave con la que se ordena la entidad, la posicion y maxima de su textura."""
+    return entity.get_max_y_texture_position()
+
+class DepthOrder:
+    """Sus instancias mantienen ordenada por profundidad una lista de entidades (la lista de entidades del nivel, que se modifica en su lugar) y la posicion de cada entidad en ella."""
+
+    def __init__(self) -> None:
+        self.entities = [] # Las entidades en orden de dibujo
+        self.order = {} # Posicion de cada entidad en la lista
+        self.keys = {} # Llave de cada entidad con la que esta ordenada la lista
+        self.changedEntities = set() # Entidades cuya llave cambio desde la ultima llamada de update
+
+    def update_order(self) -> None:
+        self.order = {entity: entityIndex for entityIndex, entity in enumerate(self.entities)}
+
+    def sort(self, entities:list) -> None:
+        """Ordena completamente la lista de entidades, en su lugar, y la guarda como la lista a mantener ordenada. Las entidades con la misma llave conservan su orden.
+
+        Args:
+            entities (list[Entity]): Las entidades.
+        """
+
+        self.keys = {entity: get_depth_key(entity) for entity in entities}
+        entities.sort(key=self.keys.__getitem__)
+        self.entities = entities
+        self.changedEntities.clear()
+        self.update_order()
+
+    def update_key(self, entity, key:float) -> None:
+        """Guarda la llave de la entidad, si cambio la entidad se mueve a su lugar en la siguiente llamada de update.
+
+        Args:
+            entity (Entity): La entidad, que debe estar en la lista.
+
+            key (float): La posicion y maxima de la textura de la entidad (ver get_depth_key).
+        """
+
+        if self.keys.get(entity) != key:
+            self.keys[entity] = key
+            self.changedEntities.add(entity)
+
+    def is_in_order(self, entityIndex:int) -> bool:
+        """Retorna si la entidad en la posicion dada esta en orden con sus vecinas."""
+        key = self.keys[self.entities[entityIndex]]
+        if entityIndex > 0 and self.keys[self.entities[entityIndex - 1]] > key:
+            return False
+        return entityIndex + 1 == len(self.entities) or key <= self.keys[self.entities[entityIndex + 1]]
+
+    def update(self) -> bool:
+        """Mueve a su lugar las entidades cuya llave cambio (por ejemplo porque se movieron o se agregaron al final). Las demas entidades siguen ordenadas, por lo que solo se quitan las que cambiaron y se vuelven a insertar con una busqueda binaria, despues de las que tienen la misma llave.
+
+        Returns:
+            bool: True si el orden cambio.
+        """
+
+        if len(self.changedEntities) == 0:
+            return False
+        changedIndexes = sorted(self.order[entity] for entity in self.changedEntities)
+        self.changedEntities.clear()
+        # Si cada entidad que cambio sigue en orden con sus vecinas toda la lista sigue ordenada
+        if all(self.is_in_order(entityIndex) for entityIndex in changedIndexes):
+            return False
+        changedEntities = [self.entities[entityIndex] for entityIndex in changedIndexes]
+        for entityIndex in reversed(changedIndexes):
+            self.entities.pop(entityIndex)
+        for entity in changedEntities:
+            self.entities.insert(bisect.bisect_right(self.entities, self.keys[entity], key=self.keys.__getitem__), entity)
+        self.update_order()
+        return True
+
+    def add(self, entity) -> None:
+        """Agrega la entidad al final de la lista, se mueve a su lugar en la siguiente llamada de update."""
+        self.entities.append(entity)
+        self.order[entity] = len(self.entities) - 1
+        self.keys[entity] = get_depth_key(entity)
+        self.changedEntities.add(entity)
+
+    def remove(self, entity) -> None:
+        self.entities.remove(entity)
+        self.keys.pop(entity, None)
+        self.changedEntities.discard(entity)
+        self.update_order()
+
+    def sort_subset(self, entities) -> list:
+        """Retorna las entidades (que pueden ser solo algunas de la lista, por ejemplo las visibles) en orden de dibujo. Las entidades que no estan en la lista quedan al final.
+
+        Args:
+            entities (Iterable[Entity]): Las entidades.
+
+        Returns:
+            list[Entity]: Las entidades ordenadas.
+        """
+
+        return sorted(entities, key=lambda entity: self.order.get(entity, len(self.entities)))
@@ -0,0 +1,67 @@
+import pygame
+
+# Lista de dibujo: en lugar de llamar a blit por cada imagen, los niveles y menus agregan a una lista las imagenes a dibujar en orden
+# (con su posicion, area y modo de mezcla) y la lista se dibuja al final con Surface.blits, o con Surface.fblits si existe (pygame-ce),
+# que dibujan todas las imagenes en una sola llamada. La lista tambien permite revisar o contar lo que se dibuja en cada fotograma.
+
+class DrawList:
+    """Sus instancias guardan en orden las imagenes a dibujar en un fotograma y las dibujan por lotes."""
+
+    def __init__(self) -> None:
+        self.items = [] # (imagen, posicion, area, modo de mezcla) de cada imagen, en el orden en que se dibujan
+
+    def add(self, surface:pygame.Surface, position:tuple, area:pygame.Rect|None=None, special_flags:int=0) -> None:
+        """Agrega una imagen a dibujar despues de las ya agregadas.
+
+        Args:
+            surface (pygame.Surface): La imagen.
+
+            position (tuple): La posicion en la superficie donde se dibuja.
+
+            area (pygame.Rect | None, optional): La parte de la imagen a dibujar, como en Surface.blit. Defaults to None.
+
+            special_flags (int, optional): El modo de mezcla, como en Surface.blit. Defaults to 0.
+        """
+
+        self.items.append((surface, position, area, special_flags))
+
+    def get_batches(self) -> list[tuple[bool, int, list]]:
+        """Retorna los lotes en que se dibuja la lista: las imagenes seguidas sin area y con el mismo modo de mezcla pueden dibujarse con fblits.
+
+        Returns:
+            list[tuple[bool, int, list]]: Por cada lote, si se puede dibujar con fblits, su modo de mezcla y sus elementos.
+        """
+
+        batches = []
+        for item in self.items:
+            isFast = item[2] is None
+            if len(batches) > 0 and batches[-1][0] == isFast and (not isFast or batches[-1][1] == item[3]):
+                batches[-1][2].append(item)
+            else:
+                batches.append((isFast, item[3], [item]))
+        return batches
+
+    def submit(self, surface:pygame.Surface) -> None:
+        """Dibuja todas las imagenes de la lista en la superficie, en orden.
+
+        Args:
+            surface (pygame.Surface): La superficie donde se dibuja, como la pantalla.
+        """
+
+        if not hasattr(surface, 'fblits'):
+            surface.blits(self.items, doreturn=False)
+            return
+        for isFast, special_flags, items in self.get_batches():
+            if isFast:
+                surface.fblits([(item[0], item[1]) for item in items], special_flags)
+            else:
+                surface.blits(items, doreturn=False)
+
+    def clear(self) -> None:
+        self.items.clear()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
@@ -1,5 +1,13 @@
 import pygame, math
 from game_modules.utilities import *
+from game_modules.spatial_grid import SpatialGrid
+from game_modules.static_layer import StaticLayer
+from game_modules.depth_order import DepthOrder
+from game_modules.draw_list import DrawList
+from game_modules.debug_overlay import DebugOverlay
+from game_modules.collision_world import CollisionWorld
+from game_modules import physics_batch
+from game_modules.swept_collision import sweep_and_limit, get_swept_hitbox
 from game_modules.utilities import Animation, FitThePositionBehaviour, Location, Physics, types
         
 class Entity:
@@ -34,13 +42,28 @@ class Entity:
         self.isRightClicked = False
         self.isHover = False
         self.globals = {}
+        self.transformState = None # De lo que se calculo la hitbox en update_hitbox, solo se vuelve a calcular si cambia
+        self.transformHitbox = None # La hitbox calculada en update_hitbox, si la hitbox de physics es otra se vuelve a calcular
+        self.textureRect = None # El rectangulo de la textura calculado en update_hitbox, valido hasta que cambie la posicion o el fotograma
+        self.depthKey = None # La posicion y maxima de la textura calculada en update_hitbox, con la que se ordena para dibujar (ver DepthOrder)
     
     def get_clickable_space(self) -> pygame.Rect:
         if self.clickableSpace == ClickableSpace.SPRITE:
-            return pygame.Rect(self.get_texture_position(),self.animation.get_texture().get_rect().size)
+            return self.get_texture_rect()
         else:
             return self.physics.hitbox
+
+    def get_texture_rect(self) -> pygame.Rect:
+        """Retorna el rectangulo que ocupa la textura de la entidad en el nivel."""
+        return pygame.Rect(self.get_texture_position(), self.animation.get_texture().get_rect().size)
     
+    def get_texture_dictionaries(self) -> list[dict]:
+        """Retorna los diccionarios de texturas que usa la entidad, incluyendo el de la animacion de fondo si la tiene."""
+        textureDictionaries = [self.animation.textures]
+        if isinstance(self.animation, IconAnimation) and self.animation.background is not None:
+            textureDictionaries.append(self.animation.background.textures)
+        return textureDictionaries
+
     def listen_mouse(self, mousePosition, mouseButtons):
         self.isHover = True
         self.mouseListener(self, mousePosition, mouseButtons)
@@ -57,48 +80,45 @@ class Entity:
         for key, listener in self.eventListeners.items():
             listener(entity=self, state=pressedEventList[key])  
 
-    def update(self, FPS:int, firstInit:bool=False) -> None:
+    def update(self, FPS:int, firstInit:bool=False, updateHitbox:bool=True) -> None:
         """Update the animation .
 
         Args:
             FPS (int): [description]
+
+            updateHitbox (bool, optional): If it is False the hitbox is not updated, for example when the position is integrated later by a PhysicsBatch. Defaults to True.
         """
         if not firstInit:    
             self.time+=1/FPS
             self.behaviour(self)
             self.animation.update_frame(FPS)      
             self.physics.update_position(FPS)
-        self.physics.update_hitbox(pygame.Rect(self.get_texture_position(), self.animation.get_texture().get_size()))
+        if updateHitbox:
+            self.update_hitbox()
         self.isClicked = False
         self.isHover = False
         self.isRightClicked = False
+
+    def update_hitbox(self) -> None:
+        """Ajusta la hitbox al rectangulo de la textura, que se guarda en textureRect junto a la posicion y maxima de la textura en depthKey. Solo se vuelven a calcular si cambio la posicion, el tamaño del fotograma actual, la posicion relativa, el margen, tamaño o posicion relativa de la hitbox, o si otra parte del codigo cambio la hitbox (como las colisiones)."""
+        physics = self.physics
+        size = self.animation.get_texture().get_size()
+        transformState = (physics, physics.position[0], physics.position[1], size, self.location, tuple(physics.margin), tuple(physics.hitboxSize), physics.hitboxLocation)
+        if transformState != self.transformState or physics.hitbox is not self.transformHitbox:
+            self.textureRect = pygame.Rect(self.get_texture_position(), size)
+            physics.update_hitbox(self.textureRect)
+            self.depthKey = self.get_max_y_texture_position()
+            self.transformState = transformState
+            self.transformHitbox = physics.hitbox
     
     def get_texture_position(self) -> list:
-        """AI is creating summary for get_texture_position
+        """Retorna la posicion de la esquina superior izquierda de la textura, segun la posicion de la entidad y su posicion relativa (ver LOCATION_ANCHORS).
 
         Returns:
-            list: [description]
+            list: La posicion (x, y).
         """
-        if self.location == Location.LEFT_TOP:
-            return self.physics.position
-        elif self.location == Location.CENTER_TOP:
-            return [self.physics.position[0] - self.animation.get_texture().get_rect().width / 2, self.physics.position[1]]
-        elif self.location == Location.RIGHT_TOP:
-            return [self.physics.position[0] - self.animation.get_texture().get_rect().width, self.physics.position[1]]
-        elif self.location == Location.CENTER_RIGHT:
-            return [self.physics.position[0] - self.animation.get_texture().get_rect().width, self.physics.position[1] - self.animation.get_texture().get_rect().height / 2]
-        elif self.location == Location.RIGHT_BOTTOM:
-            return [self.physics.position[0] - self.animation.get_texture().get_rect().width, self.physics.position[1] - self.animation.get_texture().get_rect().height]
-        elif self.location == Location.CENTER_BOTTOM:
-            return [self.physics.position[0] - self.animation.get_texture().get_rect().width / 2, self.physics.position[1] - self.animation.get_texture().get_rect().height]
-        elif self.location == Location.LEFT_BOTTOM:
-            return [self.physics.position[0], self.physics.position[1] - self.animation.get_texture().get_rect().height]
-        elif self.location == Location.CENTER_LEFT:
-            return [self.physics.position[0], self.physics.position[1] - self.animation.get_texture().get_rect().height / 2]
-        elif self.location == Location.CENTER:
-            return [self.physics.position[0] - self.animation.get_texture().get_rect().width / 2, self.physics.position[1] - self.animation.get_texture().get_rect().height / 2]
-        else:
-            return self.physics.position
+        offset = get_anchor_offset(self.location, self.animation.get_texture().get_size())
+        return [self.physics.position[0] + offset[0], self.physics.position[1] + offset[1]]
 
     def get_max_y_texture_position(self) -> list:
         """Returns the maximum y - coordinate position of the texture in the mesh .
@@ -209,8 +229,9 @@ class Background(Entity):
 
         self.displaySize = displaySize
  
-        for key in self.animation.textures.keys():
-
+        # Las texturas reescaladas se guardan como nuevas texturas, ya que las originales pueden estar compartidas en el registro de texturas
+        for key in list(self.animation.textures.keys()):
+            scalledSprite = []
             for index in range(self.animation.textures[key].lenght):
                 textureAspectRatio = self.animation.textures[key].sprite[index].get_rect().height / self.animation.textures[key].sprite[index].get_rect().width
                 displayAspectRatio = displaySize[1] / displaySize[0]
@@ -218,15 +239,15 @@ class Background(Entity):
                     textureScalar = displaySize[1] * scalar / self.animation.textures[key].sprite[index].get_rect().height
                 else:
                     textureScalar = displaySize[0] * scalar / self.animation.textures[key].sprite[index].get_rect().width
-                self.animation.textures[key].sprite[index] = pygame.transform.scale_by(self.animation.textures[key].sprite[index], textureScalar)
+                scalledSprite.append(pygame.transform.scale_by(self.animation.textures[key].sprite[index], textureScalar))
+            self.animation.textures[key] = Texture(scalledSprite)
+
+        self.composite = None # La imagen retornada por get_texture, se reutiliza mientras el fondo no se mueva
+        self.compositeState = None
     
-    def get_texture(self) -> pygame.Surface:
-        finalTexture = pygame.Surface(self.animation.textures[self.animation.actualTexture].sprite[self.animation.frame].get_size())
-        finalTexture.set_colorkey((0,0,0,0))
-        imageFrame = self.animation.textures[self.animation.actualTexture].sprite[self.animation.frame]
-        width = imageFrame.get_width()
-        height = imageFrame.get_height()
-        x, y = self.physics.position
+    def wrap_position(self) -> None:
+        """Mantiene la posicion del fondo entre menos el tamaño del fotograma y 0 en cada eje, ya que el fondo se repite."""
+        width, height = self.animation.textures[self.animation.actualTexture].sprite[self.animation.frame].get_size()
         if self.physics.position[0] > 0:
             self.physics.position[0] -= width
         elif self.physics.position[0] < -width:
@@ -236,37 +257,51 @@ class Background(Entity):
             self.physics.position[1] -= height
         elif self.physics.position[1] < -height:
             self.physics.position[1] += height
-        
-        finalTexture.blit(imageFrame, (x, y))
-        finalTexture.blit(imageFrame,  (x + width, y))
-        finalTexture.blit(imageFrame,  (x, y + height))
-        finalTexture.blit(imageFrame,  (x + width, y + height))
 
-        return finalTexture
+    def draw(self, surface:pygame.Surface, position:tuple) -> None:
+        """Dibuja el fondo repetido directamente en la imagen, sin crear imagenes intermedias. Solo se dibujan las copias del fotograma que se ven en el area del fondo, por lo que un fondo que solo se mueve horizontalmente cuesta dos blits.
+
+        Args:
+            surface (pygame.Surface): La imagen donde se dibuja el fondo.
+
+            position (tuple): La posicion en la imagen de la esquina superior izquierda del area del fondo, que tiene el tamaño del fotograma.
+        """
+
+        self.wrap_position()
+        imageFrame = self.animation.textures[self.animation.actualTexture].sprite[self.animation.frame]
+        width, height = imageFrame.get_size()
+        area = pygame.Rect(position, (width, height))
+        x, y = area.left + int(self.physics.position[0]), area.top + int(self.physics.position[1])
+
+        previousClip = surface.get_clip()
+        surface.set_clip(area.clip(previousClip))
+        for tilePosition in ((x, y), (x + width, y), (x, y + height), (x + width, y + height)):
+            if area.colliderect((tilePosition, (width, height))):
+                surface.blit(imageFrame, tilePosition)
+        surface.set_clip(previousClip)
+
+    def get_texture(self) -> pygame.Surface:
+        """Retorna el fondo repetido en una imagen del tamaño del fotograma. La imagen se guarda y solo se vuelve a dibujar si cambia la posicion o el fotograma.
+
+        Returns:
+            pygame.Surface: La imagen del fondo.
+        """
+
+        self.wrap_position()
+        imageFrame = self.animation.textures[self.animation.actualTexture].sprite[self.animation.frame]
+        if self.composite is None or self.composite.get_size() != imageFrame.get_size():
+            self.composite = pygame.Surface(imageFrame.get_size(), pygame.SRCALPHA)
+            self.compositeState = None
+
+        state = (imageFrame, self.physics.position[0], self.physics.position[1])
+        if state != self.compositeState:
+            self.composite.fill((0, 0, 0, 0))
+            self.draw(self.composite, (0, 0))
+            self.compositeState = state
+        return self.composite
     
     def get_texture_position(self) -> list:
-        if self.location == Location.LEFT_TOP:
-            return 0, 0
-        elif self.location == Location.CENTER_TOP:
-            return [-self.animation.get_texture().get_rect().width / 2, 0]
-        elif self.location == Location.RIGHT_TOP:
-            return [-self.animation.get_texture().get_rect().width, 0]
-        elif self.location == Location.CENTER_RIGHT:
-            return [-self.animation.get_texture().get_rect().width, -self.animation.get_texture().get_rect().height / 2]
-        elif self.location == Location.RIGHT_BOTTOM:
-            return [-self.animation.get_texture().get_rect().width, -self.animation.get_texture().get_rect().height]
-        elif self.location == Location.CENTER_BOTTOM:
-
-            return [-self.animation.get_texture().get_rect().width / 2, -self.animation.get_texture().get_rect().height]
-        
-        elif self.location == Location.LEFT_BOTTOM:
-            return [0, -self.animation.get_texture().get_rect().height]
-        elif self.location == Location.CENTER_LEFT:
-            return [0, -self.animation.get_texture().get_rect().height / 2]
-        elif self.location == Location.CENTER:
-            return [-self.animation.get_texture().get_rect().width / 2, -self.animation.get_texture().get_rect().height / 2]
-        else:
-            return 0,0
+        return list(get_anchor_offset(self.location, self.animation.get_texture().get_size()))
         
 basicCharacterBehaviour = {pygame.K_LEFT: walk_to_left, pygame.K_RIGHT: walk_to_right, pygame.K_UP: walk_to_up, pygame.K_DOWN: walk_to_down}
 
@@ -296,108 +331,6 @@ def quick_backgrounds_sort(backgroundsList:list):
     else:
         return backgroundsList    
 
-def quick_entities_sort(entitiesList:list[Entity]):
-    if 0 < len(entitiesList) - 1:
-        pivot = entitiesList[:1]
-        left = []
-        right = []
-        
-        for element in entitiesList[1:]:
-            if pivot[0].get_max_y_texture_position() > element.get_max_y_texture_position():
-                left.append(element)
-            else:
-                right.append(element)
-                
-        left = quick_entities_sort(left)
-        right = quick_entities_sort(right)
-        
-        return left + pivot + right
-        
-    else:
-        return entitiesList  
-
-def collide_and_limit(listeningEntity:Entity, entitiesList:list[Entity], changeColor:bool=True):
-    collided = False
-    if len(entitiesList) >= 1:
-        for entity in entitiesList:
-            horizontal = 0
-            vertical = 0
-            if listeningEntity.physics.hitbox.colliderect(entity.physics.hitbox):
-                collided = True
-                
-                if listeningEntity.physics.isCollidable and entity.physics.isCollidable:
-                    horizontal = listeningEntity.physics.position[0] - listeningEntity.physics.previousPosition[0]
-                    vertical = listeningEntity.physics.position[1] - listeningEntity.physics.previousPosition[1]
-
-                    
-                    if horizontal > 0:
-                        pending = vertical / horizontal
-                        newYPositionByX = (entity.physics.hitbox.left - listeningEntity.physics.hitbox.width) * pending + (listeningEntity.physics.hitbox.top - listeningEntity.physics.hitbox.left * pending)
-
-                        if newYPositionByX + listeningEntity.physics.hitbox.height < entity.physics.hitbox.top or newYPositionByX > entity.physics.hitbox.top + entity.physics.hitbox.height:
-                            #The movement must be returned on y axis
-                            if vertical > 0: 
-                                #The movement must be returned to up  
-                                #print('up', f'prev: {listeningEntity.physics.previousHitbox.left}, {listeningEntity.physics.previousHitbox.top}; actu: {listeningEntity.physics.hitbox.left}, {listeningEntity.physics.hitbox.top}', end='; ')             
-                                listeningEntity.physics.position = [listeningEntity.physics.position[0],  listeningEntity.physics.position[1] + (entity.physics.hitbox.top - listeningEntity.physics.hitbox.height) - listeningEntity.physics.hitbox.top]
-                            else:
-                                #Te movement must be returned to down
-                                #print('down', f'prev: {listeningEntity.physics.previousHitbox.left}, {listeningEntity.physics.previousHitbox.top}; actu: {listeningEntity.physics.hitbox.left}, {listeningEntity.physics.hitbox.top}', end='; ')
-                                listeningEntity.physics.position = [listeningEntity.physics.position[0],  listeningEntity.physics.position[1] + (entity.physics.hitbox.top + entity.physics.hitbox.height) - listeningEntity.physics.hitbox.top]
-                        else:
-                            #The movement must be returned to left
-                            #print('left', f'prev: {listeningEntity.physics.previousHitbox.left}, {listeningEntity.physics.previousHitbox.top}; actu: {listeningEntity.physics.hitbox.left}, {listeningEntity.physics.hitbox.top}', end='; ') 
-                            listeningEntity.physics.position = [listeningEntity.physics.position[0] + (entity.physics.hitbox.left - listeningEntity.physics.hitbox.width) - listeningEntity.physics.hitbox.left, listeningEntity.physics.position[1]]
-                    elif horizontal < 0:
-                        pending = vertical / horizontal
-                        newYPositionByX = (entity.physics.hitbox.left + entity.physics.hitbox.width) * pending + (listeningEntity.physics.hitbox.top - listeningEntity.physics.hitbox.left * pending)
-
-
-                        if newYPositionByX + listeningEntity.physics.hitbox.height < entity.physics.hitbox.top or newYPositionByX > entity.physics.hitbox.top + entity.physics.hitbox.height:
-                            #The movement must be returned on y axis
-                            if vertical > 0:  
-                                #The movement must be returned to up
-                                #print('up', f'prev: {listeningEntity.physics.previousHitbox.left}, {listeningEntity.physics.previousHitbox.top}; actu: {listeningEntity.physics.hitbox.left}, {listeningEntity.physics.hitbox.top}', end='; ')             
-                                listeningEntity.physics.position = [listeningEntity.physics.position[0],  listeningEntity.physics.position[1] + (entity.physics.hitbox.top - listeningEntity.physics.hitbox.height) - listeningEntity.physics.hitbox.top]
-                            else:
-                                #Te movement must be returned to down
-                                #print('down', f'prev: {listeningEntity.physics.previousHitbox.left}, {listeningEntity.physics.previousHitbox.top}; actu: {listeningEntity.physics.hitbox.left}, {listeningEntity.physics.hitbox.top}', end='; ')
-                                listeningEntity.physics.position = [listeningEntity.physics.position[0],  listeningEntity.physics.position[1] + (entity.physics.hitbox.top + entity.physics.hitbox.height) - listeningEntity.physics.hitbox.top]
-                        else:
-                            #The movement must be returned to right
-                            #print('right', f'prev: {listeningEntity.physics.previousHitbox.left}, {listeningEntity.physics.previousHitbox.top}; actu: {listeningEntity.physics.hitbox.left}, {listeningEntity.physics.hitbox.top}', end='; ') 
-                            listeningEntity.physics.position = [listeningEntity.physics.position[0] + (entity.physics.hitbox.left + entity.physics.hitbox.width) - listeningEntity.physics.hitbox.left, listeningEntity.physics.position[1]]
-                    else:
-                        #The movement must be returned on y axis
-                        if vertical > 0:
-                            #The movement must be returned to up
-                            #print('up', f'prev: {listeningEntity.physics.previousHitbox.left}, {listeningEntity.physics.previousHitbox.top}; actu: {listeningEntity.physics.hitbox.left}, {listeningEntity.physics.hitbox.top}', end='; ') 
-                            listeningEntity.physics.position = [listeningEntity.physics.position[0],  listeningEntity.physics.position[1] + (entity.physics.hitbox.top - listeningEntity.physics.hitbox.height) - listeningEntity.physics.hitbox.top]
-                        elif vertical < 0:
-                            #Te movement must be returned to down
-                            #print('down', f'prev: {listeningEntity.physics.previousHitbox.left}, {listeningEntity.physics.previousHitbox.top}; actu: {listeningEntity.physics.hitbox.left}, {listeningEntity.physics.hitbox.top}', end='; ')
-                            listeningEntity.physics.position = [listeningEntity.physics.position[0],  listeningEntity.physics.position[1] + (entity.physics.hitbox.top + entity.physics.hitbox.height) - listeningEntity.physics.hitbox.top]
-                    listeningEntity.physics.update_hitbox(pygame.Rect(listeningEntity.get_texture_position(), listeningEntity.animation.get_texture().get_size()))
-                    #print(f'nuev: {listeningEntity.physics.hitbox.left}, {listeningEntity.physics.hitbox.top}')
-
-                if changeColor:
-                    entity.physics.hitboxColor = (255,100,0)
-
-                listeningEntity.listen_collide(entity)
-                entity.listen_collide(listeningEntity)
-            else:
-                if changeColor:
-                    entity.physics.hitboxColor = (0,200,255)
-    
-            
-    if collided:
-        if changeColor:
-            listeningEntity.physics.hitboxColor = (255,0,100)
-        #listeningEntity.physics.previousPosition
-    else:
-        if changeColor:
-            listeningEntity.physics.hitboxColor = (255,200,0)
-
 def show_hitboxes(entity:Entity, state:bool):
     if state:
         if entity.globals['alternate_show_hitboxes']:
@@ -425,7 +358,7 @@ def show_clickable_spaces(entity:Entity, state:bool):
 debug_level_listeners = {pygame.K_h:show_hitboxes, pygame.K_j: show_positions, pygame.K_k: show_clickable_spaces}
 
 class LevelWorksSpace(Entity):
-    def __init__(self, levelSize:tuple, background:Background|list, mainCharacter:MainCharacter, displaySize:tuple, entitiesList:Entity|list, entity_id:int|str, physics:list|Physics=Physics([0, 0]), animation=Animation(), location=Location.LEFT_TOP, eventListeners:dict=debug_level_listeners, backgroundColor:tuple=(0,0,255, 0),behaviour:types.FunctionType=lambda selfEntity:None, firstInitFps:int=60, mouseListener:types.FunctionType=lambda selfEntity, mousePosition, buttons:None, fitThePositionBehaviour:int=FitThePositionBehaviour.FOLLOW_MAIN_CHARACTER) -> None:
+    def __init__(self, levelSize:tuple, background:Background|list, mainCharacter:MainCharacter, displaySize:tuple, entitiesList:Entity|list, entity_id:int|str, physics:list|Physics=Physics([0, 0]), animation=Animation(), location=Location.LEFT_TOP, eventListeners:dict=debug_level_listeners, backgroundColor:tuple=(0,0,255, 0),behaviour:types.FunctionType=lambda selfEntity:None, firstInitFps:int=60, mouseListener:types.FunctionType=lambda selfEntity, mousePosition, buttons:None, fitThePositionBehaviour:int=FitThePositionBehaviour.FOLLOW_MAIN_CHARACTER, usePhysicsBatch:bool=False) -> None:
         super().__init__(physics, animation, location, entity_id=entity_id, eventListeners=eventListeners, behaviour=behaviour, mouseListener=mouseListener)
 
         self.physics.previousPosition = [0, 0]
@@ -445,6 +378,22 @@ class LevelWorksSpace(Entity):
         self.drawPosition = [0, 0]
         self.cutOuterBackground = True
         self.sharedEntities = [] # Here will be the shared entities from others levels, they haven't to be updated
+        self.backgroundState = None # What the background image was drawn from, it is only redrawn if it changes
+        self.isBackgroundChanged = True
+        self.previousDrawStates = {} # Screen rect and draw state of each entity in the last frame, used by get_dirty_rects
+        self.previousDrawPosition = None
+        self.entityGrid = SpatialGrid() # Spatial index of the entities texture rects, used to draw only the visible entities
+        self.hitboxGrid = SpatialGrid() # Spatial index of the entities hitboxes, used to check the collisions only with the nearby entities
+        self.nearbyEntities = set() # Entities near the main character hitbox in the last frame, see get_collision_candidates
+        self.collisionWorld = CollisionWorld() # Resolves the collisions between the entities that move, see /game_modules/collision_world.py
+        # Integrates the positions of all the entities at once with NumPy, see /game_modules/physics_batch.py. Without NumPy each entity integrates its own position
+        self.physicsBatch = physics_batch.PhysicsBatch() if usePhysicsBatch and physics_batch.is_available() else None
+        self.depthOrder = DepthOrder() # Keeps entitiesList sorted by depth (texture max y) every frame, see /game_modules/depth_order.py
+        self.drawnEntitiesCount = 0 # Entities drawn and culled (not drawn because they are outside the view) in the last show
+        self.culledEntitiesCount = 0
+        self.drawList = DrawList() # Images drawn by show, see /game_modules/draw_list.py
+        self.debugOverlay = DebugOverlay(displaySize) # Hitboxes, positions and clickable spaces drawn when debugging, see /game_modules/debug_overlay.py
+        self.staticLayer = StaticLayer() # The static entities are drawn together in baked bands, see /game_modules/static_layer.py
 
 
         self.entities = {}
@@ -452,6 +401,7 @@ class LevelWorksSpace(Entity):
             self.mainCharacter.parent = self
             if self.mainCharacter.entity_id is not None:
                 self.entities[self.mainCharacter.entity_id] = self.mainCharacter.entity_id
+            self.collisionWorld.add(self.mainCharacter)
 
 
         self.displaySize = displaySize
@@ -479,10 +429,15 @@ class LevelWorksSpace(Entity):
             entity.parent = self
             if entity.entity_id is not None:
                 self.entities[entity.entity_id] = entity.entity_id
+            self.collisionWorld.add(entity)
+            if self.physicsBatch is not None:
+                self.physicsBatch.add(entity)
         
         self.update_backgrounds()
         self.update_all(firstInitFps, firstInit=True)
 
+        self.staticLayer.build(self.entitiesList)
+
     def add_background(self, background:Background):
         background.parent = self
         self.backgroundList.append(background)
@@ -492,61 +447,237 @@ class LevelWorksSpace(Entity):
     
     def add_entity(self, entity:Entity):
         entity.parent = self
-        self.entitiesList.append(entity)
+        self.depthOrder.add(entity)
         if entity.entity_id is not None:
             self.entities[entity.entity_id] = entity
-        self.areEntitiesSorted = False
+        self.entityGrid.insert(entity, entity.get_texture_rect())
+        self.insert_hitbox(entity)
+        self.collisionWorld.add(entity)
+        if self.physicsBatch is not None:
+            self.physicsBatch.add(entity)
 
     def remove_entity(self, id:int|str, entity:Entity=None):
         if entity is None:
-            self.entitiesList.remove(self.entities[id])
+            self.depthOrder.remove(self.entities[id])
+            self.entityGrid.remove(self.entities[id])
+            self.hitboxGrid.remove(self.entities[id])
+            self.collisionWorld.remove(self.entities[id])
+            if self.physicsBatch is not None:
+                self.physicsBatch.remove(self.entities[id])
+            self.staticLayer.remove(self.entities[id])
             del self.entities[id]
         else:
             if entity in self.entitiesList:
-                self.entitiesList.remove(entity)
+                self.depthOrder.remove(entity)
+                self.entityGrid.remove(entity)
+                self.hitboxGrid.remove(entity)
+                self.collisionWorld.remove(entity)
+                if self.physicsBatch is not None:
+                    self.physicsBatch.remove(entity)
+                self.staticLayer.remove(entity)
             elif entity in self.backgroundList:
                 self.backgroundList.remove(entity)
 
+    def unload(self) -> None:
+        """Deja de usar las texturas del personaje principal, los fondos y las entidades en el registro de texturas, liberando las que ya no use ningun otro nivel o menu."""
+        for entity in [self.mainCharacter] + self.backgroundList + self.entitiesList:
+            if entity is not None:
+                for textureDictionary in entity.get_texture_dictionaries():
+                    textureRegistry.release(textureDictionary)
+
     def update_entities(self, FPS:int=0, firstInit:bool=False) -> None:
         if not self.areEntitiesSorted:
-            self.entitiesList = quick_entities_sort(self.entitiesList)
+            self.depthOrder.sort(self.entitiesList)
             self.areEntitiesSorted = True
-        if FPS > 0:
-            for entityIndex in range(len(self.entitiesList)):
-                self.entitiesList[entityIndex].update(FPS, firstInit=firstInit)
+        isPhysicsBatched = self.physicsBatch is not None and FPS > 0 and not firstInit
+        for entityIndex in range(len(self.entitiesList)):
+            if FPS > 0:
+                self.entitiesList[entityIndex].update(FPS, firstInit=firstInit, updateHitbox=not isPhysicsBatched)
+            if not isPhysicsBatched:
+                entity = self.entitiesList[entityIndex]
+                if FPS > 0:
+                    # update already computed the texture rect and depth key in update_hitbox
+                    self.insert_entity(entity, entity.textureRect, entity.depthKey)
+                else:
+                    self.insert_entity(entity, entity.get_texture_rect(), entity.get_max_y_texture_position())
+        if isPhysicsBatched:
+            # The behaviours already changed the velocities, the positions are integrated all at once and then the hitboxes are updated
+            self.physicsBatch.step(FPS)
+            for entity in self.entitiesList:
+                entity.update_hitbox()
+                self.insert_entity(entity, entity.textureRect, entity.depthKey)
+        resolvedEntities = []
+        if FPS > 0 and not firstInit:
+            # The collidable entities that moved (including the main character) are resolved against the others, each one only once
+            resolvedEntities = self.collisionWorld.step(self.resolve_collisions)
+            for entity in resolvedEntities:
+                if entity is not self.mainCharacter:
+                    self.insert_entity(entity, entity.get_texture_rect(), entity.get_max_y_texture_position())
+        if self.mainCharacter is not None and self.mainCharacter not in resolvedEntities:
+            # The main character listens to the entities it touches (and its debug colours are updated) even if it did not run into anything
+            self.resolve_collisions(self.mainCharacter, [])
+        # The entities whose texture max y changed (or were added) are moved to their place in the drawing order
+        self.depthOrder.update()
+
+    def insert_entity(self, entity:Entity, textureRect:pygame.Rect, depthKey:float) -> None:
+        """Actualiza la entidad en los indices de texturas y de hitboxes y en el orden de dibujo, y la quita de la capa estatica si se movio.
+
+        Args:
+            entity (Entity): La entidad, ya actualizada.
+
+            textureRect (pygame.Rect): El rectangulo de la textura de la entidad en el nivel.
+
+            depthKey (float): La posicion y maxima de la textura de la entidad.
+        """
+
+        self.entityGrid.insert(entity, textureRect)
+        # A baked entity that moved is drawn on its own, even if it is no longer visible its band would still draw it where it was
+        self.staticLayer.check_rect(entity, textureRect)
+        self.insert_hitbox(entity)
+        self.depthOrder.update_key(entity, depthKey)
+
+    def resolve_collisions(self, entity:Entity, entitiesList:list[Entity]) -> None:
+        """Resuelve las colisiones de una entidad que se movio con sweep_and_limit. El personaje principal se resuelve contra las entidades cercanas del indice de hitboxes (ver get_collision_candidates), con las que tambien se actualizan los colores de depuracion de las hitboxes.
+
+        Args:
+            entity (Entity): La entidad que se movio.
+
+            entitiesList (list[Entity]): Las entidades con las que puede chocar, segun el mundo de colisiones.
+        """
+
+        if entity is self.mainCharacter:
+            sweep_and_limit(entity, self.get_collision_candidates(entity))
+        else:
+            sweep_and_limit(entity, entitiesList, changeColor=False)
+
+    def insert_hitbox(self, entity:Entity) -> None:
+        """Agrega o actualiza la hitbox de la entidad en el indice de hitboxes, que solo cambia si la hitbox cambio (por ejemplo si la entidad se movio)."""
+        if self.mainCharacter is not None and entity not in self.hitboxGrid:
+            # The collisions are only checked with the nearby entities, so the others start marked as not collided
+            entity.physics.hitboxColor = (0,200,255)
+        self.hitboxGrid.insert(entity, entity.physics.hitbox)
+
+    def get_collision_candidates(self, entity:Entity) -> list[Entity]:
+        """Retorna las entidades cuya hitbox puede chocar con la hitbox de la entidad en este fotograma, en el orden de entitiesList. Se busca en el recorrido de la hitbox desde la posicion anterior de la entidad (ver sweep_and_limit), y se incluyen las candidatas del fotograma anterior para que se marquen las que dejaron de chocar.
+
+        Args:
+            entity (Entity): La entidad que se mueve, como el personaje principal.
+
+        Returns:
+            list[Entity]: Las entidades cercanas.
+        """
+
+        nearbyEntities = self.hitboxGrid.query(get_swept_hitbox(entity.physics).inflate(2, 2))
+        candidates = nearbyEntities | {nearbyEntity for nearbyEntity in self.nearbyEntities if nearbyEntity in self.hitboxGrid}
+        self.nearbyEntities = nearbyEntities
+        return self.depthOrder.sort_subset(candidates)
+
+    def get_visible_entities(self, view:pygame.Rect) -> list[Entity]:
+        """Retorna las entidades cuya textura toca la region del nivel, en el orden en que se dibujan, buscandolas en el indice espacial.
+
+        Args:
+            view (pygame.Rect): La region del nivel, por ejemplo la parte que se ve en la pantalla.
+
+        Returns:
+            list[Entity]: Las entidades visibles.
+        """
+
+        return self.depthOrder.sort_subset(self.entityGrid.query(view))
+
+    def get_view(self, screenRect:pygame.Rect) -> pygame.Rect:
+        """Retorna la region del nivel que se dibuja en el rectangulo de la pantalla, con un pixel de margen por el redondeo de las posiciones."""
+        return pygame.Rect(screenRect.left - int(self.drawPosition[0]) - 1, screenRect.top - int(self.drawPosition[1]) - 1, screenRect.width + 2, screenRect.height + 2)
 
     def update_backgrounds(self, FPS:int=0, firstInit:bool=False) -> None:
         if not self.areBackgroundsSorted:
             self.backgroundList = quick_backgrounds_sort(self.backgroundList)
             self.areBackgroundsSorted = True
         if FPS > 0:
-            self.background.fill(self.backgroundColor)
             for backgroundIndex in range(len(self.backgroundList)):
                 self.backgroundList[backgroundIndex].update(FPS, firstInit=firstInit)
-                self.background.blit(self.backgroundList[backgroundIndex].get_texture(), self.fitThePosition(self.backgroundList[backgroundIndex].get_texture_position()))
+            backgroundState = self.get_background_state()
+            self.isBackgroundChanged = backgroundState != self.backgroundState
+            if not self.isBackgroundChanged:
+                return
+            self.backgroundState = backgroundState
+
+            self.background.fill(self.backgroundColor)
             if self.cutOuterBackground:
-                left = 0
-                width = self.displaySize[0]
-                if 0 <= self.physics.position[0] <= self.displaySize[0]:
-                    left = self.physics.position[0]
-                    width = self.displaySize[0] - self.physics.position[0]
-                elif 0 >= self.displaySize[0] - self.levelSize[0] >= self.physics.position[0] >= - self.levelSize[0]:
-                    width = self.levelSize[0] + self.physics.position[0]
-                elif self.physics.position[0] < - self.levelSize[0] or self.physics.position[0] > self.displaySize[0]:
-                    width = 0
-                top = 0
-                height = self.displaySize[1]
-                if 0 <= self.physics.position[1] <= self.displaySize[1]:
-                    top = self.physics.position[1]
-                    height = self.displaySize[1] - self.physics.position[1]
-                elif 0 >= self.displaySize[1] - self.levelSize[1] >= self.physics.position[1] >= - self.levelSize[1]:
-                    height = self.levelSize[1] + self.physics.position[1]
-                elif self.physics.position[1] < - self.levelSize[1] or self.physics.position[1] > self.displaySize[1]:
-                    height = 0
-
-                cuttedBackground = self.background.subsurface(left, top, width, height).copy()
-                self.background.fill(self.backgroundColor)
-                self.background.blit(cuttedBackground, (left ,top))
+                # The backgrounds are only drawn inside the level, the rest of the window keeps the background color.
+                # Inside the level the background color is blended over itself, as when the cut background was blitted over the filled window
+                levelDisplayRect = self.get_level_display_rect()
+                levelColor = pygame.Surface((1, 1), pygame.SRCALPHA)
+                levelColor.fill(self.backgroundColor)
+                levelColor.blit(levelColor.copy(), (0, 0))
+                self.background.fill(levelColor.get_at((0, 0)), levelDisplayRect)
+                self.background.set_clip(levelDisplayRect)
+            for backgroundIndex in range(len(self.backgroundList)):
+                self.backgroundList[backgroundIndex].draw(self.background, self.fitThePosition(self.backgroundList[backgroundIndex].get_texture_position()))
+            self.background.set_clip(None)
+
+    def get_level_display_rect(self) -> pygame.Rect:
+        """Retorna la region de la ventana ocupada por el nivel segun su posicion, fuera de la cual no se dibujan los fondos si cutOuterBackground es True."""
+
+        left = 0
+        width = self.displaySize[0]
+        if 0 <= self.physics.position[0] <= self.displaySize[0]:
+            left = self.physics.position[0]
+            width = self.displaySize[0] - self.physics.position[0]
+        elif 0 >= self.displaySize[0] - self.levelSize[0] >= self.physics.position[0] >= - self.levelSize[0]:
+            width = self.levelSize[0] + self.physics.position[0]
+        elif self.physics.position[0] < - self.levelSize[0] or self.physics.position[0] > self.displaySize[0]:
+            width = 0
+        top = 0
+        height = self.displaySize[1]
+        if 0 <= self.physics.position[1] <= self.displaySize[1]:
+            top = self.physics.position[1]
+            height = self.displaySize[1] - self.physics.position[1]
+        elif 0 >= self.displaySize[1] - self.levelSize[1] >= self.physics.position[1] >= - self.levelSize[1]:
+            height = self.levelSize[1] + self.physics.position[1]
+        elif self.physics.position[1] < - self.levelSize[1] or self.physics.position[1] > self.displaySize[1]:
+            height = 0
+        return pygame.Rect(left, top, width, height)
+
+    def get_background_state(self) -> tuple:
+        """Retorna de que depende la imagen de fondo del nivel: la posicion de dibujo, la posicion del nivel, el color de fondo y el fotograma y la posicion de cada fondo."""
+        backgroundsState = tuple((background.animation.get_draw_state(), background.physics.position[0], background.physics.position[1]) for background in self.backgroundList)
+        return (self.drawPosition[0], self.drawPosition[1], self.physics.position[0], self.physics.position[1], tuple(self.backgroundColor), self.cutOuterBackground, backgroundsState)
+
+    def get_dirty_rects(self) -> list[pygame.Rect]|None:
+        """Retorna las regiones de la pantalla que cambiaron desde la ultima llamada porque una entidad se movio, se agrego o se elimino, o cambio su imagen (fotograma, texto, colores). Retorna None si se debe dibujar todo el nivel: cuando cambio el fondo, se desplazo el espacio de trabajo o se muestran los dibujos de depuracion.
+
+        Returns:
+            list[pygame.Rect]|None: Las regiones que cambiaron, o None.
+        """
+
+        drawStates = {}
+        drawnEntities = [(entity, True) for entity in self.get_visible_entities(self.get_view(pygame.Rect((0, 0), self.displaySize)))]
+        if self.mainCharacter is not None:
+            drawnEntities.append((self.mainCharacter, self.fitMainCharacterPosition))
+        for entity, isFitted in drawnEntities:
+            texture, area = entity.animation.get_texture_area()
+            position = self.fitThePosition(entity.get_texture_position()) if isFitted else entity.get_texture_position()
+            drawStates[id(entity)] = (pygame.Rect(position, area.size if area is not None else texture.get_size()), entity.animation.get_draw_state())
+
+        drawPosition = (self.drawPosition[0], self.drawPosition[1])
+        isFullRedraw = self.isBackgroundChanged or drawPosition != self.previousDrawPosition or self.showHitboxes or self.showPositions or self.showClickableSpaces
+        previousDrawStates = self.previousDrawStates
+        self.previousDrawStates = drawStates
+        self.previousDrawPosition = drawPosition
+        self.isBackgroundChanged = False # Si el nivel no se actualiza (por ejemplo en pausa) el fondo no vuelve a cambiar
+        if isFullRedraw:
+            return None
+
+        dirtyRects = []
+        for key, (rect, state) in drawStates.items():
+            if key not in previousDrawStates:
+                dirtyRects.append(rect)
+            elif previousDrawStates[key][0] != rect or previousDrawStates[key][1] != state:
+                dirtyRects += [previousDrawStates[key][0], rect]
+        for key, (rect, state) in previousDrawStates.items():
+            if key not in drawStates:
+                dirtyRects.append(rect)
+        return dirtyRects
 
     def update_works_space_position(self) -> None:
         """Compute the works space position to try centrate a specific point."""
@@ -627,8 +758,6 @@ class LevelWorksSpace(Entity):
         self.update_backgrounds(FPS=FPS, firstInit=firstInit)
         self.update_entities(FPS=FPS, firstInit=firstInit)
         self.update_works_space_position()
-        if self.mainCharacter is not None:
-            collide_and_limit(self.mainCharacter, self.entitiesList)
           
     def fitThePosition(self, position:list) -> list:
         return self.drawPosition[0] + position[0], self.drawPosition[1] + position[1]
@@ -670,81 +799,70 @@ class LevelWorksSpace(Entity):
                     self.mainCharacter.listen_mouse(mousePosition, mouseButtons)
 
     def show(self, display:pygame.Surface) -> None:
-        display.blit(self.background, (0,0))
+        self.drawList.clear()
+        self.add_to_draw_list(self.drawList, display.get_clip())
+        self.drawList.submit(display)
+
+    def add_to_draw_list(self, drawList:DrawList, screenRect:pygame.Rect) -> None:
+        """Agrega a la lista de dibujo, en orden, el fondo, las entidades visibles en la region de la pantalla, el personaje principal y los dibujos de depuracion.
+
+        Args:
+            drawList (DrawList): La lista de dibujo.
+
+            screenRect (pygame.Rect): La region de la pantalla que se dibuja, por ejemplo su region de recorte.
+        """
+
+        drawList.add(self.background, (0,0))
         isMainCharacterShowed = False
-        if self.showHitboxes or self.showPositions or self.showClickableSpaces:
-            debugImage = pygame.Surface(self.levelSize)
-            debugImage.set_colorkey((0,0,0))
+        isDebugShowed = self.showHitboxes or self.showPositions or self.showClickableSpaces
+        if isDebugShowed:
+            self.debugOverlay.begin(self.levelSize)
+            if self.mainCharacter is not None:
+                self.debugOverlay.draw_entity(self.mainCharacter, self.drawPosition if self.fitMainCharacterPosition else (0, 0), self.showHitboxes, self.showPositions, self.showClickableSpaces)
 
-        if self.mainCharacter is not None:
-            if self.showHitboxes:
-                if self.fitMainCharacterPosition:
-                    mainCharacterFittedHitbox = pygame.Rect(self.fitThePosition((self.mainCharacter.physics.hitbox.left, self.mainCharacter.physics.hitbox.top)), (self.mainCharacter.physics.hitbox.width, self.mainCharacter.physics.hitbox.height))
-                else:
-                    mainCharacterFittedHitbox = self.mainCharacter.physics.hitbox
-                pygame.draw.rect(debugImage, self.mainCharacter.physics.hitboxColor, mainCharacterFittedHitbox, 10)
+        visibleEntities = self.get_visible_entities(self.get_view(screenRect))
+        self.drawnEntitiesCount = len(visibleEntities)
+        self.culledEntitiesCount = len(self.entitiesList) - len(visibleEntities)
 
-            if self.showPositions:
-                if self.fitMainCharacterPosition:
-                    mainCharacterFittedPosition = self.fitThePosition(self.mainCharacter.physics.position)
-                else:
-                    mainCharacterFittedPosition = self.mainCharacter.physics.position
-                
-                if 0 <= mainCharacterFittedPosition[0] <= self.displaySize[0] and 0 <= mainCharacterFittedPosition[1] <= self.displaySize[1]:
-                    pygame.draw.circle(debugImage, self.mainCharacter.physics.positionColor, mainCharacterFittedPosition, 10)
-            
-            if self.showClickableSpaces:
-                if self.fitMainCharacterPosition:
-                    mainCharacterFittedClickableSpace = pygame.Rect(self.fitThePosition((self.mainCharacter.get_clickable_space().left, self.mainCharacter.get_clickable_space().top)), (self.mainCharacter.get_clickable_space().width, self.mainCharacter.get_clickable_space().height))
-                else:
-                    mainCharacterFittedClickableSpace = self.mainCharacter.get_clickable_space()
-                if self.mainCharacter.isClicked:
-                    pygame.draw.rect(debugImage, (255,0,0), mainCharacterFittedClickableSpace, 5)
-                elif self.mainCharacter.isRightClicked:
-                    pygame.draw.rect(debugImage, (255,0,255), mainCharacterFittedClickableSpace, 5)
-                elif self.mainCharacter.isHover:
-                    pygame.draw.rect(debugImage, (255,255,0), mainCharacterFittedClickableSpace, 5)
-                else:
-                    pygame.draw.rect(debugImage, (0,255,0), mainCharacterFittedClickableSpace, 5)
+        # The static entities whose band can be drawn at once are drawn with a single blit of the band, where its first entity is drawn
+        mainCharacterIndex = len(visibleEntities)
+        if self.mainCharacter is not None:
+            for entityIndex in range(len(visibleEntities)):
+                if visibleEntities[entityIndex].get_max_y_texture_position() > self.mainCharacter.get_max_y_texture_position():
+                    mainCharacterIndex = entityIndex
+                    break
+        entityBands, drawableBands = self.staticLayer.get_drawable_bands(visibleEntities, mainCharacterIndex)
 
-        for entity in self.entitiesList:
+        for entityIndex, entity in enumerate(visibleEntities):
             if self.mainCharacter is not None:
-                if not isMainCharacterShowed and entity.get_max_y_texture_position() > self.mainCharacter.get_max_y_texture_position():
+                if not isMainCharacterShowed and entityIndex == mainCharacterIndex:
+                    mainCharacterTexture, mainCharacterArea = self.mainCharacter.animation.get_texture_area()
                     if self.fitMainCharacterPosition:
-                        display.blit(self.mainCharacter.animation.get_texture(), self.fitThePosition(self.mainCharacter.get_texture_position()))
+                        drawList.add(mainCharacterTexture, self.fitThePosition(self.mainCharacter.get_texture_position()), mainCharacterArea)
                     else:
-                        display.blit(self.mainCharacter.animation.get_texture(), self.mainCharacter.get_texture_position())
+                        drawList.add(mainCharacterTexture, self.mainCharacter.get_texture_position(), mainCharacterArea)
                     isMainCharacterShowed = True
                     
-            display.blit(entity.animation.get_texture(), self.fitThePosition(entity.get_texture_position()))
-            if self.showHitboxes:
-                entityFittedHitbox = pygame.Rect(self.fitThePosition((entity.physics.hitbox.left, entity.physics.hitbox.top)), (entity.physics.hitbox.width, entity.physics.hitbox.height))
-                pygame.draw.rect(debugImage, entity.physics.hitboxColor, entityFittedHitbox, 10)
-                
-            if self.showPositions:
-                entityFittedPosition = self.fitThePosition(entity.physics.position)
-                if 0 <= entityFittedPosition[0] <= self.displaySize[0] and 0 <= entityFittedPosition[1] <= self.displaySize[1]:
-                    pygame.draw.circle(debugImage, entity.physics.positionColor, entityFittedPosition, 10)
-            
-            if self.showClickableSpaces:
-                entityFittedClickableSpace = pygame.Rect(self.fitThePosition((entity.get_clickable_space().left, entity.get_clickable_space().top)), (entity.get_clickable_space().width, entity.get_clickable_space().height))
-                if entity.isClicked:
-                    pygame.draw.rect(debugImage, (255,0,0), entityFittedClickableSpace, 5)
-                elif entity.isRightClicked:
-                    pygame.draw.rect(debugImage, (255,0,255), entityFittedClickableSpace, 5)
-                elif entity.isHover:
-                    pygame.draw.rect(debugImage, (255,255,0), entityFittedClickableSpace, 5)
-                else:
-                    pygame.draw.rect(debugImage, (0,255,0), entityFittedClickableSpace, 5)
+            if entityBands[entityIndex] in drawableBands:
+                if drawableBands[entityBands[entityIndex]] == entityIndex and entityBands[entityIndex].get_surface() is not None:
+                    band = entityBands[entityIndex]
+                    drawList.add(band.get_surface(), (math.floor(self.drawPosition[0] + band.origin[0]), math.floor(self.drawPosition[1] + band.origin[1])), special_flags=pygame.BLEND_PREMULTIPLIED)
+            else:
+                entityTexture, entityArea = entity.animation.get_texture_area()
+                drawList.add(entityTexture, self.fitThePosition(entity.get_texture_position()), entityArea)
+            if isDebugShowed:
+                self.debugOverlay.draw_entity(entity, self.drawPosition, self.showHitboxes, self.showPositions, self.showClickableSpaces)
 
         if self.mainCharacter is not None:
             if not isMainCharacterShowed:
-                display.blit(self.mainCharacter.animation.get_texture(), self.fitThePosition(self.mainCharacter.get_texture_position()))
+                mainCharacterTexture, mainCharacterArea = self.mainCharacter.animation.get_texture_area()
+                drawList.add(mainCharacterTexture, self.fitThePosition(self.mainCharacter.get_texture_position()), mainCharacterArea)
 
         #pygame.draw.rect(display, (255, 0, 0), (self.fitThePosition(self.mainCharacter.get_texture_position())[0], self.fitThePosition(self.mainCharacter.get_texture_position())[1],self.mainCharacter.animation.get_texture().get_rect().width, self.mainCharacter.animation.get_texture().get_rect().height))
         
-        if self.showHitboxes or self.showPositions or self.showClickableSpaces:
-            display.blit(debugImage, (0,0))
+        if isDebugShowed:
+            debugArea = self.debugOverlay.get_drawn_area()
+            drawList.add(self.debugOverlay.get_surface(), debugArea.topleft, debugArea)
         
 class ContextualMenu(LevelWorksSpace):
     def __init__(self, menuSize: tuple, closeAllMenusBeforeShow:bool, closeOnClickOutside:bool, preventOthersListening:bool, preventOthersUpdates:bool, background: Background | list, displaySize: tuple, entitiesList: Entity | list, entity_id: int | str, physics: list | Physics = Physics([0, 0]), animation=Animation(), eventListeners: dict = debug_level_listeners, backgroundColor: tuple = (0, 0, 255, 0), behaviour: types.FunctionType = lambda selfEntity: None, firstInitFps: int = 60, mouseListener: types.FunctionType = lambda selfEntity, mousePosition, buttons: None) -> None:
@@ -753,9 +871,34 @@ class ContextualMenu(LevelWorksSpace):
         self.preventOthersUpdates = preventOthersUpdates
         self.closeAllMenusBeforeShow = closeAllMenusBeforeShow
         self.closeOnClickOutside = closeOnClickOutside
+        self.isPooled = False # Si el menu esta guardado en un MenuPool (ver /game_modules/menu_pool.py), al cerrarlo no se liberan sus texturas
+        self.save_initial_state()
+
+    def save_initial_state(self) -> None:
+        """Guarda la posicion, velocidad y texto inicial de los fondos y entidades del menu, usados por reset."""
+        self.initialState = [(entity, list(entity.physics.position), list(entity.physics.velocity), getattr(entity.animation, 'text', None)) for entity in self.backgroundList + self.entitiesList]
+
+    def reset(self) -> None:
+        """Restaura el estado que tenia el menu al crearse, para volver a mostrarlo sin crearlo de nuevo."""
+        self.time = 0
+        self.globals.clear()
+        for entity, position, velocity, text in self.initialState:
+            entity.physics.position = list(position)
+            entity.physics.velocity = list(velocity) # Se asigna una nueva lista, ya que la velocidad por defecto de Physics es compartida
+            if text is not None:
+                entity.animation.text = text
+            entity.animation.animationTime = 0
+            entity.animation.frame = entity.animation.startFrame
+            entity.time = 0
+            entity.globals.clear()
+            entity.isClicked = False
+            entity.isRightClicked = False
+            entity.isHover = False
+        self.areEntitiesSorted = False
     
     def close(self):
-        pass
+        if not self.isPooled:
+            self.unload()
     
     def pause(self):
         pass
@@ -2,20 +2,29 @@ import pygame
 from game_modules.entities import *
 from game_modules.utilities import *
 from menus.basic_game_menus import *
+from game_modules.text_engine import fontRegistry
+from game_modules.menu_pool import MenuPool
+from game_modules.draw_list import DrawList
 import levels.levelExample as template
 
 class GameManager:
     def __init__(self, windowSize:tuple[int]=(800,600), FPS:int=30):
         pygame.init()
+        fontRegistry.prewarm(menuFonts)
         self.windowSize = windowSize
         self.FPS = FPS
         self.windowSurface = pygame.display.set_mode(self.windowSize)
         self.running = False
         self.CLOCK = pygame.time.Clock()
+        self.menuPool = MenuPool() # Menus created once and reused every time they are shown
+        self.menuPool.prebuild(menuPrefabs)
+        self.useDirtyRects = True # Only redraw and present the screen regions that changed, see get_dirty_rects
+        self.previousEntitiesStack = None
+        self.drawList = DrawList() # Images of the menus and levels drawn in the last frame, submitted in batches
         self.contextualMenusStack = [] # List of the loaded contextual menus
         #self.contextualMenusStack[0].physics.position = [400,500]
         self.defaultMenu = None#create_game_inventary_interface() # Default menu to show when all menus closed
-        self.worksSpacesStack = [template.create_level(windowSize)] # List of loaded levels
+        self.worksSpacesStack = [template.create_level(windowSize, progressCallback=self.show_loading_progress)] # List of loaded levels
         self.actualLevel = 0 # Actual position of the actual level in the workspacesStack
         self.isInTrasition = False # Determines if theres a transition happenning
         self.finalLevelTransition = None # The position of the destiny level 
@@ -29,16 +38,83 @@ class GameManager:
         for level in self.worksSpacesStack:
             level.parent = self
     
+    def show_loading_progress(self, loaded:int, total:int):
+        """Draws a loading bar with the progress of the textures loading, used as progressCallback of AssetLoader.load."""
+        pygame.event.pump()
+        self.windowSurface.fill((0,0,0))
+        barRect = pygame.Rect(0, 0, self.windowSize[0] / 2, 20)
+        barRect.center = self.windowSize[0] / 2, self.windowSize[1] / 2
+        pygame.draw.rect(self.windowSurface, (255,255,255), barRect, 2)
+        if total > 0:
+            pygame.draw.rect(self.windowSurface, (255,255,255), (barRect.left, barRect.top, barRect.width * loaded / total, barRect.height))
+        pygame.display.update()
+
     def show_menu(self, newMenu:ContextualMenu):
+        if newMenu in self.contextualMenusStack:
+            return
         newMenu.parent = self
         if newMenu.closeAllMenusBeforeShow:
-            for menu in self.contextualMenusStack:
-                menu.close()
-            self.contextualMenusStack = []
+            self.close_all_menus()
+        if newMenu.isPooled:
+            newMenu.reset()
         
         self.contextualMenusStack.append(newMenu)
 
+    def show_pooled_menu(self, createMenu:types.FunctionType, *args):
+        """Shows the menu created by createMenu, creating it only the first time (see MenuPool)."""
+        self.show_menu(self.menuPool.get_menu(createMenu, *args))
+
+    def close_menu(self, menu:ContextualMenu):
+        if menu in self.contextualMenusStack:
+            self.contextualMenusStack.remove(menu)
+        menu.close()
+
+    def close_all_menus(self):
+        for menu in self.contextualMenusStack:
+            menu.close()
+        self.contextualMenusStack = []
+
+
+
+    def get_dirty_rects(self, entitiesStack:list) -> list[pygame.Rect]|None:
+        """Returns the window regions that changed since the last frame, joining the regions reported by each menu and level. Returns None if the whole window has to be redrawn, because a menu was opened or closed or a menu or level has to be fully redrawn (for example when the camera scrolls)."""
+        dirtyRects = []
+        isFullRedraw = [id(entity) for entity in entitiesStack] != self.previousEntitiesStack
+        self.previousEntitiesStack = [id(entity) for entity in entitiesStack]
+        for entity in entitiesStack:
+            entityDirtyRects = entity.get_dirty_rects()
+            if entityDirtyRects is None:
+                isFullRedraw = True
+            else:
+                dirtyRects += entityDirtyRects
+        if isFullRedraw:
+            return None
+
+        windowRect = self.windowSurface.get_rect()
+        return [rect.clip(windowRect) for rect in dirtyRects if rect.colliderect(windowRect)]
 
+    def build_draw_list(self, entitiesStack:list):
+        """Fills drawList with the images of the levels and menus of the stack, from the bottom to the top, that are visible in the window clip rect."""
+        self.drawList.clear()
+        for entity in entitiesStack[::-1]:
+            entity.add_to_draw_list(self.drawList, self.windowSurface.get_clip())
+
+    def draw(self, entitiesStack:list):
+        """Draws the menus and levels with a single draw list and presents the window. In dirty rects mode only the changed regions are redrawn and presented."""
+        dirtyRects = self.get_dirty_rects(entitiesStack) if self.useDirtyRects else None
+        if dirtyRects is None:
+            self.windowSurface.fill((0,0,0))
+            self.build_draw_list(entitiesStack)
+            self.drawList.submit(self.windowSurface)
+            pygame.display.update()
+        elif len(dirtyRects) > 0:
+            # The stack is drawn once clipped to the bounding rect of the changed regions, and only the changed regions are presented
+            self.windowSurface.set_clip(dirtyRects[0].unionall(dirtyRects[1:]))
+            self.windowSurface.fill((0,0,0))
+            self.build_draw_list(entitiesStack)
+            self.drawList.submit(self.windowSurface)
+            self.windowSurface.set_clip(None)
+            pygame.display.update(dirtyRects)
 
     def start_game(self):
         self.running = True
@@ -51,8 +127,6 @@ class GameManager:
             if not self.running:
                 break
 
-            self.windowSurface.fill((0,0,0))
-
             mousePosition = pygame.mouse.get_pos()
             mousePressed = pygame.mouse.get_pressed(3)
             keys = pygame.key.get_pressed()
@@ -78,11 +152,8 @@ class GameManager:
                 if entity.preventOthersUpdates:
                     break
             
-            for entity in entitiesStack[::-1]:
-                entity.show(self.windowSurface)
-            
-            pygame.display.update()
+            self.draw(entitiesStack)
 
             if keys[pygame.K_p]:
-                self.show_menu(create_paused_menu())
+                self.show_pooled_menu(create_paused_menu)
             self.CLOCK.tick(self.FPS)
\ No newline at end of file
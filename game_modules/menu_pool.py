@@ -0,0 +1,46 @@
+import types
+from game_modules.entities import ContextualMenu
+
+# Grupo (pool) de menus: cada menu se crea una sola vez con su funcion de creacion (prefab) y se reutiliza cada vez que se muestra,
+# restaurando su estado inicial con ContextualMenu.reset en lugar de crear de nuevo su fondo, entidades y texturas.
+
+class MenuPool:
+    """Sus instancias guardan un menu por cada funcion de creacion y argumentos, creandolo solo la primera vez que se pide."""
+
+    def __init__(self) -> None:
+        self.menus = {} # Menus por (funcion de creacion, argumentos)
+
+    def get_menu(self, createMenu:types.FunctionType, *args) -> ContextualMenu:
+        """Retorna el menu creado por la funcion con los argumentos, creandolo solo la primera vez que se pide.
+
+        Args:
+            createMenu (types.FunctionType): La funcion que crea el menu, como create_paused_menu.
+
+            *args: Los argumentos de la funcion, deben poder usarse como llave de diccionario.
+
+        Returns:
+            ContextualMenu: El menu guardado.
+        """
+
+        key = (createMenu, args)
+        if key not in self.menus:
+            menu = createMenu(*args)
+            menu.isPooled = True
+            self.menus[key] = menu
+        return self.menus[key]
+
+    def prebuild(self, createMenus:list[types.FunctionType]) -> None:
+        """Crea los menus antes de mostrarlos, por ejemplo al iniciar el juego, para que mostrarlos no tenga que crearlos.
+
+        Args:
+            createMenus (list[types.FunctionType]): Las funciones que crean los menus, sin argumentos.
+        """
+
+        for createMenu in createMenus:
+            self.get_menu(createMenu)
+
+    def clear(self) -> None:
+        """Elimina los menus guardados, liberando sus texturas."""
+        for menu in self.menus.values():
+            menu.unload()
+        self.menus.clear()
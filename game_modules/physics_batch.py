@@ -0,0 +1,216 @@
+from game_modules.utilities import Physics
+
+# NumPy es opcional, sin NumPy los niveles integran la posicion de cada entidad con Physics.update_position
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+# Integracion por lotes de las fisicas de un nivel (estructura de arreglos): la posicion, posicion anterior, velocidad y aceleracion
+# de todas las entidades se guardan en arreglos contiguos de NumPy, una fila por entidad, y cada Physics recibe vistas de su fila.
+# Asi se integran todas juntas con unas pocas operaciones de arreglos, con las mismas formulas del movimiento uniformemente acelerado
+# de Physics.update_position, en lugar de una llamada por entidad que crea tres listas nuevas.
+# Mientras esta en el lote, la instancia de Physics pasa a ser un BatchedPhysics, cuyas variables son propiedades que leen las vistas, por lo que
+# los comportamientos y colisiones las siguen usando como listas y al asignar una lista nueva sus valores se copian a la fila.
+# Las instancias que no estan en un lote no cambian, sus variables siguen siendo atributos normales.
+
+def is_available() -> bool:
+    """Retorna si se puede usar la integracion por lotes, que necesita NumPy."""
+    return numpy is not None
+
+class BatchedPhysics(Physics):
+    """Physics cuyas variables de movimiento son vistas de una fila de los arreglos de un PhysicsBatch. Las instancias no se crean, PhysicsBatch.add cambia la clase de una instancia de Physics y PhysicsBatch.remove la devuelve."""
+
+    @property
+    def position(self) -> list:
+        return self._position
+
+    @position.setter
+    def position(self, position:list) -> None:
+        self._position[:] = position
+
+    @property
+    def previousPosition(self) -> list:
+        return self._previousPosition
+
+    @previousPosition.setter
+    def previousPosition(self, previousPosition:list) -> None:
+        # La posicion anterior es [None, None] hasta la primera integracion del lote
+        if isinstance(self._previousPosition, list):
+            self._previousPosition = previousPosition
+        else:
+            self._previousPosition[:] = previousPosition
+
+    @property
+    def velocity(self) -> list:
+        return self._velocity
+
+    @velocity.setter
+    def velocity(self, velocity:list) -> None:
+        self._velocity[:] = velocity
+
+    @property
+    def aceleration(self) -> list:
+        return self._aceleration
+
+    @aceleration.setter
+    def aceleration(self, aceleration:list) -> None:
+        self._aceleration[:] = aceleration
+
+    @property
+    def isPositionChanged(self) -> bool:
+        return bool(self._isPositionChanged[0])
+
+    @isPositionChanged.setter
+    def isPositionChanged(self, isPositionChanged:bool) -> None:
+        self._isPositionChanged[0] = isPositionChanged
+
+    @property
+    def isUpdatable(self) -> bool:
+        return bool(self._isUpdatable[0])
+
+    @isUpdatable.setter
+    def isUpdatable(self, isUpdatable:bool) -> None:
+        self._isUpdatable[0] = isUpdatable
+
+    def update_position(self, FPS:int) -> None:
+        """No hace nada, el lote integra la posicion de todas sus entidades en PhysicsBatch.step."""
+        pass
+
+VARIABLES = ['position', 'previousPosition', 'velocity', 'aceleration', 'isPositionChanged', 'isUpdatable'] # Las variables de Physics que se guardan en el lote
+
+def bind_physics(physics:Physics, views:list) -> None:
+    """Convierte la instancia en un BatchedPhysics cuyas variables (en el orden de VARIABLES) son las vistas dadas."""
+    if physics.__class__ is not BatchedPhysics:
+        physics.__class__ = BatchedPhysics
+        for variable in VARIABLES:
+            physics.__dict__.pop(variable, None)
+    for variable, view in zip(VARIABLES, views):
+        physics.__dict__['_' + variable] = view
+
+def unbind_physics(physics:Physics) -> None:
+    """Devuelve la instancia a Physics, con sus variables como listas con los valores que tenian en el lote."""
+    if physics.__class__ is BatchedPhysics:
+        values = [physics.position.tolist(), physics.previousPosition if isinstance(physics.previousPosition, list) else physics.previousPosition.tolist(), physics.velocity.tolist(), physics.aceleration.tolist(), physics.isPositionChanged, physics.isUpdatable]
+        physics.__class__ = Physics
+        for variable, value in zip(VARIABLES, values):
+            physics.__dict__.pop('_' + variable, None)
+            physics.__dict__[variable] = value
+
+class PhysicsBatch:
+    """Sus instancias guardan las variables de movimiento de las entidades de un nivel en arreglos de NumPy y las integran todas juntas."""
+
+    def __init__(self, capacity:int=64) -> None:
+        """Crea los arreglos vacios.
+
+        Args:
+            capacity (int, optional): La cantidad de filas de los arreglos, se duplica cuando se llenan. Defaults to 64.
+        """
+
+        self.bodies = [] # Las entidades, en el orden de las filas de los arreglos
+        self.indices = {} # Fila de cada entidad
+        self.pendingBodies = set() # Entidades cuya posicion anterior aun es [None, None], se le asigna la vista de su fila en la primera integracion
+        self.allocate(capacity)
+
+    def allocate(self, capacity:int) -> None:
+        """Crea arreglos con la capacidad dada, copia las filas usadas y vuelve a entregar las vistas a cada entidad."""
+        count = len(self.bodies)
+        arrays = [numpy.zeros((capacity, 2)) for _ in range(4)]
+        flags = [numpy.zeros(capacity, dtype=bool) for _ in range(2)]
+        if count > 0:
+            for array, previousArray in zip(arrays + flags, [self.positions, self.previousPositions, self.velocities, self.acelerations, self.changed, self.updatable]):
+                array[:count] = previousArray[:count]
+        self.positions, self.previousPositions, self.velocities, self.acelerations = arrays
+        self.changed, self.updatable = flags
+        for bodyIndex, body in enumerate(self.bodies):
+            self.bind_body(body, bodyIndex)
+
+    def bind_body(self, body, bodyIndex:int) -> None:
+        previousPosition = [None, None] if body in self.pendingBodies else self.previousPositions[bodyIndex]
+        bind_physics(body.physics, [self.positions[bodyIndex], previousPosition, self.velocities[bodyIndex], self.acelerations[bodyIndex], self.changed[bodyIndex:bodyIndex + 1], self.updatable[bodyIndex:bodyIndex + 1]])
+
+    def add(self, body) -> None:
+        """Copia las variables de movimiento de la entidad a una nueva fila y le entrega las vistas de la fila."""
+        if body in self.indices:
+            return
+        if len(self.bodies) == len(self.positions):
+            self.allocate(2 * len(self.positions))
+        physics = body.physics
+        bodyIndex = len(self.bodies)
+        self.positions[bodyIndex] = physics.position
+        self.velocities[bodyIndex] = physics.velocity
+        self.acelerations[bodyIndex] = physics.aceleration
+        self.changed[bodyIndex] = physics.isPositionChanged
+        self.updatable[bodyIndex] = physics.isUpdatable
+        if physics.previousPosition[0] is None:
+            self.pendingBodies.add(body)
+        else:
+            self.previousPositions[bodyIndex] = physics.previousPosition
+        self.indices[body] = bodyIndex
+        self.bodies.append(body)
+        self.bind_body(body, bodyIndex)
+
+    def remove(self, body) -> None:
+        """Devuelve a la entidad sus variables de movimiento como listas y mueve la ultima entidad a su fila, para no mover las demas."""
+        if body not in self.indices:
+            return
+        unbind_physics(body.physics)
+        self.pendingBodies.discard(body)
+        bodyIndex = self.indices.pop(body)
+        lastIndex = len(self.bodies) - 1
+        lastBody = self.bodies.pop()
+        if bodyIndex != lastIndex:
+            for array in [self.positions, self.previousPositions, self.velocities, self.acelerations, self.changed, self.updatable]:
+                array[bodyIndex] = array[lastIndex]
+            self.bodies[bodyIndex] = lastBody
+            self.indices[lastBody] = bodyIndex
+            self.bind_body(lastBody, bodyIndex)
+
+    def step(self, FPS:int) -> None:
+        """Integra la posicion y la velocidad de todas las entidades con isUpdatable en True, como Physics.update_position.
+
+        Args:
+            FPS (int): Los fotogramas por segundo, el tiempo que se integra es 1 / FPS.
+        """
+
+        count = len(self.bodies)
+        if count == 0:
+            return
+        time = 1 / FPS
+        positions = self.positions[:count]
+        velocities = self.velocities[:count]
+        updatable = self.updatable[:count]
+        finalVelocities = velocities + self.acelerations[:count] * time
+        finalPositions = positions + (velocities + finalVelocities) / 2 * time
+        if updatable.all():
+            self.previousPositions[:count] = positions
+            positions[:] = finalPositions
+            velocities[:] = finalVelocities
+            self.changed[:count] = (positions != self.previousPositions[:count]).any(axis=1)
+        else:
+            # Las entidades que no se actualizan conservan todas sus variables
+            updatableRows = updatable[:, numpy.newaxis]
+            self.previousPositions[:count] = numpy.where(updatableRows, positions, self.previousPositions[:count])
+            positions[:] = numpy.where(updatableRows, finalPositions, positions)
+            velocities[:] = numpy.where(updatableRows, finalVelocities, velocities)
+            self.changed[:count] = numpy.where(updatable, (positions != self.previousPositions[:count]).any(axis=1), self.changed[:count])
+
+        if len(self.pendingBodies) > 0:
+            pendingBodies = self.pendingBodies
+            self.pendingBodies = {body for body in pendingBodies if not body.physics.isUpdatable}
+            for body in pendingBodies:
+                if body.physics.isUpdatable:
+                    self.bind_body(body, self.indices[body])
+
+    def clear(self) -> None:
+        for body in self.bodies:
+            unbind_physics(body.physics)
+        self.bodies.clear()
+        self.indices.clear()
+        self.pendingBodies.clear()
+
+    def __contains__(self, body) -> bool:
+        return body in self.indices
+
+    def __len__(self) -> int:
+        return len(self.bodies)
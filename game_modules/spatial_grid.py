@@ -0,0 +1,94 @@
+import pygame
+
+# Indice espacial de cuadricula uniforme: divide el nivel en celdas cuadradas y guarda en cada celda los elementos cuyo rectangulo la toca,
+# de forma que buscar los elementos en una region (por ejemplo la parte visible del nivel) solo revisa las celdas de esa region y no todos los elementos.
+
+class SpatialGrid:
+    """Sus instancias guardan elementos (como entidades) con su rectangulo en una cuadricula uniforme, para buscar rapidamente los elementos que tocan un rectangulo."""
+
+    def __init__(self, cellSize:int=256) -> None:
+        """Crea la cuadricula vacia.
+
+        Args:
+            cellSize (int, optional): El tamaño en pixeles de cada celda. Defaults to 256.
+        """
+
+        self.cellSize = cellSize
+        self.cells = {} # Elementos por celda (columna, fila)
+        self.items = {} # Rectangulo y celdas de cada elemento
+
+    def get_cells(self, rect:pygame.Rect) -> list[tuple[int, int]]:
+        """Retorna las celdas (columna, fila) que toca el rectangulo.
+
+        Args:
+            rect (pygame.Rect): El rectangulo.
+
+        Returns:
+            list[tuple[int, int]]: Las celdas.
+        """
+
+        left = rect.left // self.cellSize
+        top = rect.top // self.cellSize
+        right = (rect.right - 1) // self.cellSize if rect.width > 0 else left
+        bottom = (rect.bottom - 1) // self.cellSize if rect.height > 0 else top
+        return [(column, row) for column in range(left, right + 1) for row in range(top, bottom + 1)]
+
+    def insert(self, item, rect:pygame.Rect) -> None:
+        """Agrega el elemento con su rectangulo, o actualiza su rectangulo si ya esta en la cuadricula. Si el rectangulo no cambio no se hace nada.
+
+        Args:
+            item (any): El elemento, debe poder usarse como llave de diccionario.
+
+            rect (pygame.Rect): El rectangulo del elemento.
+        """
+
+        if item in self.items:
+            if self.items[item][0] == rect:
+                return
+            self.remove(item)
+        rect = pygame.Rect(rect)
+        cells = self.get_cells(rect)
+        for cell in cells:
+            self.cells.setdefault(cell, set()).add(item)
+        self.items[item] = (rect, cells)
+
+    def remove(self, item) -> None:
+        """Elimina el elemento de la cuadricula, si esta.
+
+        Args:
+            item (any): El elemento.
+        """
+
+        if item not in self.items:
+            return
+        for cell in self.items.pop(item)[1]:
+            self.cells[cell].discard(item)
+            if len(self.cells[cell]) == 0:
+                del self.cells[cell]
+
+    def query(self, rect:pygame.Rect) -> set:
+        """Retorna los elementos cuyo rectangulo se superpone con el rectangulo.
+
+        Args:
+            rect (pygame.Rect): El rectangulo donde buscar.
+
+        Returns:
+            set: Los elementos encontrados.
+        """
+
+        foundItems = set()
+        for cell in self.get_cells(rect):
+            for item in self.cells.get(cell, ()):
+                if item not in foundItems and self.items[item][0].colliderect(rect):
+                    foundItems.add(item)
+        return foundItems
+
+    def clear(self) -> None:
+        self.cells.clear()
+        self.items.clear()
+
+    def __contains__(self, item) -> bool:
+        return item in self.items
+
+    def __len__(self) -> int:
+        return len(self.items)
@@ -0,0 +1,173 @@
+import pygame
+from game_modules.utilities import IconAnimation
+
+# Capa estatica de un nivel: las entidades que no se mueven ni se animan se dibujan juntas en imagenes cacheadas (horneadas),
+# para dibujarlas con un solo blit en lugar de un blit por entidad. Para mantener el orden de dibujo con el personaje principal y
+# las demas entidades, la capa se divide en franjas horizontales (bandas) segun la posicion y maxima de la textura de cada entidad:
+# una banda se dibuja de una vez solo si ninguna otra entidad se dibuja entre sus entidades, si no sus entidades se dibujan una por una.
+# Las imagenes de las bandas se componen con alpha premultiplicado, por lo que dibujar la banda equivale a dibujar sus entidades en orden.
+
+def is_static_entity(entity) -> bool:
+    """Retorna True si la entidad no se mueve y su imagen no cambia con el tiempo: sin velocidad ni aceleracion, con un solo fotograma (o sin animar) y sin imagen compuesta (IconAnimation).
+
+    Args:
+        entity (Entity): La entidad.
+
+    Returns:
+        bool: True si la entidad puede estar en la capa estatica.
+    """
+
+    if isinstance(entity.animation, IconAnimation):
+        return False
+    if any(entity.physics.velocity) or any(entity.physics.aceleration):
+        return False
+    return not entity.animation.isAnimated or entity.animation.textures[entity.animation.actualTexture].lenght == 1
+
+class StaticBand:
+    """Sus instancias guardan las entidades estaticas de una franja horizontal del nivel y la imagen donde se dibujan juntas."""
+
+    def __init__(self) -> None:
+        self.entities = [] # Las entidades en orden de dibujo
+        self.states = {} # El rectangulo y el estado de dibujo (ver Animation.get_draw_state) de cada entidad al hornear la banda
+        self.surface = None
+        self.origin = (0, 0) # La posicion en el nivel de la imagen de la banda
+        self.isDirty = True
+
+    def bake(self) -> None:
+        """Vuelve a dibujar las entidades de la banda en su imagen, con alpha premultiplicado. Las entidades totalmente transparentes no se dibujan ni agrandan la imagen."""
+
+        frames = []
+        for entity in self.entities:
+            frame = entity.animation.get_texture()
+            if frame.get_bounding_rect().width > 0:
+                frames.append((frame, self.states[entity][0]))
+
+        if len(frames) == 0:
+            self.surface = None
+        else:
+            bounds = frames[0][1].unionall([rect for frame, rect in frames[1:]])
+            if self.surface is None or self.surface.get_size() != bounds.size:
+                self.surface = pygame.Surface(bounds.size, pygame.SRCALPHA)
+            self.surface.fill((0, 0, 0, 0))
+            for frame, rect in frames:
+                # Se copia el fotograma antes de premultiplicarlo, ya que premul_alpha no respeta el ancho de fila de las subsurfaces (como las de un atlas)
+                self.surface.blit(frame.copy().premul_alpha(), (rect.left - bounds.left, rect.top - bounds.top), special_flags=pygame.BLEND_PREMULTIPLIED)
+            self.origin = bounds.topleft
+        self.isDirty = False
+
+    def get_surface(self) -> pygame.Surface|None:
+        """Retorna la imagen de la banda con alpha premultiplicado, horneandola si alguna entidad cambio. Retorna None si todas sus entidades son transparentes."""
+        if self.isDirty:
+            self.bake()
+        return self.surface
+
+class StaticLayer:
+    """Sus instancias agrupan las entidades estaticas de un nivel en bandas horizontales horneadas (ver StaticBand)."""
+
+    def __init__(self, bandHeight:int=64, isEnabled:bool=True) -> None:
+        """Crea la capa vacia.
+
+        Args:
+            bandHeight (int, optional): El alto en pixeles de cada banda. Bandas mas pequeñas se rompen menos con el personaje principal pero son mas. Defaults to 64.
+
+            isEnabled (bool, optional): De ser False no se agrega ninguna entidad y todas se dibujan una por una. Requiere pygame 2.1.4 o superior. Defaults to True.
+        """
+
+        self.bandHeight = bandHeight
+        self.isEnabled = isEnabled and hasattr(pygame.Surface, 'premul_alpha')
+        self.bands = {} # Bandas por numero de banda
+        self.entityBands = {} # Banda de cada entidad
+
+    def get_state(self, entity) -> tuple[pygame.Rect, tuple]:
+        """Retorna el rectangulo de la textura de la entidad en el nivel y su estado de dibujo."""
+        return entity.get_texture_rect(), entity.animation.get_draw_state()
+
+    def build(self, entities:list) -> None:
+        """Agrega a la capa las entidades estaticas de la lista, que debe estar en orden de dibujo.
+
+        Args:
+            entities (list[Entity]): Las entidades del nivel.
+        """
+
+        if not self.isEnabled:
+            return
+        for entity in entities:
+            if is_static_entity(entity):
+                band = self.bands.setdefault(int(entity.get_max_y_texture_position() // self.bandHeight), StaticBand())
+                band.entities.append(entity)
+                band.states[entity] = self.get_state(entity)
+                band.isDirty = True
+                self.entityBands[entity] = band
+
+    def remove(self, entity) -> None:
+        """Quita la entidad de la capa, por lo que se dibujara sola, y marca su banda para volver a hornearla."""
+        band = self.entityBands.pop(entity, None)
+        if band is not None:
+            band.entities.remove(entity)
+            del band.states[entity]
+            band.isDirty = True
+
+    def check_rect(self, entity, textureRect:pygame.Rect) -> None:
+        """Quita la entidad de la capa si el rectangulo de su textura ya no es el horneado, para que su banda no la siga dibujando donde estaba aunque ya no sea visible. Se llama al actualizar cada entidad, ya que check solo verifica las entidades que se dibujan.
+
+        Args:
+            entity (Entity): La entidad.
+
+            textureRect (pygame.Rect): El rectangulo actual de la textura de la entidad en el nivel.
+        """
+
+        band = self.entityBands.get(entity)
+        if band is not None and band.states[entity][0] != textureRect:
+            self.remove(entity)
+
+    def check(self, entity) -> StaticBand|None:
+        """Retorna la banda de la entidad despues de verificar que no haya cambiado. Si su imagen cambio (por ejemplo al cambiar la textura actual) su banda se marca para volver a hornearla, y si se movio deja de estar en la capa.
+
+        Args:
+            entity (Entity): La entidad.
+
+        Returns:
+            StaticBand|None: La banda de la entidad, o None si no esta en la capa.
+        """
+
+        band = self.entityBands.get(entity)
+        if band is None:
+            return None
+        state = self.get_state(entity)
+        bakedState = band.states[entity]
+        if state[0] != bakedState[0]:
+            self.remove(entity)
+            return None
+        if state[1] != bakedState[1]:
+            band.states[entity] = state
+            band.isDirty = True
+        return band
+
+    def get_drawable_bands(self, entities:list, mainCharacterIndex:int) -> tuple[list[StaticBand|None], dict[StaticBand, int]]:
+        """Retorna la banda de cada entidad y las bandas que se pueden dibujar de una vez, que son las que tienen sus entidades seguidas en la lista y no tienen al personaje principal entre ellas.
+
+        Args:
+            entities (list[Entity]): Las entidades a dibujar, en orden de dibujo.
+
+            mainCharacterIndex (int): La posicion en la lista de la entidad antes de la cual se dibuja el personaje principal.
+
+        Returns:
+            tuple[list[StaticBand|None], dict[StaticBand, int]]: La banda (o None) de cada entidad, y por cada banda que se puede dibujar de una vez, la posicion de su primera entidad en la lista.
+        """
+
+        entityBands = [self.check(entity) for entity in entities]
+        runs = {} # Primera y ultima posicion y cantidad de entidades de cada banda
+        for index, band in enumerate(entityBands):
+            if band is not None:
+                run = runs.setdefault(band, [index, index, 0])
+                run[1] = index
+                run[2] += 1
+        drawableBands = {}
+        for band, (first, last, count) in runs.items():
+            if last - first + 1 == count and not first < mainCharacterIndex <= last:
+                drawableBands[band] = first
+        return entityBands, drawableBands
+
+    def clear(self) -> None:
+        self.bands.clear()
+        self.entityBands.clear()
@@ -0,0 +1,162 @@
+import pygame
+
+# Resolucion continua de colisiones con cajas barridas (swept AABB): en lugar de mover la entidad a su nueva posicion y despues empujarla
+# fuera de lo que toca, se calcula en que momento del movimiento (tiempo de impacto, entre 0 y 1) su hitbox toca la primera hitbox en su camino
+# y se detiene ahi en el eje del choque, deslizandose en el otro eje. Asi una entidad rapida (o el juego a pocos fotogramas por segundo)
+# no atraviesa las hitboxes delgadas, como los limites del nivel. Si al empezar el movimiento la hitbox ya estaba metida en otra (por ejemplo
+# porque aparecio encima o la movio otra parte del codigo) no hay tiempo de impacto, y se saca por el lado en que esta menos metida.
+# Si sacarla de una hitbox la mete en otra (por ejemplo entre una silla y un limite del nivel) se repite, y si no cabe se deja donde empezo.
+
+IMPACT_TOLERANCE = 1e-9 # Los impactos al final del movimiento (tiempo casi 1) no cuentan, la hitbox ya quedo justo en el borde
+PUSH_OUT_LIMIT = 4 # Las veces que se empuja la entidad fuera de las hitboxes en las que esta metida, si sigue metida se deja donde empezo su movimiento
+PIXEL_TOLERANCE = 1 # Las hitboxes se guardan en pixeles enteros, por lo que al empezar el movimiento una hitbox que solo tocaba otra puede parecer metida hasta un pixel en ella
+
+def get_displacement(physics) -> tuple[float, float]:
+    """Retorna el desplazamiento (x, y) de la posicion desde la posicion anterior, (0, 0) si no tiene posicion anterior."""
+    if physics.previousPosition[0] is None:
+        return 0, 0
+    return physics.position[0] - physics.previousPosition[0], physics.position[1] - physics.previousPosition[1]
+
+def get_swept_hitbox(physics) -> pygame.Rect:
+    """Retorna el rectangulo que recorre la hitbox desde la posicion anterior hasta la actual."""
+    displacement = get_displacement(physics)
+    return physics.hitbox.union(physics.hitbox.move(-displacement[0], -displacement[1]))
+
+def get_axis_times(start:float, size:int, displacement:float, targetStart:int, targetEnd:int) -> tuple[float, float]:
+    """Retorna en que momento del desplazamiento (en fracciones del desplazamiento) el segmento empieza y termina de superponerse en un eje con el segmento objetivo."""
+    if displacement > 0:
+        return (targetStart - (start + size)) / displacement, (targetEnd - start) / displacement
+    elif displacement < 0:
+        return (targetEnd - start) / displacement, (targetStart - (start + size)) / displacement
+    elif start + size <= targetStart or start >= targetEnd:
+        return float('inf'), float('-inf')
+    return float('-inf'), float('inf')
+
+def get_time_of_impact(start:tuple[float, float], size:tuple[int, int], displacement:tuple[float, float], target:pygame.Rect) -> tuple[float, int]|None:
+    """Retorna el tiempo de impacto de un rectangulo que se mueve contra un rectangulo quieto.
+
+    Args:
+        start (tuple[float, float]): La posicion (izquierda, arriba) del rectangulo al empezar el movimiento.
+
+        size (tuple[int, int]): El tamaño del rectangulo.
+
+        displacement (tuple[float, float]): El desplazamiento (x, y) del rectangulo.
+
+        target (pygame.Rect): El rectangulo quieto.
+
+    Returns:
+        tuple[float, int]|None: El tiempo de impacto entre 0 y 1 y el eje del choque (0 para x, 1 para y), o None si no chocan durante el movimiento o ya se superponian al empezar (por mas de PIXEL_TOLERANCE).
+    """
+
+    xEntry, xExit = get_axis_times(start[0], size[0], displacement[0], target.left, target.right)
+    yEntry, yExit = get_axis_times(start[1], size[1], displacement[1], target.top, target.bottom)
+    entry = max(xEntry, yEntry)
+    axis = 0 if xEntry > yEntry else 1
+    if entry >= min(xExit, yExit) or entry >= 1 - IMPACT_TOLERANCE:
+        return None
+    if entry < 0:
+        if entry == float('-inf') or -entry * abs(displacement[axis]) > PIXEL_TOLERANCE:
+            return None
+        entry = 0
+    return entry, axis
+
+def get_push_out(hitbox:pygame.Rect, target:pygame.Rect) -> tuple[int, int]|None:
+    """Retorna como sacar un rectangulo de otro en el que esta metido moviendolo lo menos posible (traslacion minima), en un solo eje.
+
+    Args:
+        hitbox (pygame.Rect): El rectangulo a sacar.
+
+        target (pygame.Rect): El rectangulo quieto.
+
+    Returns:
+        tuple[int, int]|None: El eje (0 para x, 1 para y) y la posicion (izquierda o arriba) que debe tener el rectangulo en ese eje, o None si no se superponen.
+    """
+
+    if not hitbox.colliderect(target):
+        return None
+    edges = [(target.left - hitbox.width, 0), (target.right, 0), (target.top - hitbox.height, 1), (target.bottom, 1)]
+    edge, axis = min(edges, key=lambda edge: abs(edge[0] - hitbox[edge[1]]))
+    return axis, edge
+
+def sweep_and_limit(listeningEntity, entitiesList:list, changeColor:bool=True) -> None:
+    """Mueve la entidad desde su posicion anterior hasta su posicion actual deteniendola en cada eje en la primera hitbox colisionable de su camino, en lugar de empujarla despues de atravesarla. Las hitboxes colisionables en las que quedaria metida (porque ya lo estaba al empezar) la empujan fuera (ver get_push_out), y si no se puede sacar de todas se deja en su posicion anterior. Llama a listen_collide de ambas entidades con las entidades con las que choca en el camino y con las que su hitbox se superpone al final (aunque no sean colisionables).
+
+    Args:
+        listeningEntity (Entity): La entidad que se mueve.
+
+        entitiesList (list[Entity]): Las entidades con las que puede chocar, como las que retorna LevelWorksSpace.get_collision_candidates.
+
+        changeColor (bool, optional): Si se cambian los colores de las hitboxes segun si chocaron, para los dibujos de depuracion. Defaults to True.
+    """
+
+    physics = listeningEntity.physics
+    displacement = get_displacement(physics)
+    hitbox = physics.hitbox
+    start = (hitbox.left - displacement[0], hitbox.top - displacement[1])
+    contacts = []
+
+    if physics.isCollidable:
+        obstacles = [entity for entity in entitiesList if entity.physics.isCollidable]
+        offset = [0, 0] # Lo que se debe mover la hitbox (y la posicion) para detenerla en los choques
+        edges = [None, None] # La posicion (izquierda, arriba) que debe tener la hitbox en cada eje donde choco
+        # Cada pasada detiene el movimiento en un eje, por lo que con dos pasadas la entidad se desliza por la primera hitbox y se detiene en la segunda
+        for _ in range(2):
+            firstImpact = None
+            movement = (displacement[0] + offset[0], displacement[1] + offset[1])
+            for entity in obstacles:
+                impact = get_time_of_impact(start, hitbox.size, movement, entity.physics.hitbox)
+                if impact is not None and (firstImpact is None or impact[0] < firstImpact[0]):
+                    firstImpact = impact[0], impact[1], entity
+            if firstImpact is None:
+                break
+            axis, entity = firstImpact[1], firstImpact[2]
+            # La hitbox queda justo en el borde de la hitbox con la que choca
+            if movement[axis] > 0:
+                edges[axis] = entity.physics.hitbox[axis] - hitbox.size[axis]
+            else:
+                edges[axis] = entity.physics.hitbox[axis] + entity.physics.hitbox.size[axis]
+            offset[axis] = edges[axis] - hitbox[axis]
+            contacts.append(entity)
+
+        # Las hitboxes en las que ya estaba metida al empezar no tienen tiempo de impacto, la entidad se saca de ellas hasta que no toque ninguna
+        isInside = False
+        for _ in range(PUSH_OUT_LIMIT):
+            isInside = False
+            for entity in obstacles:
+                pushOut = get_push_out(hitbox.move(offset), entity.physics.hitbox)
+                if pushOut is not None:
+                    isInside = True
+                    axis, edges[axis] = pushOut
+                    offset[axis] = edges[axis] - hitbox[axis]
+                    if entity not in contacts:
+                        contacts.append(entity)
+            if not isInside:
+                break
+        if isInside and any(hitbox.move(offset).colliderect(entity.physics.hitbox) for entity in obstacles):
+            # No cabe entre las hitboxes que la rodean, se deja donde empezo en lugar de dentro de una de ellas
+            offset = [0, 0]
+            if physics.previousPosition[0] is not None:
+                physics.position = list(physics.previousPosition)
+                physics.update_hitbox(pygame.Rect(listeningEntity.get_texture_position(), listeningEntity.animation.get_texture().get_size()))
+
+        # La hitbox se calcula desde la posicion de la textura redondeando, por lo que moverla puede dejarla a un pixel del borde, se corrige hasta dos veces
+        for _ in range(3):
+            if offset == [0, 0]:
+                break
+            physics.position = [physics.position[0] + offset[0], physics.position[1] + offset[1]]
+            physics.update_hitbox(pygame.Rect(listeningEntity.get_texture_position(), listeningEntity.animation.get_texture().get_size()))
+            offset = [edges[axis] - physics.hitbox[axis] if edges[axis] is not None else 0 for axis in range(2)]
+
+    collided = False
+    for entity in entitiesList:
+        if entity in contacts or physics.hitbox.colliderect(entity.physics.hitbox):
+            collided = True
+            if changeColor:
+                entity.physics.hitboxColor = (255,100,0)
+            listeningEntity.listen_collide(entity)
+            entity.listen_collide(listeningEntity)
+        elif changeColor:
+            entity.physics.hitboxColor = (0,200,255)
+
+    if changeColor:
+        listeningEntity.physics.hitboxColor = (255,0,100) if collided else (255,200,0)
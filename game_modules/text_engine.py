@@ -0,0 +1,260 @@
+import pygame, weakref
+from collections import OrderedDict
+
+# Motor de texto usado por create_text_texture y TextIconAnimation (en /game_modules/utilities.py)
+# Los textos estaticos se renderizan linea por linea en una sola imagen del tamaño final y se guardan en un cache LRU (textCache),
+# y los textos que crecen al final (por ejemplo al escribir un caracter por fotograma) se dibujan con TextLayout,
+# que solo dibuja los nuevos caracteres con las imagenes de cada caracter guardadas por fuente y color (glifos).
+# Las fuentes del sistema se cargan una sola vez con fontRegistry.
+
+glyphCaches = weakref.WeakKeyDictionary() # Por cada fuente, las imagenes de los caracteres por color
+
+class FontRegistry:
+    """Sus instancias guardan las fuentes del sistema ya cargadas, ya que pygame.font.SysFont busca la fuente en las carpetas del sistema cada vez que se llama."""
+
+    def __init__(self) -> None:
+        self.fonts = {} # Fuentes por (nombre, tamaño, negrita, cursiva)
+
+    def get_font(self, name:str|list[str]|None, size:int, bold:bool=False, italic:bool=False) -> pygame.font.Font:
+        """Retorna la fuente del sistema, cargandola con pygame.font.SysFont solo la primera vez que se pide.
+
+        Args:
+            name (str | list[str] | None): El nombre de la fuente, o una lista de nombres en orden de preferencia. Si es None se usa la fuente por defecto de pygame.
+
+            size (int): El tamaño de la fuente.
+
+            bold (bool, optional): Si la fuente es negrita. Defaults to False.
+
+            italic (bool, optional): Si la fuente es cursiva. Defaults to False.
+
+        Returns:
+            pygame.font.Font: La fuente, es compartida por lo que no se deben cambiar sus estilos.
+        """
+
+        key = (tuple(name) if isinstance(name, list) else name, size, bool(bold), bool(italic))
+        if key not in self.fonts:
+            self.fonts[key] = pygame.font.SysFont(name, size, bold, italic)
+        return self.fonts[key]
+
+    def prewarm(self, fonts:list[tuple]) -> None:
+        """Carga las fuentes antes de usarlas, por ejemplo al iniciar el juego, para que crear un menu no tenga que buscarlas.
+
+        Args:
+            fonts (list[tuple]): Los argumentos de get_font de cada fuente, como ('Arial', 30) o ('Arial', 30, True).
+        """
+
+        for font in fonts:
+            self.get_font(*font)
+
+    def clear(self) -> None:
+        self.fonts.clear()
+
+fontRegistry = FontRegistry()
+
+def get_padding(padding:list[int]) -> tuple[int, int, int, int]:
+    """Retorna el espacio entre el texto y cada borde.
+
+    Args:
+        padding (list[int]): Un solo valor se aplica a los cuatro bordes. Con dos valores, el primero se aplica a la derecha e izquierda y el segundo arriba y abajo. Con cuatro valores se aplican en orden a la izquierda, arriba, derecha y abajo.
+
+    Returns:
+        tuple[int, int, int, int]: El espacio a la izquierda, arriba, a la derecha y abajo.
+    """
+
+    if len(padding) == 1:
+        return padding[0], padding[0], padding[0], padding[0]
+    elif len(padding) == 2:
+        return padding[0], padding[1], padding[0], padding[1]
+    else:
+        return padding[0], padding[1], padding[2], padding[3]
+
+def get_glyph(font:pygame.font.Font, textColor:tuple[int, int, int, int], character:str) -> pygame.Surface:
+    """Retorna la imagen del caracter renderizado con la fuente y el color, renderizandola solo la primera vez que se pide.
+
+    Args:
+        font (pygame.font.Font): La fuente del caracter.
+
+        textColor (tuple[int, int, int, int]): El color del caracter.
+
+        character (str): El caracter.
+
+    Returns:
+        pygame.Surface: La imagen del caracter, no debe modificarse.
+    """
+
+    glyphs = glyphCaches.setdefault(font, {}).setdefault(tuple(textColor), {})
+    if character not in glyphs:
+        glyphs[character] = font.render(character, True, textColor)
+    return glyphs[character]
+
+def render_text(text:str, textColor:tuple[int, int, int, int], font:pygame.font.Font, padding:list[int]=[0]) -> pygame.Surface:
+    """Retorna la imagen del texto con saltos de linea y con el espacio entre los bordes especificado por padding. Las lineas se renderizan por separado y se dibujan una sola vez en la imagen del tamaño final.
+
+    Args:
+        text (str): El texto a renderizar.
+
+        textColor (tuple[int, int, int, int]): El color del texto.
+
+        font (pygame.font.Font): La fuente con la cual se renderiza el texto.
+
+        padding (list[int], optional): El espacio entre el texto y los bordes, ver get_padding. Defaults to [0].
+
+    Returns:
+        pygame.Surface: La imagen del texto.
+    """
+
+    left, top, right, bottom = get_padding(padding)
+    renderedTextLines = [font.render(line, True, textColor) for line in text.split('\n')]
+    finalWidth = max(left + max(line.get_width() for line in renderedTextLines) + right, 1)
+    finalHeight = max(top + sum(line.get_height() for line in renderedTextLines) + bottom, 1)
+
+    finalImage = pygame.Surface((finalWidth, finalHeight), pygame.SRCALPHA)
+    y = top
+    for line in renderedTextLines:
+        # Con BLEND_RGBA_MAX sobre la imagen transparente se copian los pixeles sin mezclar el alpha
+        finalImage.blit(line, (left, y), special_flags=pygame.BLEND_RGBA_MAX)
+        y += line.get_height()
+    return finalImage
+
+class TextCache:
+    """Sus instancias guardan las imagenes de los textos estaticos ya renderizados, eliminando las usadas hace mas tiempo (LRU) cuando se supera la cantidad maxima."""
+
+    def __init__(self, maxSize:int=128) -> None:
+        """Crea el cache vacio.
+
+        Args:
+            maxSize (int, optional): La cantidad maxima de textos guardados. Defaults to 128.
+        """
+
+        self.maxSize = maxSize
+        self.renderedTexts = OrderedDict()
+
+    def render(self, text:str, textColor:tuple[int, int, int, int], font:pygame.font.Font, padding:list[int]=[0]) -> pygame.Surface:
+        """Retorna la imagen del texto (ver render_text), renderizandola solo si no esta guardada.
+
+        Args:
+            text (str): El texto a renderizar.
+
+            textColor (tuple[int, int, int, int]): El color del texto.
+
+            font (pygame.font.Font): La fuente con la cual se renderiza el texto.
+
+            padding (list[int], optional): El espacio entre el texto y los bordes, ver get_padding. Defaults to [0].
+
+        Returns:
+            pygame.Surface: La imagen del texto, es compartida por lo que no debe modificarse.
+        """
+
+        key = (text, font, tuple(textColor), tuple(padding))
+        if key in self.renderedTexts:
+            self.renderedTexts.move_to_end(key)
+        else:
+            self.renderedTexts[key] = render_text(text, textColor, font, padding)
+            if len(self.renderedTexts) > self.maxSize:
+                self.renderedTexts.popitem(last=False)
+        return self.renderedTexts[key]
+
+    def clear(self) -> None:
+        self.renderedTexts.clear()
+
+textCache = TextCache()
+
+class TextLayout:
+    """Sus instancias dibujan un texto caracter por caracter en una imagen con espacio de sobra, de forma que al agregar texto al final solo se dibujan los nuevos caracteres y la imagen solo se vuelve a crear cuando el texto ya no cabe."""
+
+    def __init__(self, font:pygame.font.Font, textColor:tuple[int, int, int, int], padding:list[int]=[0]) -> None:
+        """Crea el diseño sin texto.
+
+        Args:
+            font (pygame.font.Font): La fuente con la cual se dibuja el texto.
+
+            textColor (tuple[int, int, int, int]): El color del texto.
+
+            padding (list[int], optional): El espacio entre el texto y los bordes, ver get_padding. Defaults to [0].
+        """
+
+        self.font = font
+        self.textColor = textColor
+        self.padding = get_padding(padding)
+        self.lineHeight = font.get_height()
+        self.buffer = None
+        self.text = ''
+        self.lines = ['']
+        self.width = 0
+
+    def get_size(self) -> tuple[int, int]:
+        """Retorna el tamaño de la imagen del texto con el espacio entre los bordes."""
+        left, top, right, bottom = self.padding
+        return max(left + self.width + right, 1), max(top + len(self.lines) * self.lineHeight + bottom, 1)
+
+    def reserve(self, size:tuple[int, int]) -> None:
+        """Si la imagen reservada es mas pequeña que el tamaño, crea una nueva imagen con al menos el doble de tamaño y copia el texto ya dibujado.
+
+        Args:
+            size (tuple[int, int]): El tamaño minimo de la imagen.
+        """
+
+        if self.buffer is not None and self.buffer.get_width() >= size[0] and self.buffer.get_height() >= size[1]:
+            return
+        if self.buffer is not None:
+            size = (max(size[0], self.buffer.get_width() * 2), max(size[1], self.buffer.get_height() * 2))
+        buffer = pygame.Surface(size, pygame.SRCALPHA)
+        if self.buffer is not None:
+            buffer.blit(self.buffer, (0, 0), special_flags=pygame.BLEND_RGBA_MAX)
+        self.buffer = buffer
+
+    def clear(self) -> None:
+        """Borra el texto, conservando la imagen reservada."""
+
+        self.text = ''
+        self.lines = ['']
+        self.width = 0
+        if self.buffer is not None:
+            self.buffer.fill((0, 0, 0, 0))
+
+    def append(self, text:str) -> None:
+        """Agrega el texto al final, dibujando solo sus caracteres. Cada caracter se ubica restando su ancho al ancho de la linea hasta ese caracter, para respetar el espaciado entre pares de caracteres de la fuente.
+
+        Args:
+            text (str): El texto a agregar.
+        """
+
+        lines = (self.lines[-1] + text).split('\n')
+        width = max([self.width] + [self.font.size(line)[0] for line in lines])
+        left, top, right, bottom = self.padding
+        self.reserve((left + width + right, top + (len(self.lines) + len(lines) - 1) * self.lineHeight + bottom))
+
+        for character in text:
+            if character == '\n':
+                self.lines.append('')
+                continue
+            line = self.lines[-1] + character
+            x = self.font.size(line)[0] - self.font.size(character)[0]
+            y = (len(self.lines) - 1) * self.lineHeight
+            self.buffer.blit(get_glyph(self.font, self.textColor, character), (left + x, top + y), special_flags=pygame.BLEND_RGBA_MAX)
+            self.lines[-1] = line
+
+        self.text += text
+        self.width = width
+
+    def set_text(self, text:str) -> None:
+        """Cambia el texto. Si el nuevo texto empieza con el texto actual solo se agregan los caracteres nuevos, si no se vuelve a dibujar todo el texto.
+
+        Args:
+            text (str): El nuevo texto.
+        """
+
+        if not text.startswith(self.text):
+            self.clear()
+        self.append(text[len(self.text):])
+
+    def get_surface(self) -> pygame.Surface:
+        """Retorna la imagen del texto, que es una parte (subsurface) de la imagen reservada, por lo que no debe modificarse.
+
+        Returns:
+            pygame.Surface: La imagen del texto con el espacio entre los bordes.
+        """
+
+        size = self.get_size()
+        self.reserve(size)
+        return self.buffer.subsurface((0, 0), size)
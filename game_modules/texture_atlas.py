@@ -0,0 +1,111 @@
+import pygame
+from game_modules.utilities import Texture
+
+# Atlas de texturas: junta los fotogramas de varias texturas en pocas imagenes grandes (paginas)
+# Cada fotograma pasa a ser una subsurface de su pagina y la textura guarda el rectangulo que ocupa,
+# para dibujarlo con blit usando la pagina y el argumento area (ver Texture.get_frame_area y Animation.get_texture_area).
+
+class TextureAtlas:
+    """Sus instancias empaquetan los fotogramas de las texturas en paginas usando el algoritmo de estantes (shelf packing): los fotogramas se ordenan de mayor a menor alto y se colocan de izquierda a derecha en filas (estantes), abriendo un nuevo estante cuando no caben a lo ancho y una nueva pagina cuando no caben a lo alto."""
+
+    def __init__(self, maxSize:tuple[int, int]=(2048, 2048)) -> None:
+        """Crea el atlas vacio.
+
+        Args:
+            maxSize (tuple[int, int], optional): El tamaño maximo (ancho, alto) de cada pagina. Los fotogramas mas grandes tienen su propia pagina. Defaults to (2048, 2048).
+        """
+
+        self.maxSize = maxSize
+        self.pages = []
+
+    def pack(self, textures:list[Texture]) -> None:
+        """Empaqueta todos los fotogramas de las texturas en nuevas paginas del atlas, y cambia los fotogramas de cada textura por subsurfaces de su pagina.
+
+        Args:
+            textures (list[Texture]): Las texturas a empaquetar.
+        """
+
+        # Se ignoran los fotogramas repetidos (la misma imagen en varias texturas) para guardarlos una sola vez
+        frames = {}
+        for texture in textures:
+            for index in range(texture.lenght):
+                frames.setdefault(id(texture.sprite[index]), (texture.sprite[index], []))[1].append((texture, index))
+
+        sortedFrames = sorted(frames.values(), key=lambda frame: (frame[0].get_height(), frame[0].get_width()), reverse=True)
+
+        placements = [] # (numero de pagina, posicion, fotograma, usos)
+        pagesSizes = []
+        shelfPage = None # La pagina donde se estan llenando los estantes
+        x, shelfTop, shelfHeight = 0, 0, 0
+        for frame, uses in sortedFrames:
+            width, height = frame.get_size()
+            if width > self.maxSize[0] or height > self.maxSize[1]:
+                # El fotograma no cabe en una pagina, tiene su propia pagina
+                pagesSizes.append([width, height])
+                placements.append((len(pagesSizes) - 1, (0, 0), frame, uses))
+                continue
+
+            if shelfPage is not None and x + width > self.maxSize[0]:
+                x, shelfTop, shelfHeight = 0, shelfTop + shelfHeight, 0
+            if shelfPage is None or shelfTop + height > self.maxSize[1]:
+                pagesSizes.append([0, 0])
+                shelfPage = len(pagesSizes) - 1
+                x, shelfTop, shelfHeight = 0, 0, 0
+
+            placements.append((shelfPage, (x, shelfTop), frame, uses))
+            x += width
+            shelfHeight = max(shelfHeight, height)
+            pagesSizes[shelfPage][0] = max(pagesSizes[shelfPage][0], x)
+            pagesSizes[shelfPage][1] = max(pagesSizes[shelfPage][1], shelfTop + shelfHeight)
+
+        isDisplayReady = pygame.display.get_surface() is not None
+        pages = []
+        for size in pagesSizes:
+            page = pygame.Surface(size, pygame.SRCALPHA)
+            if isDisplayReady:
+                page = page.convert_alpha()
+            page.fill((0, 0, 0, 0))
+            pages.append(page)
+
+        for pageIndex, position, frame, uses in placements:
+            page = pages[pageIndex]
+            # Con BLEND_RGBA_MAX sobre la pagina transparente se copian los pixeles sin mezclar el alpha
+            page.blit(frame, position, special_flags=pygame.BLEND_RGBA_MAX)
+            area = pygame.Rect(position, frame.get_size())
+            packedFrame = page.subsurface(area)
+            for texture, index in uses:
+                texture.sprite[index] = packedFrame
+                texture.atlasFrames[index] = (page, area)
+
+        self.pages += pages
+
+    def get_size(self) -> int:
+        """Retorna la cantidad de bytes que ocupan los pixeles de las paginas del atlas."""
+        return sum(page.get_width() * page.get_height() * page.get_bytesize() for page in self.pages)
+
+def create_texture_atlas(textureDictionaries:dict[str, Texture]|list[dict[str, Texture]], names:list[str]=None, maxSize:tuple[int, int]=(2048, 2048)) -> TextureAtlas:
+    """Crea un atlas con los fotogramas de las texturas de uno o varios resultados de create_textures. Si el diccionario crea las texturas al pedirlas (TextureDictionary), las texturas empaquetadas se crean en este momento.
+
+    Args:
+        textureDictionaries (dict[str, Texture] | list[dict[str, Texture]]): Los diccionarios de texturas a empaquetar.
+
+        names (list[str], optional): Si se especifica, solo se empaquetan las texturas con estos nombres. Defaults to None.
+
+        maxSize (tuple[int, int], optional): El tamaño maximo (ancho, alto) de cada pagina del atlas. Defaults to (2048, 2048).
+
+    Returns:
+        TextureAtlas: El atlas con las texturas empaquetadas.
+    """
+
+    if not isinstance(textureDictionaries, list):
+        textureDictionaries = [textureDictionaries]
+
+    textures = []
+    for textureDictionary in textureDictionaries:
+        for name in textureDictionary:
+            if names is None or name in names:
+                textures.append(textureDictionary[name])
+
+    atlas = TextureAtlas(maxSize)
+    atlas.pack(textures)
+    return atlas
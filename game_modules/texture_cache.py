@@ -0,0 +1,343 @@
+import pygame, os, json, hashlib, struct, mmap, threading
+
+# Cache en disco de las texturas ya transformadas por create_textures (en /game_modules/utilities.py)
+# Cada textura se guarda en un archivo cuyo nombre depende del hash del archivo de la imagen original y de los parametros de transformacion,
+# por lo que si la imagen cambia su hash cambia y las texturas guardadas anteriormente dejan de usarse y se eliminan.
+# Los fotogramas se guardan como bytes RGBA sin comprimir para cargarlos directamente con pygame.image.frombuffer.
+
+CACHE_VERSION = 1 # Se debe aumentar si cambia la forma de transformar las texturas para no usar las texturas guardadas con la version anterior
+EVICTION_RATIO = 0.9 # Al superar el tamaño maximo se eliminan texturas hasta esta fraccion del tamaño maximo, para no recorrer la carpeta en cada guardado siguiente
+
+def surface_from_buffer(buffer:bytes|memoryview, size:tuple[int, int]) -> pygame.Surface:
+    """Crea una imagen a partir de los bytes RGBA de sus pixeles con pygame.image.frombuffer. Si la ventana ya fue creada, convierte la imagen al formato de la pantalla para dibujarla mas rapido, por lo que con la ventana creada solo debe llamarse desde el hilo principal.
+
+    Args:
+        buffer (bytes|memoryview): Los bytes RGBA de los pixeles.
+
+        size (tuple[int, int]): El tamaño (ancho, alto) de la imagen.
+
+    Returns:
+        pygame.Surface: La imagen creada.
+    """
+
+    surface = pygame.image.frombuffer(buffer, size, 'RGBA')
+    if pygame.display.get_surface() is not None:
+        surface = surface.convert_alpha()
+    return surface
+
+class TextureCache:
+    """Sus instancias guardan y cargan de disco los fotogramas de las texturas transformadas, eliminando las menos usadas recientemente (LRU) cuando se supera el tamaño maximo."""
+
+    def __init__(self, path:str='.texture_cache/', maxSize:int=128 * 1024 * 1024, isEnabled:bool=True) -> None:
+        """Crea el cache en la carpeta indicada, la carpeta se crea al guardar la primera textura.
+
+        Args:
+            path (str, optional): La ruta de la carpeta donde se guardan las texturas. Defaults to '.texture_cache/'.
+
+            maxSize (int, optional): El tamaño maximo en bytes que pueden ocupar las texturas guardadas. Defaults to 128 MB.
+
+            isEnabled (bool, optional): De ser False no se carga ni se guarda ninguna textura. Defaults to True.
+        """
+
+        self.path = path
+        self.maxSize = maxSize
+        self.isEnabled = isEnabled
+        self.fileHashes = {} # Hashes de las imagenes ya calculados en esta ejecucion
+        self.packs = [] # Paquetes de texturas horneadas (TexturePack) donde se buscan las texturas antes que en la carpeta
+        self.totalSize = None # Tamaño total de las texturas guardadas, se calcula al guardar la primera textura y se actualiza en cada guardado, None si no se conoce
+        self.sizeLock = threading.RLock() # Las texturas se guardan desde los hilos de AssetLoader, el tamaño total y la eliminacion de texturas se protegen con este candado
+
+    def get_file_hash(self, filePath:str) -> str:
+        """Retorna el hash del contenido del archivo. Si el hash es distinto al registrado la ultima vez, elimina las texturas guardadas de la version anterior del archivo.
+
+        Args:
+            filePath (str): La ruta del archivo de la imagen.
+
+        Returns:
+            str: El hash sha1 del contenido del archivo.
+        """
+
+        if filePath not in self.fileHashes:
+            with open(filePath, 'rb') as file:
+                self.fileHashes[filePath] = hashlib.sha1(file.read()).hexdigest()
+            if self.isEnabled:
+                self.invalidate_source(filePath, self.fileHashes[filePath])
+        return self.fileHashes[filePath]
+
+    def get_key(self, fileHash:str, parameters:tuple) -> str:
+        """Retorna la llave de la textura, formada por el hash de la imagen original y el hash de los parametros de transformacion.
+
+        Args:
+            fileHash (str): El hash de la imagen original.
+
+            parameters (tuple): Los parametros de transformacion, deben poder representarse con repr de forma estable.
+
+        Returns:
+            str: La llave de la textura, usada como nombre del archivo.
+        """
+
+        parametersHash = hashlib.sha1(repr((CACHE_VERSION, parameters)).encode()).hexdigest()
+        return f'{fileHash[:20]}_{parametersHash[:20]}'
+
+    def get_entry_path(self, key:str) -> str:
+        return os.path.join(self.path, key + '.rgba')
+
+    def load_buffers(self, key:str) -> tuple[str, list[tuple[tuple[int, int], memoryview]]]|None:
+        """Carga los bytes RGBA de los fotogramas guardados con la llave, si existen. No crea imagenes, por lo que puede usarse fuera del hilo principal.
+
+        Args:
+            key (str): La llave de la textura.
+
+        Returns:
+            tuple[str, list[tuple[tuple[int, int], memoryview]]]|None: El nombre de la textura y el tamaño y los bytes de cada fotograma, o None si no esta guardada.
+        """
+
+        for pack in self.packs:
+            if key in pack.index:
+                return pack.load_buffers(key)
+
+        if not self.isEnabled:
+            return None
+        entryPath = self.get_entry_path(key)
+        try:
+            with open(entryPath, 'rb') as file:
+                data = file.read()
+            os.utime(entryPath) # Se actualiza la fecha de modificacion para marcar la textura como usada recientemente
+        except OSError:
+            return None
+
+        headerSize = struct.unpack_from('<I', data)[0]
+        header = json.loads(data[4:4 + headerSize])
+        pixels = memoryview(data)
+        offset = 4 + headerSize
+        buffers = []
+        for width, height in header['sizes']:
+            buffers.append(((width, height), pixels[offset:offset + width * height * 4]))
+            offset += width * height * 4
+        return header['name'], buffers
+
+    def add_pack(self, pack:'TexturePack') -> None:
+        """Agrega un paquete de texturas horneadas, donde se buscaran las texturas antes que en la carpeta del cache."""
+        self.packs.append(pack)
+
+    def add_pack_file(self, path:str) -> bool:
+        """Si el archivo existe y no se ha agregado, abre el paquete de texturas y lo agrega.
+
+        Args:
+            path (str): La ruta del archivo del paquete.
+
+        Returns:
+            bool: True si el paquete esta agregado.
+        """
+
+        for pack in self.packs:
+            if os.path.normpath(pack.path) == os.path.normpath(path):
+                return True
+        if not os.path.exists(path):
+            return False
+        self.add_pack(TexturePack(path))
+        return True
+
+    def contains(self, key:str) -> bool:
+        """Retorna True si la textura con la llave esta en algun paquete o guardada en la carpeta del cache."""
+        for pack in self.packs:
+            if key in pack.index:
+                return True
+        return self.isEnabled and os.path.exists(self.get_entry_path(key))
+
+    def load(self, key:str) -> tuple[str, list[pygame.Surface]]|None:
+        """Carga los fotogramas guardados con la llave, si existen.
+
+        Args:
+            key (str): La llave de la textura.
+
+        Returns:
+            tuple[str, list[pygame.Surface]]|None: El nombre de la textura y sus fotogramas, o None si no esta guardada.
+        """
+
+        cachedBuffers = self.load_buffers(key)
+        if cachedBuffers is None:
+            return None
+        return cachedBuffers[0], [surface_from_buffer(buffer, size) for size, buffer in cachedBuffers[1]]
+
+    def save(self, key:str, name:str, frames:list[pygame.Surface]) -> None:
+        """Guarda los fotogramas con la llave y elimina las texturas menos usadas si se supera el tamaño maximo. Si no se puede escribir en disco la textura simplemente no se guarda. Se puede llamar desde varios hilos a la vez.
+
+        Args:
+            key (str): La llave de la textura.
+
+            name (str): El nombre de la textura.
+
+            frames (list[pygame.Surface]): Los fotogramas de la textura.
+        """
+
+        if not self.isEnabled:
+            return
+        header = json.dumps({'name': name, 'sizes': [frame.get_size() for frame in frames]}).encode()
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            entryPath = self.get_entry_path(key)
+            # Cada hilo escribe en su propio archivo temporal, el archivo de la textura se reemplaza con el candado tomado
+            temporaryPath = f'{entryPath}.{threading.get_ident()}.tmp'
+            with open(temporaryPath, 'wb') as file:
+                file.write(struct.pack('<I', len(header)))
+                file.write(header)
+                for frame in frames:
+                    file.write(pygame.image.tobytes(frame, 'RGBA'))
+                size = file.tell()
+            with self.sizeLock:
+                if self.totalSize is None:
+                    self.totalSize = sum(entry.stat().st_size for entry in self.get_entries())
+                if os.path.exists(entryPath):
+                    self.totalSize -= os.path.getsize(entryPath)
+                os.replace(temporaryPath, entryPath)
+                self.totalSize += size
+                # Solo se recorre la carpeta cuando se supera el tamaño maximo, no en cada guardado
+                if self.totalSize > self.maxSize:
+                    self.evict(int(self.maxSize * EVICTION_RATIO))
+        except OSError:
+            with self.sizeLock:
+                self.totalSize = None
+
+    def get_entries(self) -> list[os.DirEntry]:
+        try:
+            return [entry for entry in os.scandir(self.path) if entry.name.endswith('.rgba')]
+        except OSError:
+            return []
+
+    def evict(self, targetSize:int=None) -> None:
+        """Elimina las texturas usadas hace mas tiempo hasta que el tamaño total sea menor o igual a targetSize.
+
+        Args:
+            targetSize (int, optional): El tamaño total al que se debe llegar. Si no se especifica es maxSize. Defaults to None.
+        """
+
+        if targetSize is None:
+            targetSize = self.maxSize
+        with self.sizeLock:
+            entries = sorted(self.get_entries(), key=lambda entry: entry.stat().st_mtime)
+            totalSize = sum(entry.stat().st_size for entry in entries)
+            for entry in entries:
+                if totalSize <= targetSize:
+                    break
+                try:
+                    os.remove(entry.path)
+                    totalSize -= entry.stat().st_size
+                except OSError:
+                    pass
+            self.totalSize = totalSize
+
+    def invalidate_source(self, filePath:str, fileHash:str) -> None:
+        """Si la imagen cambio desde la ultima vez que se registro, elimina las texturas guardadas a partir de su version anterior.
+
+        Args:
+            filePath (str): La ruta del archivo de la imagen.
+
+            fileHash (str): El hash actual del contenido del archivo.
+        """
+
+        indexPath = os.path.join(self.path, 'index.json')
+        try:
+            with open(indexPath) as file:
+                index = json.load(file)
+        except (OSError, ValueError):
+            index = {}
+
+        sourceKey = os.path.normpath(filePath)
+        previousHash = index.get(sourceKey)
+        if previousHash == fileHash:
+            return
+
+        if previousHash is not None:
+            with self.sizeLock:
+                for entry in self.get_entries():
+                    if entry.name.startswith(previousHash[:20] + '_'):
+                        try:
+                            os.remove(entry.path)
+                        except OSError:
+                            pass
+                self.totalSize = None
+
+        index[sourceKey] = fileHash
+        try:
+            os.makedirs(self.path, exist_ok=True)
+            with open(indexPath, 'w') as file:
+                json.dump(index, file)
+        except OSError:
+            pass
+
+    def clear(self) -> None:
+        """Elimina todas las texturas guardadas."""
+
+        with self.sizeLock:
+            for entry in self.get_entries():
+                try:
+                    os.remove(entry.path)
+                except OSError:
+                    pass
+            self.totalSize = None
+
+# Los paquetes de texturas (.pack) son creados por /game_modules/asset_baker.py y contienen texturas ya transformadas
+# Formato: b'MTPK', version (uint32), tamaño del indice (uint32), indice en JSON y los bytes RGBA de los fotogramas
+# El indice relaciona cada llave del cache con el nombre de la textura y el tamaño y la posicion de los bytes de cada fotograma, contada desde el final del indice
+
+PACK_MAGIC = b'MTPK'
+PACK_VERSION = 1
+
+class TexturePack:
+    """Sus instancias leen un paquete de texturas horneadas mapeando el archivo en memoria (mmap), por lo que los fotogramas se crean directamente desde el archivo sin decodificar ni transformar imagenes."""
+
+    def __init__(self, path:str) -> None:
+        """Abre y mapea en memoria el paquete, y lee su indice.
+
+        Args:
+            path (str): La ruta del archivo del paquete.
+        """
+
+        self.path = path
+        with open(path, 'rb') as file:
+            self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, indexSize = struct.unpack_from('<4sII', self.map)
+        if magic != PACK_MAGIC or version != PACK_VERSION:
+            raise ValueError(f'{path} no es un paquete de texturas valido')
+        self.index = json.loads(self.map[12:12 + indexSize])
+        self.pixels = memoryview(self.map)[12 + indexSize:]
+
+    def load_buffers(self, key:str) -> tuple[str, list[tuple[tuple[int, int], memoryview]]]:
+        """Retorna el nombre de la textura y el tamaño y los bytes de cada fotograma, como vistas del archivo mapeado en memoria.
+
+        Args:
+            key (str): La llave de la textura.
+
+        Returns:
+            tuple[str, list[tuple[tuple[int, int], memoryview]]]: El nombre de la textura y los fotogramas.
+        """
+
+        entry = self.index[key]
+        return entry['name'], [((width, height), self.pixels[offset:offset + width * height * 4]) for width, height, offset in entry['frames']]
+
+    @staticmethod
+    def write(path:str, textures:dict[str, tuple[str, list[pygame.Surface]]]) -> None:
+        """Escribe un paquete de texturas.
+
+        Args:
+            path (str): La ruta del archivo del paquete.
+
+            textures (dict[str, tuple[str, list[pygame.Surface]]]): Por cada llave del cache, el nombre de la textura y sus fotogramas.
+        """
+
+        index = {}
+        offset = 0
+        for key, (name, frames) in textures.items():
+            index[key] = {'name': name, 'frames': []}
+            for frame in frames:
+                index[key]['frames'].append([frame.get_width(), frame.get_height(), offset])
+                offset += frame.get_width() * frame.get_height() * 4
+        encodedIndex = json.dumps(index).encode()
+
+        with open(path, 'wb') as file:
+            file.write(struct.pack('<4sII', PACK_MAGIC, PACK_VERSION, len(encodedIndex)))
+            file.write(encodedIndex)
+            for name, frames in textures.values():
+                for frame in frames:
+                    file.write(pygame.image.tobytes(frame, 'RGBA'))
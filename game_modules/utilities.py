@@ -1,6 +1,15 @@
-import pygame, types
+import pygame, types, threading
+from collections.abc import MutableMapping
 from math import floor
 from enum import Enum
+from game_modules.texture_cache import TextureCache
+from game_modules.text_engine import TextLayout, textCache
+
+# NumPy es opcional, si esta instalado se usa para procesar las imagenes como arreglos en vez de pixel por pixel
+try:
+    import numpy
+except ImportError:
+    numpy = None
 
 # En la definicion de las funciones se utilizo type hint que permite informar cual es el tipo de los parametros y del retorno de la funcion
 # Por lo que recomiendo usar una version de Python superior a 3.5
@@ -38,6 +47,24 @@ class Location(Enum):
     CENTER = 8
     CUSTOM = 9
 
+# Punto de cada posicion relativa dentro de un rectangulo, como fraccion (x, y) de su ancho y alto. Las posiciones relativas que no estan no tienen punto fijo, como CUSTOM
+LOCATION_ANCHORS = {
+    Location.LEFT_TOP: (0, 0),
+    Location.CENTER_TOP: (0.5, 0),
+    Location.RIGHT_TOP: (1, 0),
+    Location.CENTER_RIGHT: (1, 0.5),
+    Location.RIGHT_BOTTOM: (1, 1),
+    Location.CENTER_BOTTOM: (0.5, 1),
+    Location.LEFT_BOTTOM: (0, 1),
+    Location.CENTER_LEFT: (0, 0.5),
+    Location.CENTER: (0.5, 0.5),
+}
+
+def get_anchor_offset(location:Location, size:tuple[int, int]) -> tuple[float, float]:
+    """Retorna el desplazamiento (x, y) desde el punto de la posicion relativa hasta la esquina superior izquierda de un rectangulo del tamaño dado, (0, 0) si la posicion relativa no tiene punto fijo."""
+    anchor = LOCATION_ANCHORS.get(location, (0, 0))
+    return -(size[0] * anchor[0]), -(size[1] * anchor[1])
+
 class AnimationDirection(Enum):
     """Usado en la clase Animation para definir el comportamiento de repeticion de una animacion (como en CSS y HTML)."""
     NORMAL = 0
@@ -80,9 +107,36 @@ class Texture:
                 self.size = self.sprite[0].get_rect().size
             else:
                 self.size = size
+        self.atlasFrames = [None] * self.lenght # Si la textura esta en un atlas (ver /game_modules/texture_atlas.py), guarda por cada fotograma la imagen del atlas y el rectangulo que ocupa
 
-def find_content(surface:pygame.Surface) -> pygame.Rect:
-    """Retorna un rectangulo que abarca la region que no es transparente en la imagen.
+    def get_frame_area(self, index:int) -> tuple[pygame.Surface, pygame.Rect|None]:
+        """Retorna la imagen y el area a usar como argumentos de blit para dibujar el fotograma. Si el fotograma esta en un atlas retorna la imagen del atlas y su rectangulo, si no retorna el fotograma y None.
+
+        Args:
+            index (int): El numero del fotograma.
+
+        Returns:
+            tuple[pygame.Surface, pygame.Rect|None]: La imagen y el area del fotograma.
+        """
+
+        if self.atlasFrames[index] is not None:
+            return self.atlasFrames[index]
+        return self.sprite[index], None
+
+    def replace_frame(self, index:int, frame:pygame.Surface) -> None:
+        """Reemplaza la imagen del fotograma, dejando de usar el atlas para ese fotograma.
+
+        Args:
+            index (int): El numero del fotograma.
+
+            frame (pygame.Surface): La nueva imagen del fotograma.
+        """
+
+        self.sprite[index] = frame
+        self.atlasFrames[index] = None
+
+def find_content_by_pixels(surface:pygame.Surface) -> pygame.Rect:
+    """Retorna un rectangulo que abarca la region que no es transparente en la imagen, recorriendo la imagen pixel por pixel. Se usa cuando NumPy no esta instalado.
 
 
     Args:
@@ -111,6 +165,82 @@ def find_content(surface:pygame.Surface) -> pygame.Rect:
                     maxY = y
     return pygame.Rect(minX, minY, maxX - minX, maxY - minY)
 
+def get_alpha_array(surface:pygame.Surface):
+    """Retorna los valores alpha de la imagen como un arreglo de NumPy de forma (ancho, alto). Si la imagen tiene transparencia por pixel de 32 bits se usa una vista directa (pygame.surfarray.pixels_alpha) que bloquea la imagen mientras exista, si no se usa una copia.
+
+
+    Args:
+        surface (pygame.Surface): La imagen de la que se obtienen los valores alpha.
+
+
+    Returns:
+        numpy.ndarray: Arreglo con los valores alpha de cada pixel.
+
+    """
+    if surface.get_bitsize() == 32 and surface.get_flags() & pygame.SRCALPHA:
+        return pygame.surfarray.pixels_alpha(surface)
+    return pygame.surfarray.array_alpha(surface)
+
+def find_contents(surfaces:list[pygame.Surface]) -> list[pygame.Rect]:
+    """Retorna los rectangulos que abarcan la region que no es transparente de cada imagen. Con NumPy las imagenes del mismo tamaño (como los fotogramas de un sprite) se agrupan en un solo arreglo y se buscan sus regiones en una sola pasada con reducciones de arreglos, sin NumPy se recorre cada imagen pixel por pixel.
+
+
+    Args:
+        surfaces (list[pygame.Surface]): Las imagenes donde se buscara la region que no es transparente.
+
+
+    Returns:
+        list[pygame.Rect]: Los rectangulos que abarcan la region que no es transparente, en el mismo orden de surfaces.
+
+    """
+    if numpy is None:
+        return [find_content_by_pixels(surface) for surface in surfaces]
+
+    # Se agrupan los indices de las imagenes por tamaño para procesar cada grupo en un solo arreglo
+    sizeGroups = {}
+    for index in range(len(surfaces)):
+        sizeGroups.setdefault(surfaces[index].get_size(), []).append(index)
+
+    contents = [None] * len(surfaces)
+    for (width, height), indexes in sizeGroups.items():
+        alphaArrays = []
+        for index in indexes:
+            alphaArray = get_alpha_array(surfaces[index])
+            alphaArrays.append(alphaArray != 0)
+            del alphaArray # Libera la vista para desbloquear la imagen
+        opaque = numpy.stack(alphaArrays)
+
+        columns = opaque.any(axis=2) # (imagenes, ancho)
+        rows = opaque.any(axis=1) # (imagenes, alto)
+        isEmpty = ~columns.any(axis=1)
+        minX = columns.argmax(axis=1)
+        maxX = width - 1 - columns[:, ::-1].argmax(axis=1)
+        minY = rows.argmax(axis=1)
+        maxY = height - 1 - rows[:, ::-1].argmax(axis=1)
+
+        for groupIndex in range(len(indexes)):
+            if isEmpty[groupIndex]:
+                # Mismo resultado que find_content_by_pixels para una imagen totalmente transparente
+                contents[indexes[groupIndex]] = pygame.Rect(width, height, -width, -height)
+            else:
+                left, top = int(minX[groupIndex]), int(minY[groupIndex])
+                contents[indexes[groupIndex]] = pygame.Rect(left, top, int(maxX[groupIndex]) - left, int(maxY[groupIndex]) - top)
+    return contents
+
+def find_content(surface:pygame.Surface) -> pygame.Rect:
+    """Retorna un rectangulo que abarca la region que no es transparente en la imagen. Usa NumPy si esta instalado, si no recorre la imagen pixel por pixel.
+
+
+    Args:
+        surface (pygame.Surface): La imagen donde se buscara el la region que no es transparente.
+
+
+    Returns:
+        pygame.Rect: El rectangulo que abarca la region que no es transparente.
+
+    """
+    return find_contents([surface])[0]
+
 def extract_content(surface:pygame.Surface, extract:bool) -> pygame.Rect:
     """Si extract es True recorta y retorna la region de la imagen que no es transparente.
 
@@ -130,7 +260,111 @@ def extract_content(surface:pygame.Surface, extract:bool) -> pygame.Rect:
     else:
         return surface
 
-def invert_colors(surface:pygame.Surface, invert:bool) -> pygame.Rect:
+def extract_contents(surfaces:list[pygame.Surface], extract:bool) -> list[pygame.Surface]:
+    """Si extract es True recorta y retorna la region que no es transparente de cada imagen, buscando las regiones de todas las imagenes en una sola pasada con find_contents.
+
+
+    Args:
+        surfaces (list[pygame.Surface]): Las imagenes a extraer el contenido.
+
+        extract (bool): si es True extrae el contenido, si es False retorna las imagenes sin modificarlas.
+
+
+    Returns:
+        list[pygame.Surface]: Las imagenes con el contenido extraido o las mismas que se pasaron en surfaces.
+
+    """
+    if extract:
+        return [surfaces[index].subsurface(content) for index, content in enumerate(find_contents(surfaces))]
+    else:
+        return surfaces
+
+# Las siguientes funciones transforman los colores de una imagen completa con operaciones de pygame (blits con mezcla especial) o de NumPy, sin recorrer la imagen pixel por pixel
+
+def negative_colors(surface:pygame.Surface) -> pygame.Surface:
+    """Retorna una copia de la imagen con los colores invertidos (255 - color) conservando la transparencia. Se llena la copia de blanco sin modificar su alpha y se le resta la imagen original con BLEND_RGB_SUB.
+
+
+    Args:
+        surface (pygame.Surface): La imagen a invertir los colores.
+
+
+    Returns:
+        pygame.Surface: La imagen con los colores invertidos.
+
+    """
+    invertedSurface = surface.copy()
+    invertedSurface.fill((255, 255, 255, 0), special_flags=pygame.BLEND_RGBA_MAX)
+    invertedSurface.blit(surface, (0, 0), special_flags=pygame.BLEND_RGB_SUB)
+    return invertedSurface
+
+def tint_colors(surface:pygame.Surface, color:tuple[int, int, int]) -> pygame.Surface:
+    """Retorna una copia de la imagen tintada, multiplicando cada color por color con BLEND_RGB_MULT y conservando la transparencia.
+
+
+    Args:
+        surface (pygame.Surface): La imagen a tintar.
+
+        color (tuple[int, int, int]): El color (r, g, b) del tinte, con (255, 255, 255) la imagen no cambia.
+
+
+    Returns:
+        pygame.Surface: La imagen tintada.
+
+    """
+    tintedSurface = surface.copy()
+    tintedSurface.fill(color[:3], special_flags=pygame.BLEND_RGB_MULT)
+    return tintedSurface
+
+def map_colors_by_pixels(surface:pygame.Surface, colorFunction:types.FunctionType) -> pygame.Surface:
+    """Retorna una copia de la imagen donde cada color (r, g, b, a) es reemplazado por colorFunction(color), recorriendo la imagen pixel por pixel. Solo se usa cuando no hay una alternativa con pygame o NumPy.
+
+
+    Args:
+        surface (pygame.Surface): La imagen a transformar.
+
+        colorFunction (types.FunctionType): Funcion que recibe un color (r, g, b, a) y retorna el nuevo color.
+
+
+    Returns:
+        pygame.Surface: La imagen con los colores transformados.
+
+    """
+    mappedSurface = surface.copy()
+    for x in range(surface.get_width()):
+        for y in range(surface.get_height()):
+            mappedSurface.set_at((x,y), colorFunction(surface.get_at((x,y))))
+    return mappedSurface
+
+def greyscale_colors(surface:pygame.Surface) -> pygame.Surface:
+    """Retorna una copia de la imagen en escala de grises conservando la transparencia. Usa pygame.transform.grayscale si existe (pygame 2.1.4 o superior), si no usa NumPy, y como ultimo recurso recorre la imagen pixel por pixel.
+
+
+    Args:
+        surface (pygame.Surface): La imagen a convertir en escala de grises.
+
+
+    Returns:
+        pygame.Surface: La imagen en escala de grises.
+
+    """
+    if hasattr(pygame.transform, 'grayscale'):
+        return pygame.transform.grayscale(surface)
+
+    if numpy is not None and surface.get_bitsize() in (24, 32):
+        greySurface = surface.copy()
+        colors = pygame.surfarray.pixels3d(greySurface)
+        grey = (colors[..., 0] * 0.299 + colors[..., 1] * 0.587 + colors[..., 2] * 0.114).astype(numpy.uint8)
+        colors[...] = grey[..., numpy.newaxis]
+        del colors # Libera la vista para desbloquear la imagen
+        return greySurface
+
+    def to_grey(color):
+        grey = int(color[0] * 0.299 + color[1] * 0.587 + color[2] * 0.114)
+        return grey, grey, grey, color[3]
+    return map_colors_by_pixels(surface, to_grey)
+
+def invert_colors(surface:pygame.Surface, invert:bool) -> pygame.Surface:
     """Si invert es True invierte los colores de la imagen.
 
 
@@ -141,17 +375,11 @@ def invert_colors(surface:pygame.Surface, invert:bool) -> pygame.Rect:
 
 
     Returns:
-        pygame.Rect: La imagen con los colores invertidos o la misma que se paso como surface.
+        pygame.Surface: La imagen con los colores invertidos o la misma que se paso como surface.
 
     """
     if invert:
-        invertedSurface = surface.copy()
-        for x in range(surface.get_width()):
-            for y in range(surface.get_height()):
-                color = surface.get_at((x,y))
-                invertedColor = 255 - color[0], 255 - color[1], 255 - color[2], color[3]
-                invertedSurface.set_at((x,y), invertedColor)
-        return invertedSurface
+        return negative_colors(surface)
     else:
         return surface
 
@@ -192,8 +420,8 @@ class Transformation:
                 else:
                     textureScalar = scalarBase[0] * scalar / frame.get_rect().width
             
-            scalledSprite.append(extract_content(pygame.transform.scale_by(frame, textureScalar), extractContent))
-        return {'sprite': Texture(scalledSprite), 'name': name}
+            scalledSprite.append(pygame.transform.scale_by(frame, textureScalar))
+        return {'sprite': Texture(extract_contents(scalledSprite, extractContent)), 'name': name}
 
     @staticmethod
     def XFLIP(sprite:Texture, variationIndex:int, name:str, scalar:float=1, extractContent:bool=False, scalarBase:tuple=(0,0)) -> dict[str, Texture|str]:
@@ -227,8 +455,8 @@ class Transformation:
                     textureScalar = scalarBase[1] * scalar / frame.get_rect().height
                 else:
                     textureScalar = scalarBase[0] * scalar / frame.get_rect().width
-            flippedSprite.append(extract_content(pygame.transform.scale_by(pygame.transform.flip(frame, flip_x=(variationIndex != 0), flip_y=False), textureScalar), extractContent))
-        return {'sprite': Texture(flippedSprite), 'name': ('xflip_'*(variationIndex != 0))+name}
+            flippedSprite.append(pygame.transform.scale_by(pygame.transform.flip(frame, flip_x=(variationIndex != 0), flip_y=False), textureScalar))
+        return {'sprite': Texture(extract_contents(flippedSprite, extractContent)), 'name': ('xflip_'*(variationIndex != 0))+name}
     
     @staticmethod
     def NEGATIVE_COLOR(sprite:Texture, variationIndex:int, name:str, scalar:float=1, extractContent:bool=False, scalarBase:tuple=(0,0)) -> dict[str, Texture|str]:
@@ -262,7 +490,8 @@ class Transformation:
                     textureScalar = scalarBase[1] * scalar / frame.get_rect().height
                 else:
                     textureScalar = scalarBase[0] * scalar / frame.get_rect().width
-            negativeSprite.append(invert_colors(extract_content(pygame.transform.scale_by(frame, textureScalar), extractContent), (variationIndex != 0)))
+            negativeSprite.append(pygame.transform.scale_by(frame, textureScalar))
+        negativeSprite = [invert_colors(frame, (variationIndex != 0)) for frame in extract_contents(negativeSprite, extractContent)]
         return {'sprite': Texture(negativeSprite), 'name': ('negative_'*(variationIndex != 0))+name}
     
     @staticmethod
@@ -297,12 +526,288 @@ class Transformation:
                     textureScalar = scalarBase[1] * scalar / frame.get_rect().height
                 else:
                     textureScalar = scalarBase[0] * scalar / frame.get_rect().width
-            flippedSprite.append(extract_content(pygame.transform.scale_by(pygame.transform.rotate(frame, 90*variationIndex), textureScalar), extractContent))
-        return {'sprite': Texture(flippedSprite), 'name': (f'{90*variationIndex}rotated_'*(variationIndex != 0))+name}
+            flippedSprite.append(pygame.transform.scale_by(pygame.transform.rotate(frame, 90*variationIndex), textureScalar))
+        return {'sprite': Texture(extract_contents(flippedSprite, extractContent)), 'name': (f'{90*variationIndex}rotated_'*(variationIndex != 0))+name}
+
+    @staticmethod
+    def COLOR(colorFunction:types.FunctionType, prefix:str, key:str=None) -> types.FunctionType:
+        """Crea y retorna una funcion de transformacion de colores para usar en create_textures, que ademas de las transformaciones basicas, aplica colorFunction a las imagenes y modifica su nombre con el prefijo indicado. Por ejemplo Transformation.COLOR(lambda frame: tint_colors(frame, (255, 0, 0)), 'red_', key='tint_colors(255, 0, 0)').
+
+        Args:
+            colorFunction (types.FunctionType): Funcion que recibe una imagen (pygame.Surface) y retorna la imagen con los colores transformados, como negative_colors, greyscale_colors o tint_colors.
+
+            prefix (str): El prefijo que tendra el nombre de la textura transformada.
+
+            key (str, optional): El texto que identifica a colorFunction en el cache de texturas y en el registro de texturas. Las funciones definidas en un modulo se identifican por su nombre, pero las lambdas y funciones anidadas no tienen un nombre unico, por lo que sin key sus texturas no se guardan en el cache ni se comparten. Defaults to None.
+
+
+        Returns:
+            types.FunctionType: La funcion de transformacion, donde si variationIndex es distinto a cero aplica colorFunction.
+
+        """
+
+        def colorTransformation(sprite:Texture, variationIndex:int, name:str, scalar:float=1, extractContent:bool=False, scalarBase:tuple=(0,0)) -> dict[str, Texture|str]:
+            coloredSprite = []
+            for frame in Transformation.BASIC(sprite, 0, name, scalar, extractContent, scalarBase)['sprite'].sprite:
+                if variationIndex != 0:
+                    frame = colorFunction(frame)
+                coloredSprite.append(frame)
+            return {'sprite': Texture(coloredSprite), 'name': (prefix*(variationIndex != 0))+name}
+        
+        # Identifica la transformacion en el cache de texturas, None si colorFunction no tiene un nombre unico
+        if key is None:
+            key = get_function_key(colorFunction)
+        colorTransformation.cacheKey = f'Transformation.COLOR({key}, {prefix!r})' if key is not None else None
+        return colorTransformation
+
+    @staticmethod
+    def GREYSCALE(sprite:Texture, variationIndex:int, name:str, scalar:float=1, extractContent:bool=False, scalarBase:tuple=(0,0)) -> dict[str, Texture|str]:
+        """Ademas de las transformaciones basicas, puede retornar las imagenes de la textura en escala de grises y modificar su nombre con el prefijo 'greyscale_'. 
+
+        Args:
+            sprite (Texture): La textura con las imagenes a transformar.
+
+            variationIndex (int): Si es distinto a cero convierte las imagenes a escala de grises.
+
+            name (str): El nombre de la textura, si se convierte se retorna con el prefijo 'greyscale_', 
+            scalar (float, optional): El factor a reescalar las imagenes. Defaults to 1.
+
+            extractContent (bool, optional): Define si extraer el contenido no transparente de las imagenes. Defaults to False.
+
+            scalarBase (tuple, optional): Si se define reescala las imagenes teniendo en cuenta este tamaño como base. Defaults to (0,0).
+
+
+        Returns:
+            dict: El diccionario con el sprite transformado y el nombre de la textura, que si es convertida tendra el subfijo 'greyscale_'.
+
+        """
+
+        return Transformation.COLOR(greyscale_colors, 'greyscale_')(sprite, variationIndex, name, scalar, extractContent, scalarBase)
 
 
         
-def create_textures(fileNameList:list[str], spriteLeghtList:list[int], path:str='textures/', variations:int|tuple[int]=1, transformFunctions:types.FunctionType|tuple[types.FunctionType]=Transformation.BASIC, scalar:float=1, extractContent:bool=False, scalarBase:tuple=(0,0)) -> dict[str, Texture]:
+def load_image(filePath:str) -> pygame.Surface:
+    """Carga la imagen con transparencia por pixel. En el hilo principal, con la ventana creada, la convierte al formato de la pantalla, en otros hilos (como los de /game_modules/asset_loader.py) la convierte a 32 bits RGBA sin usar la pantalla.
+
+    Args:
+        filePath (str): La ruta de la imagen.
+
+    Returns:
+        pygame.Surface: La imagen cargada.
+    """
+
+    image = pygame.image.load(filePath)
+    if threading.current_thread() is threading.main_thread() and pygame.display.get_surface() is not None:
+        return image.convert_alpha()
+    return pygame.image.frombytes(pygame.image.tobytes(image, 'RGBA'), image.get_size(), 'RGBA')
+
+textureCache = TextureCache() # Cache en disco usado por defecto en create_textures
+
+def get_function_key(function:types.FunctionType) -> str|None:
+    """Retorna el modulo y nombre de la funcion, o None si no la identifican: las lambdas se llaman todas '<lambda>' y las funciones anidadas pueden depender de las variables de la funcion que las creo."""
+    if '<' in function.__qualname__ or getattr(function, '__closure__', None) is not None:
+        return None
+    return f'{function.__module__}.{function.__qualname__}'
+
+def get_transformation_key(transformFunction:types.FunctionType) -> str|None:
+    """Retorna el texto que identifica a la funcion de transformacion en el cache de texturas. Si la funcion tiene el atributo cacheKey se usa este, si no su modulo y nombre.
+
+    Args:
+        transformFunction (types.FunctionType): La funcion de transformacion.
+
+    Returns:
+        str|None: El texto que identifica a la funcion, o None si no tiene uno unico (ver get_function_key), en cuyo caso sus texturas no se guardan en el cache ni se comparten en el registro de texturas.
+    """
+
+    if hasattr(transformFunction, 'cacheKey'):
+        return transformFunction.cacheKey
+    return get_function_key(transformFunction)
+
+def load_cached_texture(cache:TextureCache, fileHash:str, parameters:tuple, createTexture:types.FunctionType) -> dict[str, Texture|str]:
+    """Retorna la textura guardada en el cache con la llave formada por fileHash y parameters. Si no esta guardada la crea con createTexture y la guarda.
+
+    Args:
+        cache (TextureCache): El cache donde buscar y guardar la textura.
+
+        fileHash (str): El hash de la imagen original de la textura.
+
+        parameters (tuple): Los parametros de carga y transformacion de la textura.
+
+        createTexture (types.FunctionType): Funcion sin argumentos que crea la textura, retornando un diccionario como las funciones de Transformation.
+
+    Returns:
+        dict[str, Texture|str]: El diccionario con el sprite y el nombre de la textura.
+    """
+
+    key = cache.get_key(fileHash, parameters)
+    cachedTexture = cache.load(key)
+    if cachedTexture is not None:
+        return {'sprite': Texture(cachedTexture[1]), 'name': cachedTexture[0]}
+    textureVariation = createTexture()
+    cache.save(key, textureVariation['name'], textureVariation['sprite'].sprite)
+    return textureVariation
+
+class TextureRecipe:
+    """Sus instancias describen como crear una textura de create_textures a partir de otra textura (su padre) sin crearla, y la guardan la primera vez que se crea."""
+
+    def __init__(self, name:str, createTexture:types.FunctionType, parent:'TextureRecipe'=None, origin:tuple[str, tuple]=None, key:tuple=None) -> None:
+        """Guarda la forma de crear la textura.
+
+        Args:
+            name (str): El nombre de la textura.
+
+            createTexture (types.FunctionType): Funcion que recibe la textura del padre (o None si no tiene padre) y retorna un diccionario como las funciones de Transformation.
+
+            parent (TextureRecipe, optional): La receta de la textura a partir de la cual se crea esta. Defaults to None.
+
+            origin (tuple[str, tuple], optional): El hash de la imagen original y los parametros de sus transformaciones, usados como llave en el cache de texturas. De ser None la textura no se guarda en el cache. Defaults to None.
+
+            key (tuple, optional): La llave de la textura en el registro de texturas (TextureRegistry). Defaults to None.
+        """
+
+        self.name = name
+        self.createTexture = createTexture
+        self.parent = parent
+        self.origin = origin
+        self.key = key
+        self.texture = None
+
+    def get_chain(self) -> list['TextureRecipe']:
+        """Retorna la receta junto con las recetas de las que depende (su padre, el padre de su padre, etc)."""
+        chain = []
+        recipe = self
+        while recipe is not None:
+            chain.append(recipe)
+            recipe = recipe.parent
+        return chain
+
+    def get_texture(self, cache:TextureCache) -> Texture:
+        """Retorna la textura, creandola (o cargandola del cache) si es la primera vez que se pide.
+
+        Args:
+            cache (TextureCache): El cache donde buscar y guardar la textura.
+
+        Returns:
+            Texture: La textura.
+        """
+
+        if self.texture is None:
+            createTexture = lambda: self.createTexture(self.parent.get_texture(cache) if self.parent is not None else None)
+            if self.origin is not None:
+                self.texture = load_cached_texture(cache, self.origin[0], self.origin[1], createTexture)['sprite']
+            else:
+                self.texture = createTexture()['sprite']
+        return self.texture
+
+class TextureDictionary(MutableMapping):
+    """Diccionario de texturas retornado por create_textures, donde cada textura se crea la primera vez que se pide (por ejemplo en Animation.get_texture o Animation.change_actual_texture) y se guarda para las siguientes veces."""
+
+    def __init__(self, cache:TextureCache) -> None:
+        self.recipes = {}
+        self.cache = cache
+        self.acquiredRecipes = None # Las recetas contadas en el registro de texturas mientras el diccionario este en uso
+
+    def add_recipe(self, recipe:TextureRecipe) -> None:
+        """Agrega o reemplaza la textura con el nombre de la receta, sin crearla."""
+        self.recipes[recipe.name] = recipe
+
+    def is_loaded(self, name:str) -> bool:
+        """Retorna True si la textura con el nombre indicado ya fue creada."""
+        return self.recipes[name].texture is not None
+
+    def load_all(self) -> None:
+        """Crea todas las texturas que aun no se han creado."""
+        for name in self.recipes:
+            self[name]
+
+    def __getitem__(self, name:str) -> Texture:
+        return self.recipes[name].get_texture(self.cache)
+
+    def __setitem__(self, name:str, texture:Texture) -> None:
+        recipe = TextureRecipe(name, lambda parent: {'sprite': texture, 'name': name})
+        recipe.texture = texture
+        self.recipes[name] = recipe
+
+    def __delitem__(self, name:str) -> None:
+        del self.recipes[name]
+
+    def __contains__(self, name:object) -> bool:
+        return name in self.recipes
+
+    def __iter__(self):
+        return iter(self.recipes)
+
+    def __len__(self) -> int:
+        return len(self.recipes)
+
+class TextureRegistry:
+    """Registro global de las recetas de texturas creadas por create_textures. Las llamadas con la misma imagen, parametros y transformaciones obtienen las mismas recetas, y por lo tanto las mismas texturas. Cuenta cuantos diccionarios de texturas usan cada receta, y al dejar de usarse libera su textura."""
+
+    def __init__(self) -> None:
+        self.recipes = {}
+        self.references = {}
+
+    def get_recipe(self, key:tuple, createRecipe:types.FunctionType) -> TextureRecipe:
+        """Retorna la receta registrada con la llave, si no existe la crea con createRecipe y la registra.
+
+        Args:
+            key (tuple): La llave de la receta, formada por el origen de la textura (el hash y la ruta de la imagen, o 'default') y los parametros de sus transformaciones.
+
+            createRecipe (types.FunctionType): Funcion sin argumentos que crea la receta.
+
+        Returns:
+            TextureRecipe: La receta registrada con la llave.
+        """
+
+        if key not in self.recipes:
+            recipe = createRecipe()
+            recipe.key = key
+            self.recipes[key] = recipe
+            self.references[key] = 0
+        return self.recipes[key]
+
+    def acquire(self, textureDictionary:'TextureDictionary') -> None:
+        """Cuenta un uso de cada receta del diccionario (y de las recetas de las que dependen).
+
+        Args:
+            textureDictionary (TextureDictionary): El diccionario de texturas que empieza a usarse.
+        """
+
+        if not isinstance(textureDictionary, TextureDictionary) or textureDictionary.acquiredRecipes is not None:
+            return
+        acquiredRecipes = {}
+        for recipe in textureDictionary.recipes.values():
+            for chainRecipe in recipe.get_chain():
+                if chainRecipe.key in self.recipes and self.recipes[chainRecipe.key] is chainRecipe:
+                    acquiredRecipes[id(chainRecipe)] = chainRecipe
+        for recipe in acquiredRecipes.values():
+            self.references[recipe.key] += 1
+        textureDictionary.acquiredRecipes = list(acquiredRecipes.values())
+
+    def release(self, textureDictionary:'TextureDictionary') -> None:
+        """Descuenta el uso de las recetas del diccionario, las recetas que ya no usa ningun diccionario se eliminan del registro y liberan su textura. Si luego se pide una textura del diccionario esta se vuelve a crear.
+
+        Args:
+            textureDictionary (TextureDictionary): El diccionario de texturas que deja de usarse.
+        """
+
+        if not isinstance(textureDictionary, TextureDictionary) or textureDictionary.acquiredRecipes is None:
+            return
+        for recipe in textureDictionary.acquiredRecipes:
+            self.references[recipe.key] -= 1
+            if self.references[recipe.key] <= 0:
+                del self.recipes[recipe.key]
+                del self.references[recipe.key]
+                recipe.texture = None
+        textureDictionary.acquiredRecipes = None
+
+    def get_loaded_count(self) -> int:
+        """Retorna la cantidad de texturas registradas que estan creadas en memoria."""
+        return sum(recipe.texture is not None for recipe in self.recipes.values())
+
+textureRegistry = TextureRegistry() # Registro usado por defecto en create_textures
+
+def create_textures(fileNameList:list[str], spriteLeghtList:list[int], path:str='textures/', variations:int|tuple[int]=1, transformFunctions:types.FunctionType|tuple[types.FunctionType]=Transformation.BASIC, scalar:float=1, extractContent:bool=False, scalarBase:tuple=(0,0), cache:TextureCache=None, registry:TextureRegistry=None) -> TextureDictionary:
     """Carga las imagenes y crea las texturas correspondientes a cada imagen transformadas segun las funciones de transformacion, y retorna las texturas en un diccionario donde cada llave es el nombre que le corresponde, el cual es la primera parte del nombre del archivo antes del punto junto con el prefijo correspondiente si son trasformadas.
 
 
@@ -323,16 +828,30 @@ def create_textures(fileNameList:list[str], spriteLeghtList:list[int], path:str=
 
         scalarBase (tuple, optional): Si se define reescala las imagenes teniendo en cuenta este tamaño como base. Defaults to (0,0).
 
+        cache (TextureCache, optional): El cache en disco donde se buscan y guardan las texturas transformadas. Si no se especifica se usa textureCache. Defaults to None.
+
+        registry (TextureRegistry, optional): El registro donde se comparten las texturas con las otras llamadas a create_textures. Si no se especifica se usa textureRegistry. Defaults to None.
+
 
     Returns:
-        dict[str, Texture]: El diccionario con todas las texturas creadas y transformadas a base de las imagenes cargadas, donde su llave es el nombre correspondiente (subfijo+nombre_antes_del_punto).
+        TextureDictionary: El diccionario con todas las texturas creadas y transformadas a base de las imagenes cargadas, donde su llave es el nombre correspondiente (subfijo+nombre_antes_del_punto). Cada textura se crea la primera vez que se pide.
 
     """
 
-    textures = {'default': Texture(pygame.Surface((500, 500), pygame.SRCALPHA), 1)}
+    if cache is None:
+        cache = textureCache
+    if registry is None:
+        registry = textureRegistry
+
+    textures = TextureDictionary(cache)
+    textures.add_recipe(registry.get_recipe(('default', ()), lambda: TextureRecipe('default', lambda parent: {'sprite': Texture(pygame.Surface((500, 500), pygame.SRCALPHA), 1), 'name': 'default'})))
     for index in range(len(fileNameList)):
-        sprite = pygame.image.load(path + fileNameList[index]).convert_alpha()
-        textures[fileNameList[index].split('.')[0]] = Transformation.BASIC(Texture(sprite, spriteLeghtList[index]), 0, '', scalar, extractContent, scalarBase=scalarBase)['sprite']
+        name = fileNameList[index].split('.')[0]
+        fileHash = cache.get_file_hash(path + fileNameList[index])
+        parameters = (spriteLeghtList[index], scalar, tuple(scalarBase), extractContent)
+        loadTexture = lambda parent, filePath=path + fileNameList[index], lenght=spriteLeghtList[index], name=name: {'sprite': Transformation.BASIC(Texture(load_image(filePath), lenght), 0, '', scalar, extractContent, scalarBase=scalarBase)['sprite'], 'name': name}
+        # En el registro tambien se usa el nombre del archivo, porque de el depende el nombre de la textura
+        textures.add_recipe(registry.get_recipe(((fileHash, path + fileNameList[index]), parameters), lambda: TextureRecipe(name, loadTexture, origin=(fileHash, parameters))))
 
     if (not isinstance(variations, list)) and (not isinstance(variations, tuple)):
         variations = [variations]
@@ -343,14 +862,44 @@ def create_textures(fileNameList:list[str], spriteLeghtList:list[int], path:str=
     
 
     for transformFunctionIndex in range(len(transformFunctions)):
-        procesingTextures = textures.copy()
-        for TextureName, loadedTexture in procesingTextures.items():
+        transformFunction = transformFunctions[transformFunctionIndex]
+        procesingRecipes = textures.recipes.copy()
+        for TextureName, parentRecipe in procesingRecipes.items():
             for variationIndex in range(variations[transformFunctionIndex]):
-                textureVariation = transformFunctions[transformFunctionIndex](loadedTexture, variationIndex, TextureName)
-                textures[textureVariation['name']] = textureVariation['sprite']
+                # Si la transformacion no tiene un texto que la identifique se usa la funcion, asi la variacion solo se comparte con la misma funcion
+                transformationKey = get_transformation_key(transformFunction)
+                key = (parentRecipe.key[0], parentRecipe.key[1] + ((transformationKey if transformationKey is not None else transformFunction, variationIndex),))
+                textures.add_recipe(registry.get_recipe(key, lambda: create_variation_recipe(parentRecipe, transformFunction, variationIndex, TextureName, key)))
 
+    registry.acquire(textures)
     return textures
 
+def create_variation_recipe(parentRecipe:TextureRecipe, transformFunction:types.FunctionType, variationIndex:int, TextureName:str, key:tuple) -> TextureRecipe:
+    """Retorna la receta de la variacion de la textura de parentRecipe, creada con la funcion de transformacion y el indice de variacion indicados.
+
+    Args:
+        parentRecipe (TextureRecipe): La receta de la textura a transformar.
+
+        transformFunction (types.FunctionType): La funcion de transformacion.
+
+        variationIndex (int): El indice de la variacion.
+
+        TextureName (str): El nombre de la textura a transformar.
+
+        key (tuple): La llave de la variacion en el registro de texturas.
+
+    Returns:
+        TextureRecipe: La receta de la variacion.
+    """
+
+    # Se aplica la transformacion a una textura sin fotogramas solo para conocer el nombre de la variacion sin crearla
+    variationName = transformFunction(Texture([]), variationIndex, TextureName)['name']
+    origin = None
+    transformationKey = get_transformation_key(transformFunction)
+    if parentRecipe.origin is not None and transformationKey is not None:
+        origin = (parentRecipe.origin[0], parentRecipe.origin[1] + ((transformationKey, variationIndex),))
+    return TextureRecipe(variationName, lambda parent: transformFunction(parent, variationIndex, TextureName), parentRecipe, origin)
+
 def create_empty_texture(width:int, height:int, name:str='default', scalar:float=1, scalarBase:tuple[int, int]=(0,0)) -> dict[str, Texture]:
     """Retorna un diccionario con una textura con una sola imagen transparente con el tamaño indicado.
 
@@ -378,7 +927,7 @@ def create_empty_texture(width:int, height:int, name:str='default', scalar:float
     return {name: textureVariation['sprite']}
 
 def create_text_texture(text:str, textColor:tuple[int, int, int, int], font:pygame.font.Font, name:str='default', padding:list[int] = [0], scalar:float=1, scalarBase:tuple=(0,0)) -> dict[str, Texture]:
-    """Retorna un diccionario con una textura con la imagen del texto renderizado y con saltos de linea. La imagen reescalada y con un espacio entre los bordes especificado por padding. 
+    """Retorna un diccionario con una textura con la imagen del texto renderizado y con saltos de linea. La imagen reescalada y con un espacio entre los bordes especificado por padding. Si no se reescala, la imagen es compartida con otras llamadas con el mismo texto por lo que no debe modificarse.
 
     Args:
         text (str): El texto a renderizar.
@@ -400,51 +949,11 @@ def create_text_texture(text:str, textColor:tuple[int, int, int, int], font:pyga
 
     """
 
-    if len(padding) == 1:
-        left = padding[0]
-        top = padding[0]
-        right = padding[0]
-        bottom = padding[0]
-    elif len(padding) == 2:
-        left = padding[0]
-        top = padding[1]
-        right = padding[0]
-        bottom = padding[1]
-    else:
-        left = padding[0]
-        top = padding[1]
-        right = padding[2]
-        bottom = padding[3]
-
-    textLines = text.split('\n')
-    renderedTextLines = [font.render(line, True, textColor) for line in textLines]
-
-    joinedLines = renderedTextLines[0].copy()
-
-    for line in renderedTextLines[1:]:
-        width = joinedLines.get_width()
-
-        if line.get_width() > width:
-            width = line.get_width()
+    # Los textos ya renderizados se guardan en textCache (ver /game_modules/text_engine.py)
+    finalImage = textCache.render(text, textColor, font, padding)
+    if scalar == 1 and scalarBase == (0, 0):
+        return {name: Texture([finalImage])}
 
-        height = joinedLines.get_height() + line.get_height()
-        joinedToActualLine = pygame.Surface((width, height), pygame.SRCALPHA)
-        joinedToActualLine.blit(joinedLines, (0,0))
-        joinedToActualLine.blit(line, (0, height - line.get_height()))
-        joinedLines = joinedToActualLine
-    
-    finalWidth = left + joinedLines.get_width() + right
-    finalHeight = top + joinedLines.get_height() + bottom
-
-    if finalWidth < 1:
-        finalWidth = 1
-    
-    if finalHeight < 1:
-        finalHeight = 1
-    
-    finalImage = pygame.Surface((finalWidth, finalHeight), pygame.SRCALPHA)
-    finalImage.blit(joinedLines, (left, top))
-    
     textureVariation = Transformation.BASIC(Texture(finalImage, 1), None, name, scalar=scalar, scalarBase=scalarBase)
     return {name: textureVariation['sprite']}
     
@@ -631,6 +1140,24 @@ class Animation:
         """
 
         return self.textures[self.actualTexture].sprite[self.frame]
+
+    def get_texture_area(self) -> tuple[pygame.Surface, pygame.Rect|None]:
+        """Retorna la imagen y el area a usar como argumentos de blit para dibujar el fotograma actual, si la textura esta en un atlas la imagen es la del atlas.
+
+        Returns:
+            tuple[pygame.Surface, pygame.Rect|None]: La imagen y el area del fotograma actual.
+        """
+
+        return self.textures[self.actualTexture].get_frame_area(self.frame)
+
+    def get_draw_state(self) -> tuple:
+        """Retorna lo que determina la imagen dibujada del fotograma actual, si cambia entre dos fotogramas del juego la entidad se debe volver a dibujar.
+
+        Returns:
+            tuple: La imagen y el area del fotograma actual.
+        """
+
+        return self.get_texture_area()
         
 class IconAnimation(Animation):
     """Clase heredera de Animation, donde sus instancias tienen un color y otra animacion de fondo."""
@@ -672,6 +1199,8 @@ class IconAnimation(Animation):
         
         self.background = background
         self.backgroundColor = backgroundColor
+        self.composite = None # La imagen compuesta del fotograma actual, se reutiliza mientras no cambie su llave (ver get_composite_key)
+        self.compositeKey = None
     
     def update_frame(self, FPS:int):
         """Si el atributo isAnimated es True, actualiza el fotograma de la animacion y de su fondo teniendo en cuenta el tiempo de actualizacion que se calcula por los FPS de actualizacion del juego.
@@ -688,22 +1217,60 @@ class IconAnimation(Animation):
             if self.background is not None:
                 self.background.update_frame(FPS)
     
+    def get_composite_key(self) -> tuple:
+        """Retorna la llave de la imagen compuesta del fotograma actual, formada por la imagen del fotograma (que depende de la textura y el fotograma actual), la llave o imagen del fondo y el color de fondo. La imagen compuesta solo se vuelve a crear si la llave cambia.
+
+        Returns:
+            tuple: La llave de la imagen compuesta.
+        """
+
+        if self.background is None:
+            backgroundKey = None
+        elif isinstance(self.background, IconAnimation):
+            backgroundKey = self.background.get_composite_key()
+        else:
+            backgroundKey = self.background.get_texture()
+        return self.textures[self.actualTexture].sprite[self.frame], backgroundKey, tuple(self.backgroundColor)
+
     def get_texture(self) -> pygame.Surface:
-        """Retorna la imagen del fotograma actual de la animacion junto con su fondo y color de fondo.
+        """Retorna la imagen del fotograma actual de la animacion junto con su fondo y color de fondo. La imagen se guarda y se reutiliza mientras no cambien el fotograma, el fondo o el color de fondo, por lo que no debe modificarse.
 
         Returns:
             pygame.Surface: Imagen del fotograma actual.
         """
 
-        texture = pygame.Surface(self.textures[self.actualTexture].sprite[self.frame].get_rect().size, pygame.SRCALPHA)
-        texture.fill(self.backgroundColor)
-        
-        if self.background is not None:
-            texture.blit(self.background.get_texture(), (0,0))
+        compositeKey = self.get_composite_key()
+        if self.composite is None or compositeKey != self.compositeKey:
+            frame = compositeKey[0]
+            if self.composite is None or self.composite.get_size() != frame.get_size():
+                self.composite = pygame.Surface(frame.get_size(), pygame.SRCALPHA)
+            self.composite.fill(self.backgroundColor)
+
+            if self.background is not None:
+                self.composite.blit(self.background.get_texture(), (0,0))
 
-        texture.blit(self.textures[self.actualTexture].sprite[self.frame], (0,0))
+            self.composite.blit(frame, (0,0))
+            self.compositeKey = compositeKey
             
-        return texture
+        return self.composite
+
+    def get_texture_area(self) -> tuple[pygame.Surface, None]:
+        """Retorna la imagen del fotograma actual junto con su fondo, el area es None porque es una imagen compuesta.
+
+        Returns:
+            tuple[pygame.Surface, None]: La imagen del fotograma actual y None.
+        """
+
+        return self.get_texture(), None
+
+    def get_draw_state(self) -> tuple:
+        """Retorna lo que determina la imagen dibujada del fotograma actual, que es la llave de la imagen compuesta (ver get_composite_key).
+
+        Returns:
+            tuple: La llave de la imagen compuesta.
+        """
+
+        return self.get_composite_key()
 
 class TextIconAnimation(IconAnimation):
     """Clase heredera de IconAnimation, donde sus intancias por defecto solo tienen una textura que es del texto renderizado."""
@@ -756,9 +1323,10 @@ class TextIconAnimation(IconAnimation):
         self.previousTextColor = textColor
         self.padding = padding
         self.previousPadding = padding
+        self.layout = None # Diseño del texto usado cuando el texto crece al final (ver /game_modules/text_engine.py)
 
     def update_frame(self, FPS:int):
-        """Si el atributo isAnimated es True, actualiza el renderizado del texto si algun atributo relacionado cambia, por compatibilidad actualiza el fotograma de la animacion  y de su fondo teniendo en cuenta el tiempo de actualizacion que se calcula por los FPS de actualizacion del juego.
+        """Si el atributo isAnimated es True, actualiza el renderizado del texto si algun atributo relacionado cambia (si el texto solo crece al final, solo se dibujan los nuevos caracteres), por compatibilidad actualiza el fotograma de la animacion  y de su fondo teniendo en cuenta el tiempo de actualizacion que se calcula por los FPS de actualizacion del juego.
 
         Args:
             FPS (int): FPS de actualizacion del juego.
@@ -770,8 +1338,20 @@ class TextIconAnimation(IconAnimation):
             self.frame = floor(self.animationTime * self.FPS) + self.startFrame 
             self.limit_frame()
 
+            if self.font != self.previousFont or self.textColor != self.previousTextColor or self.padding != self.previousPadding:
+                self.layout = None
+                self.textures = create_text_texture(self.text, self.textColor, self.font, name=self.actualTexture, padding=self.padding)
+            elif self.text != self.previousText:
+                if self.text.startswith(self.previousText):
+                    # El texto crecio al final, solo se dibujan los nuevos caracteres
+                    if self.layout is None:
+                        self.layout = TextLayout(self.font, self.textColor, self.padding)
+                    self.layout.set_text(self.text)
+                    self.textures = {self.actualTexture: Texture([self.layout.get_surface()])}
+                else:
+                    self.textures = create_text_texture(self.text, self.textColor, self.font, name=self.actualTexture, padding=self.padding)
+
             if self.text != self.previousText or self.font != self.previousFont or self.textColor != self.previousTextColor or self.padding != self.previousPadding:
-                self.textures = create_text_texture(self.text, self.textColor, self.font, padding=self.padding)
                 self.previousText = self.text
                 self.previousFont = self.font
                 self.previousTextColor = self.textColor
@@ -873,7 +1453,7 @@ class Physics:
             entity ([type]): Entidad que posee como atributo physics esta instancia de Physics.
             offsetPosition (list[int]): desface (x, y).
         """
-        if self.previousPosition != [None, None]:
+        if self.previousPosition[0] is not None:
             self.previousPosition[0] += offsetPosition[0]
             self.previousPosition[1] += offsetPosition[1]
         self.hitbox = create_hitbox(pygame.Rect(entity.get_texture_position(), entity.animation.get_texture().get_size()), self.margin, self.hitboxSize, self.hitboxLocation)
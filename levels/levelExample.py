@@ -1,5 +1,8 @@
 from game_modules.entities import *
 from game_modules.utilities import *
+from game_modules.texture_atlas import create_texture_atlas
+from game_modules.asset_loader import AssetLoader
+from game_modules.text_engine import fontRegistry
 from menus.basic_game_menus import *
 
 def move_level(entity:LevelWorksSpace):
@@ -77,29 +80,40 @@ def mouse_listener_text(selfEntity:Entity, mousePosition:tuple[int], buttons:tup
         selfEntity.parent.parent.show_menu(create_game_inventary_interface())
         selfEntity.parent.remove_entity(0, entity=selfEntity)
 
-def create_level(SIZE:tuple[int]) -> LevelWorksSpace:
+def create_level(SIZE:tuple[int], progressCallback=None) -> LevelWorksSpace:
     """Crea un nivel de ejemplo.
 
     Args:
         SIZE (tuple[int]): Tamaño de la ventana
 
+        progressCallback (types.FunctionType, optional): Funcion que recibe el progreso de la carga de las texturas (creadas, total), usada para mostrar una pantalla de carga. Defaults to None.
+
     Returns:
         LevelWorksSpace
     """
 
     print('\nPresiona H para mostrar las hitboxes,\n         j para mostrar los puntos de las posiciones\n       y k para mostrar los espacios clickeables')
 
+    # Usando las texturas horneadas del nivel si existe su paquete (creado con: python -m game_modules.asset_baker levels/levelExample.manifest.json)
+    textureCache.add_pack_file('levels/levelExample.pack')
+
     # Cargando y creando las texturas
     bg1Textures = create_textures(['bg1.png'], [1])
     bg2Textures = create_textures(['bg2.png'], [1])
     mcTextures = create_textures(['Idle.png', 'Walk.png'], [4, 6], path='textures/main_character/', variations=[2, 2, 3], transformFunctions=[Transformation.XFLIP, Transformation.NEGATIVE_COLOR, Transformation.RECT_ROTATION], scalar=4, extractContent=True)
 
+    # Cargando en paralelo las texturas que se usan desde el inicio, las demas variaciones se crean al pedirlas
+    AssetLoader().load([bg1Textures, bg2Textures, (mcTextures, ['Idle', 'xflip_Idle', 'Walk', 'xflip_Walk'])], progressCallback)
+
     # Guardando el tamaño del personaje principal para agrandar algunas texturas al tamaño del personaje principal 
-    mcSize = list(mcTextures.values())[1].sprite[0].get_rect().size
+    mcSize = mcTextures['Idle'].sprite[0].get_rect().size
     
     ch1Textures = create_textures(['chair1.png'], [1], scalarBase=mcSize, scalar=1.2, transformFunctions=Transformation.NEGATIVE_COLOR, variations=2)
 
-    font = pygame.font.SysFont('Verdana', 20)
+    # Juntando las texturas de las sillas en un atlas, ya que se dibujan muchas veces en cada fotograma
+    create_texture_atlas(ch1Textures, ['chair1', 'negative_chair1'])
+
+    font = fontRegistry.get_font('Verdana', 20)
 
     text = Entity(Physics([700, 300]), TextIconAnimation('NO ME TOQUES!', font, (255, 0, 0, 255), backgroundColor=(0,0,0,0)), mouseListener=mouse_listener_text)
 
@@ -0,0 +1,64 @@
+"""Pruebas del mundo de colisiones de /game_modules/collision_world.py.
+
+Se ejecutan desde la carpeta principal del proyecto con: python -m unittest discover tests
+"""
+import os, unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from game_modules.collision_world import CollisionWorld
+from game_modules.entities import Entity
+from game_modules.swept_collision import sweep_and_limit
+from game_modules.utilities import Animation, Physics, create_empty_texture
+
+def create_body(x:float, y:float, width:int, height:int, velocity:list=[0, 0]) -> Entity:
+    """Crea una entidad colisionable con una textura transparente del tamaño dado y la velocidad dada."""
+    body = Entity(Physics([x, y], velocity=list(velocity), isCollidable=True), Animation(create_empty_texture(width, height), isAnimated=False))
+    body.update_hitbox()
+    return body
+
+class TestCollisionWorld(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    def run_head_on(self, FPS:int, frames:int) -> None:
+        """Mueve una entidad contra una pared y otra rapida contra la primera, y revisa en cada fotograma que ninguna se meta en otra ni la atraviese."""
+        wall = create_body(100, 0, 20, 200)
+        slowBody = create_body(121, 50, 40, 40, [-40, 0])
+        fastBody = create_body(400, 50, 40, 40, [-400, 0])
+        collisionWorld = CollisionWorld()
+        for body in [wall, slowBody, fastBody]:
+            collisionWorld.add(body)
+        for frame in range(frames):
+            for body in [wall, slowBody, fastBody]:
+                body.update(FPS)
+            collisionWorld.step(lambda body, obstacles: sweep_and_limit(body, obstacles, changeColor=False))
+            with self.subTest(FPS=FPS, frame=frame):
+                self.assertGreaterEqual(slowBody.physics.hitbox.left, wall.physics.hitbox.right)
+                self.assertGreaterEqual(fastBody.physics.hitbox.left, slowBody.physics.hitbox.right)
+        self.assertEqual(slowBody.physics.hitbox.left, wall.physics.hitbox.right)
+        self.assertEqual(fastBody.physics.hitbox.left, slowBody.physics.hitbox.right)
+
+    def test_moving_bodies_do_not_shove_each_other_through_a_wall(self):
+        for FPS in [10, 30, 60]:
+            self.run_head_on(FPS, 3 * FPS)
+
+    def test_both_moving_bodies_are_resolved(self):
+        leftBody = create_body(0, 50, 40, 40, [300, 0])
+        rightBody = create_body(200, 50, 40, 40, [-300, 0])
+        collisionWorld = CollisionWorld()
+        collisionWorld.add(leftBody)
+        collisionWorld.add(rightBody)
+        resolvedBodies = []
+        for _ in range(20):
+            leftBody.update(10)
+            rightBody.update(10)
+            resolvedBodies = collisionWorld.step(lambda body, obstacles: sweep_and_limit(body, obstacles, changeColor=False))
+            self.assertLessEqual(leftBody.physics.hitbox.right, rightBody.physics.hitbox.left)
+        self.assertCountEqual(resolvedBodies, [leftBody, rightBody])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+"""Pruebas de la resolucion de colisiones con cajas barridas de /game_modules/swept_collision.py.
+
+Se ejecutan desde la carpeta principal del proyecto con: python -m unittest discover tests
+"""
+import os, unittest
+
+os.environ.setdefault('SDL_VIDEODRIVER', 'dummy')
+
+import pygame
+from game_modules.entities import Entity
+from game_modules.swept_collision import get_push_out, sweep_and_limit
+from game_modules.utilities import Animation, Physics, create_empty_texture
+
+def create_box(x:float, y:float, width:int, height:int, collisions:list=None) -> Entity:
+    """Crea una entidad colisionable con una textura transparente del tamaño dado, que guarda en collisions las entidades con las que choca."""
+    collideListeners = {} if collisions is None else {None: lambda selfEntity, collidedEntity: collisions.append(collidedEntity)}
+    box = Entity(Physics([x, y], isCollidable=True), Animation(create_empty_texture(width, height), isAnimated=False), collideListeners=collideListeners)
+    box.update_hitbox()
+    return box
+
+def move_box(box:Entity, position:list) -> None:
+    """Mueve la entidad desde su posicion actual, como si se hubiera movido en un fotograma."""
+    box.physics.previousPosition = list(box.physics.position)
+    box.physics.position = list(position)
+    box.update_hitbox()
+
+class TestGetPushOut(unittest.TestCase):
+
+    def test_rectangles_that_only_touch_are_not_pushed(self):
+        self.assertIsNone(get_push_out(pygame.Rect(0, 0, 10, 10), pygame.Rect(10, 0, 10, 10)))
+
+    def test_pushes_along_the_smallest_overlap(self):
+        self.assertEqual(get_push_out(pygame.Rect(8, 2, 10, 10), pygame.Rect(15, 0, 40, 40)), (0, 5))
+        self.assertEqual(get_push_out(pygame.Rect(20, 36, 10, 10), pygame.Rect(15, 0, 40, 40)), (1, 40))
+
+class TestSweepAndLimit(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        pygame.init()
+
+    def test_stops_at_a_thin_wall(self):
+        wall = create_box(100, 0, 2, 200)
+        box = create_box(0, 50, 20, 20)
+        move_box(box, [300, 50])
+        sweep_and_limit(box, [wall], changeColor=False)
+        self.assertEqual(box.physics.hitbox.right, wall.physics.hitbox.left)
+
+    def test_pushes_out_a_body_that_starts_inside_an_obstacle(self):
+        collisions = []
+        wall = create_box(100, 0, 50, 200)
+        box = create_box(95, 50, 20, 20, collisions)
+        move_box(box, [95, 55])
+        sweep_and_limit(box, [wall], changeColor=False)
+        self.assertFalse(box.physics.hitbox.colliderect(wall.physics.hitbox))
+        self.assertEqual(box.physics.hitbox.right, wall.physics.hitbox.left)
+        self.assertEqual(box.physics.hitbox.top, 55)
+        self.assertEqual(collisions, [wall])
+
+    def test_pushes_out_a_body_that_did_not_move(self):
+        wall = create_box(100, 0, 50, 200)
+        box = create_box(140, 50, 20, 20)
+        sweep_and_limit(box, [wall], changeColor=False)
+        self.assertEqual(box.physics.hitbox.left, wall.physics.hitbox.right)
+
+    def test_keeps_a_squeezed_body_where_it_started(self):
+        wall = create_box(100, 0, 20, 200)
+        chair = create_box(150, 0, 50, 200)
+        box = create_box(125, 50, 40, 40)
+        move_box(box, [128, 50])
+        sweep_and_limit(box, [chair, wall], changeColor=False)
+        self.assertEqual(box.physics.position, [125, 50])
+        self.assertFalse(box.physics.hitbox.colliderect(wall.physics.hitbox))
+
+    def test_pushes_out_of_every_obstacle_it_overlaps(self):
+        wall = create_box(100, 0, 20, 200)
+        chair = create_box(150, 0, 50, 200)
+        box = create_box(110, 50, 30, 30)
+        sweep_and_limit(box, [chair, wall], changeColor=False)
+        self.assertEqual(box.physics.hitbox.left, wall.physics.hitbox.right)
+        self.assertFalse(box.physics.hitbox.colliderect(chair.physics.hitbox))
+
+    def test_does_not_push_a_body_that_only_touches(self):
+        wall = create_box(100, 0, 50, 200)
+        box = create_box(80, 50, 20, 20)
+        move_box(box, [80, 60])
+        sweep_and_limit(box, [wall], changeColor=False)
+        self.assertEqual(box.physics.position, [80, 60])
+
+if __name__ == '__main__':
+    unittest.main()